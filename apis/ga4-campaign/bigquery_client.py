@@ -4,12 +4,15 @@ Modulo Cliente BigQuery.
 Este modulo contem todas as funcoes para operacoes no BigQuery:
     - Criacao de dataset e tabelas
     - Verificacao de existencia de tabelas
-    - Insercao de dados
+    - Insercao de dados (streaming ou load job)
     - Delecao de particoes
 """
 
+import io
+import json
 import logging
-from typing import List, Dict, Any, Optional
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 from datetime import datetime
 
 from config import config
@@ -21,6 +24,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Linhas por requisicao de streaming (mantem o payload abaixo de 10 MB)
+STREAMING_BATCH_SIZE = 500
+
+# Em write_mode "auto", a partir destas linhas a carga usa load job (NDJSON):
+# sem custo de ingestao, sem limite por requisicao e sem buffer de streaming
+LOAD_JOB_MIN_ROWS = 10000
+
+# auto: load job a partir de LOAD_JOB_MIN_ROWS linhas, streaming abaixo disso
+WRITE_MODES = ("auto", "streaming", "load")
+
+
+def _batched(items: Iterable[Any], n: int) -> Iterator[List[Any]]:
+    """
+    Agrupa os itens em lotes de ate `n`, sem copiar a lista de origem.
+
+    Equivalente a itertools.batched (Python 3.12+), devolvendo listas.
+    """
+    it = iter(items)
+    while batch := list(islice(it, n)):
+        yield batch
+
 
 class BigQueryClient:
     """Cliente para operacoes no BigQuery."""
@@ -114,19 +138,8 @@ class BigQueryClient:
 
         table_ref = self._get_table_ref(schema.table_name)
 
-        # Converter schema para formato BigQuery
-        bq_schema = []
-        for field in schema.schema_fields:
-            bq_field = bigquery.SchemaField(
-                name=field["name"],
-                field_type=field["type"],
-                mode=field.get("mode", "NULLABLE"),
-                description=field.get("description", "")
-            )
-            bq_schema.append(bq_field)
-
-        # Criar tabela
-        table = bigquery.Table(table_ref, schema=bq_schema)
+        # Criar tabela (schema BigQuery pre-convertido e cacheado no TableSchema)
+        table = bigquery.Table(table_ref, schema=list(schema.compiled_bq_schema))
         table.description = schema.description
 
         # Configurar particionamento por dia
@@ -135,8 +148,8 @@ class BigQueryClient:
             field="DATE"
         )
 
-        # Configurar clustering (opcional, melhora performance de queries)
-        table.clustering_fields = ["PROPERTY_ID", "GA4_SESSION_KEY"]
+        # Configurar clustering (definido por dimensao no TableSchema)
+        table.clustering_fields = list(schema.clustering_fields) or None
 
         try:
             self.client.create_table(table)
@@ -216,13 +229,19 @@ class BigQueryClient:
             logger.error(f"Erro ao deletar particao: {e}")
             return False
 
-    def insert_rows(self, table_name: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def insert_rows(
+        self,
+        table_name: str,
+        rows: List[Dict[str, Any]],
+        write_mode: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Insere linhas em uma tabela.
 
         Args:
             table_name: Nome da tabela
             rows: Lista de dicionarios com os dados
+            write_mode: "auto", "streaming" ou "load" (padrao: config.bigquery.write_mode)
 
         Returns:
             Resultado da insercao
@@ -235,39 +254,99 @@ class BigQueryClient:
                 "rows_inserted": 0
             }
 
+        write_mode = write_mode or config.bigquery.write_mode
+        if write_mode not in WRITE_MODES:
+            raise ValueError(f"write_mode invalido: {write_mode} (use {', '.join(WRITE_MODES)})")
+
+        if write_mode == "load" or (write_mode == "auto" and len(rows) >= LOAD_JOB_MIN_ROWS):
+            return self.load_rows(table_name, rows)
+
         table_ref = self._get_table_ref(table_name)
 
+        rows_inserted = 0
+        errors: List[Any] = []
+
         try:
-            errors = self.client.insert_rows_json(table_ref, rows)
-
-            if errors:
-                logger.error(f"Erros ao inserir dados em {table_name}: {errors}")
-                return {
-                    "status": "error",
-                    "message": f"Erros na insercao: {errors}",
-                    "rows_inserted": 0,
-                    "errors": errors
-                }
-
-            logger.info(f"Inseridas {len(rows)} linhas em {table_name}")
+            for batch in _batched(rows, STREAMING_BATCH_SIZE):
+                batch_errors = self.client.insert_rows_json(table_ref, batch)
+                if batch_errors:
+                    errors.extend(batch_errors)
+                else:
+                    rows_inserted += len(batch)
+        except Exception as e:
+            logger.error(f"Erro ao inserir dados em {table_name}: {e}")
             return {
-                "status": "success",
-                "message": f"Inseridas {len(rows)} linhas",
-                "rows_inserted": len(rows)
+                "status": "error",
+                "message": str(e),
+                "rows_inserted": rows_inserted
+            }
+
+        if errors:
+            logger.error(f"Erros ao inserir dados em {table_name}: {errors}")
+            return {
+                "status": "error",
+                "message": f"Erros na insercao: {errors}",
+                "rows_inserted": rows_inserted,
+                "errors": errors
             }
+
+        logger.info(f"Inseridas {rows_inserted} linhas em {table_name}")
+        return {
+            "status": "success",
+            "message": f"Inseridas {rows_inserted} linhas",
+            "rows_inserted": rows_inserted
+        }
+
+    def load_rows(self, table_name: str, rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Grava linhas com um load job (NDJSON em memoria, WRITE_APPEND).
+
+        Args:
+            table_name: Nome da tabela
+            rows: Lista de dicionarios com os dados
+
+        Returns:
+            Resultado da carga
+        """
+        from google.cloud import bigquery
+
+        table_ref = self._get_table_ref(table_name)
+
+        buffer = io.BytesIO()
+        for row in rows:
+            buffer.write(json.dumps(row, default=str).encode("utf-8"))
+            buffer.write(b"\n")
+        buffer.seek(0)
+
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+            write_disposition=bigquery.WriteDisposition.WRITE_APPEND
+        )
+
+        try:
+            job = self.client.load_table_from_file(buffer, table_ref, job_config=job_config)
+            job.result()
         except Exception as e:
-            logger.error(f"Erro ao inserir dados em {table_name}: {e}")
+            logger.error(f"Erro no load job de {table_name}: {e}")
             return {
                 "status": "error",
                 "message": str(e),
                 "rows_inserted": 0
             }
 
+        logger.info(f"Carregadas {len(rows)} linhas em {table_name} via load job")
+        return {
+            "status": "success",
+            "message": f"Carregadas {len(rows)} linhas via load job",
+            "rows_inserted": len(rows)
+        }
+
     def load_report(
         self,
         table_name: str,
         data: List[Dict[str, Any]],
-        replace_partition: bool = True
+        replace_partition: bool = True,
+        write_mode: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Carrega dados de um relatorio em uma tabela.
@@ -276,6 +355,7 @@ class BigQueryClient:
             table_name: Nome da tabela
             data: Lista de dicionarios com os dados
             replace_partition: Se True, deleta a particao antes de inserir
+            write_mode: "auto", "streaming" ou "load" (padrao: config.bigquery.write_mode)
 
         Returns:
             Resultado do carregamento
@@ -297,7 +377,7 @@ class BigQueryClient:
                 self.delete_partition(table_name, partition_date)
 
         # Inserir dados
-        result = self.insert_rows(table_name, data)
+        result = self.insert_rows(table_name, data, write_mode)
         result["table"] = table_name
 
         return result
@@ -23,6 +23,8 @@ class BigQueryConfig:
     """Configuracoes do BigQuery."""
     dataset_id: str = field(default_factory=lambda: os.environ.get("BQ_DATASET_ID", "GA4_CAMPAIGN"))
     location: str = field(default_factory=lambda: os.environ.get("BQ_LOCATION", "US"))
+    # auto (load job a partir de 10000 linhas), streaming ou load
+    write_mode: str = field(default_factory=lambda: os.environ.get("BQ_WRITE_MODE", "auto"))
 
 
 @dataclass
@@ -31,6 +33,10 @@ class GA4Config:
     property_id: str = field(default_factory=lambda: os.environ.get("GA4_PROPERTY_ID", ""))
     timezone: str = field(default_factory=lambda: os.environ.get("GA4_TIMEZONE", "America/Sao_Paulo"))
     default_days_back: int = 1
+    # Dimensoes extraidas em paralelo por propriedade
+    max_workers: int = field(default_factory=lambda: max(1, int(os.environ.get("GA4_MAX_WORKERS", "4"))))
+    # Limite de chamadas simultaneas ao GA4 (cota de requisicoes concorrentes por propriedade)
+    max_concurrent_requests: int = field(default_factory=lambda: max(1, int(os.environ.get("GA4_MAX_CONCURRENT_REQUESTS", "5"))))
 
 
 @dataclass
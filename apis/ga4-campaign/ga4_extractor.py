@@ -7,8 +7,10 @@ https://github.com/googleanalytics/python-docs-samples/tree/main/google-analytic
 """
 
 import logging
+import threading
 import uuid
 import re
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 import pytz
@@ -22,6 +24,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Limita as chamadas simultaneas ao GA4, compartilhado entre todas as extracoes
+# do processo (evita "too many concurrent requests" na cota da propriedade)
+_GA4_SEMAPHORE = threading.BoundedSemaphore(config.ga4.max_concurrent_requests)
+
+
+def _ga4_retry():
+    """Retry com backoff exponencial (1s a 30s, ate 2 min) para cota excedida e 503."""
+    from google.api_core import exceptions
+    from google.api_core import retry as api_retry
+
+    return api_retry.Retry(
+        predicate=api_retry.if_exception_type(
+            exceptions.ResourceExhausted,
+            exceptions.ServiceUnavailable
+        ),
+        initial=1.0,
+        maximum=30.0,
+        multiplier=2.0,
+        timeout=120.0
+    )
+
 
 def camel_to_upper_snake(name: str) -> str:
     """
@@ -134,7 +157,8 @@ def run_report(
 
     # Executar
     try:
-        response = ga4_client.run_report(request)
+        with _GA4_SEMAPHORE:
+            response = ga4_client.run_report(request, retry=_ga4_retry())
     except Exception as e:
         logger.error(f"Erro ao executar relatorio: {e}")
         raise
@@ -301,9 +325,9 @@ def extract_all_dimensions(
         }
     }
 
-    for dimension_key in dimensions_to_extract:
+    def extract(dimension_key: str) -> Dict[str, Any]:
         try:
-            extraction = extract_dimension(
+            return extract_dimension(
                 ga4_client=ga4_client,
                 property_id=property_id,
                 dimension_key=dimension_key,
@@ -311,19 +335,28 @@ def extract_all_dimensions(
                 end_date=end_date,
                 table_prefix=table_prefix
             )
-            results["extractions"][dimension_key] = extraction
-            results["summary"]["successful"] += 1
-            results["summary"]["total_rows"] += extraction["rows_count"]
-
-            logger.info(f"  {dimension_key}: {extraction['rows_count']} linhas")
-
         except Exception as e:
             logger.error(f"Erro ao extrair {dimension_key}: {e}")
-            results["extractions"][dimension_key] = {
+            return {
                 "error": str(e),
                 "dimension_key": dimension_key
             }
+
+    # Cada dimensao e um relatorio independente; as chamadas ao GA4 ficam
+    # limitadas por _GA4_SEMAPHORE
+    max_workers = min(config.ga4.max_workers, len(dimensions_to_extract)) or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        extractions = list(executor.map(extract, dimensions_to_extract))
+
+    for dimension_key, extraction in zip(dimensions_to_extract, extractions):
+        results["extractions"][dimension_key] = extraction
+        if "error" in extraction:
             results["summary"]["failed"] += 1
+            continue
+
+        results["summary"]["successful"] += 1
+        results["summary"]["total_rows"] += extraction["rows_count"]
+        logger.info(f"  {dimension_key}: {extraction['rows_count']} linhas")
 
     logger.info("=" * 60)
     logger.info("EXTRACAO CONCLUIDA")
@@ -393,7 +426,8 @@ def run_batch_report(
         )
 
         try:
-            response = ga4_client.batch_run_reports(batch_request)
+            with _GA4_SEMAPHORE:
+                response = ga4_client.batch_run_reports(batch_request, retry=_ga4_retry())
 
             for report_response in response.reports:
                 rows = []
@@ -12,6 +12,7 @@ Funcoes principais:
 import os
 import json
 import logging
+from threading import Lock
 from typing import Optional, Dict, Any, Tuple
 
 from config import config
@@ -22,6 +23,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Canal gRPC do GA4: keepalive evita refazer TCP/TLS apos periodos ociosos
+GA4_API_HOST = "analyticsdata.googleapis.com:443"
+GRPC_CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.max_receive_message_length", 64 * 1024 * 1024),
+]
+
 
 class GCPConnection:
     """Gerenciador de conexao com Google Cloud Platform."""
@@ -33,6 +44,9 @@ class GCPConnection:
         self._ga4_client = None
         self._secret_manager_client = None
         self._connected = False
+        # Os clientes sao compartilhados entre as threads do servidor; o lock
+        # garante uma unica criacao (um unico canal gRPC/pool HTTP por processo)
+        self._lock = Lock()
 
     @property
     def is_connected(self) -> bool:
@@ -86,9 +100,7 @@ class GCPConnection:
                 credentials_dict
             )
             logger.info("Autenticacao via JSON string bem-sucedida")
-            self._credentials = credentials
-            self._project_id = project
-            self._connected = True
+            self._set_credentials(credentials, project)
             return True
 
         # Metodo 2: Credenciais via arquivo local
@@ -99,9 +111,7 @@ class GCPConnection:
                 creds_path
             )
             logger.info("Autenticacao via arquivo bem-sucedida")
-            self._credentials = credentials
-            self._project_id = project
-            self._connected = True
+            self._set_credentials(credentials, project)
             return True
 
         # Metodo 3: Variavel de ambiente GOOGLE_APPLICATION_CREDENTIALS
@@ -112,9 +122,7 @@ class GCPConnection:
                 env_credentials
             )
             logger.info("Autenticacao via variavel de ambiente bem-sucedida")
-            self._credentials = credentials
-            self._project_id = project
-            self._connected = True
+            self._set_credentials(credentials, project)
             return True
 
         # Metodo 4: Application Default Credentials (Cloud Run, Compute Engine, etc.)
@@ -124,9 +132,7 @@ class GCPConnection:
             if detected_project:
                 project = detected_project
             logger.info("Autenticacao via ADC bem-sucedida")
-            self._credentials = credentials
-            self._project_id = project
-            self._connected = True
+            self._set_credentials(credentials, project)
             return True
         except Exception as e:
             logger.error(f"Falha na autenticacao ADC: {e}")
@@ -137,6 +143,22 @@ class GCPConnection:
             "GOOGLE_APPLICATION_CREDENTIALS ou execute em ambiente GCP."
         )
 
+    def _set_credentials(self, credentials, project_id: str) -> None:
+        """
+        Registra as credenciais da conexao.
+
+        Se as credenciais ou o projeto mudarem, os clientes ja criados sao
+        descartados e recriados no proximo uso com as novas credenciais.
+        """
+        with self._lock:
+            if credentials is not self._credentials or project_id != self._project_id:
+                self._bigquery_client = None
+                self._ga4_client = None
+                self._secret_manager_client = None
+            self._credentials = credentials
+            self._project_id = project_id
+            self._connected = True
+
     def get_bigquery_client(self):
         """
         Retorna o cliente BigQuery.
@@ -147,13 +169,14 @@ class GCPConnection:
         if not self._connected:
             raise RuntimeError("GCP nao conectado. Chame connect() primeiro.")
 
-        if self._bigquery_client is None:
-            from google.cloud import bigquery
-            self._bigquery_client = bigquery.Client(
-                project=self._project_id,
-                credentials=self._credentials
-            )
-            logger.info(f"Cliente BigQuery inicializado - Projeto: {self._project_id}")
+        with self._lock:
+            if self._bigquery_client is None:
+                from google.cloud import bigquery
+                self._bigquery_client = bigquery.Client(
+                    project=self._project_id,
+                    credentials=self._credentials
+                )
+                logger.info(f"Cliente BigQuery inicializado - Projeto: {self._project_id}")
 
         return self._bigquery_client
 
@@ -161,18 +184,36 @@ class GCPConnection:
         """
         Retorna o cliente GA4 Data API.
 
+        O canal gRPC e criado com keepalive (GRPC_CHANNEL_OPTIONS); se nao
+        for possivel montar o transporte customizado, usa o cliente padrao.
+
         Returns:
             Cliente GA4 BetaAnalyticsDataClient
         """
         if not self._connected:
             raise RuntimeError("GCP nao conectado. Chame connect() primeiro.")
 
-        if self._ga4_client is None:
-            from google.analytics.data_v1beta import BetaAnalyticsDataClient
-            self._ga4_client = BetaAnalyticsDataClient(
-                credentials=self._credentials
-            )
-            logger.info("Cliente GA4 Data API inicializado")
+        with self._lock:
+            if self._ga4_client is None:
+                from google.analytics.data_v1beta import BetaAnalyticsDataClient
+                try:
+                    from google.analytics.data_v1beta.services.beta_analytics_data.transports import (
+                        BetaAnalyticsDataGrpcTransport
+                    )
+                    channel = BetaAnalyticsDataGrpcTransport.create_channel(
+                        GA4_API_HOST,
+                        credentials=self._credentials,
+                        options=GRPC_CHANNEL_OPTIONS
+                    )
+                    self._ga4_client = BetaAnalyticsDataClient(
+                        transport=BetaAnalyticsDataGrpcTransport(channel=channel)
+                    )
+                except Exception as e:
+                    logger.warning(f"Usando canal gRPC padrao para GA4: {e}")
+                    self._ga4_client = BetaAnalyticsDataClient(
+                        credentials=self._credentials
+                    )
+                logger.info("Cliente GA4 Data API inicializado")
 
         return self._ga4_client
 
@@ -186,12 +227,13 @@ class GCPConnection:
         if not self._connected:
             raise RuntimeError("GCP nao conectado. Chame connect() primeiro.")
 
-        if self._secret_manager_client is None:
-            from google.cloud import secretmanager
-            self._secret_manager_client = secretmanager.SecretManagerServiceClient(
-                credentials=self._credentials
-            )
-            logger.info("Cliente Secret Manager inicializado")
+        with self._lock:
+            if self._secret_manager_client is None:
+                from google.cloud import secretmanager
+                self._secret_manager_client = secretmanager.SecretManagerServiceClient(
+                    credentials=self._credentials
+                )
+                logger.info("Cliente Secret Manager inicializado")
 
         return self._secret_manager_client
 
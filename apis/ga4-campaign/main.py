@@ -30,7 +30,7 @@ from flask import Flask, request, jsonify
 from config import config
 from gcp_connection import connect_gcp, gcp_connection
 from schemas import list_available_dimensions, get_schema, DIMENSION_SCHEMAS
-from bigquery_client import BigQueryClient, initialize_tables
+from bigquery_client import WRITE_MODES, BigQueryClient, initialize_tables
 from ga4_extractor import (
     extract_dimension,
     extract_all_dimensions,
@@ -67,7 +67,8 @@ def run_full_extraction(
     dimensions: Optional[list] = None,
     dataset_id: Optional[str] = None,
     table_prefix: Optional[str] = None,
-    init_tables: bool = True
+    init_tables: bool = True,
+    write_mode: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Executa a extracao completa de dados do GA4.
@@ -86,6 +87,7 @@ def run_full_extraction(
         dataset_id: ID do dataset BigQuery (usa config se None)
         table_prefix: Prefixo customizado para nomes de tabelas
         init_tables: Se True, inicializa tabelas antes da extracao
+        write_mode: "auto", "streaming" ou "load" (padrao: config.bigquery.write_mode)
 
     Returns:
         Resultado da extracao e carga
@@ -167,7 +169,8 @@ def run_full_extraction(
             result = bq_helper.load_report(
                 table_name=extraction["table_name"],
                 data=extraction["data"],
-                replace_partition=True
+                replace_partition=True,
+                write_mode=write_mode
             )
             load_results["details"][dim_key] = result
 
@@ -328,7 +331,8 @@ def extract_all():
             "dimensions": ["CAMPAIGN", "..."], // opcional (default: todas)
             "dataset_id": "CUSTOM_DATASET",    // opcional
             "table_prefix": "PREFIX",          // opcional
-            "init_tables": true                // opcional (default: true)
+            "init_tables": true,               // opcional (default: true)
+            "write_mode": "auto"               // opcional: auto, streaming ou load
         }
     """
     data = request.get_json() or {}
@@ -340,6 +344,14 @@ def extract_all():
             "message": "property_id e obrigatorio"
         }), 400
 
+    write_mode = data.get("write_mode")
+    if write_mode is not None and write_mode not in WRITE_MODES:
+        return jsonify({
+            "status": "error",
+            "message": f"write_mode invalido: {write_mode}",
+            "available": list(WRITE_MODES)
+        }), 400
+
     try:
         result = run_full_extraction(
             property_id=property_id,
@@ -348,7 +360,8 @@ def extract_all():
             dimensions=data.get("dimensions"),
             dataset_id=data.get("dataset_id"),
             table_prefix=data.get("table_prefix"),
-            init_tables=data.get("init_tables", True)
+            init_tables=data.get("init_tables", True),
+            write_mode=write_mode
         )
 
         status_code = 200 if result.get("status") == "success" else 500
@@ -376,7 +389,8 @@ def extract_single(dimension_key: str):
             "start_date": "2024-01-01",     // opcional
             "end_date": "2024-01-01",       // opcional
             "dataset_id": "CUSTOM_DATASET", // opcional
-            "table_prefix": "PREFIX"        // opcional
+            "table_prefix": "PREFIX",       // opcional
+            "write_mode": "auto"            // opcional: auto, streaming ou load
         }
     """
     data = request.get_json() or {}
@@ -388,6 +402,14 @@ def extract_single(dimension_key: str):
             "message": "property_id e obrigatorio"
         }), 400
 
+    write_mode = data.get("write_mode")
+    if write_mode is not None and write_mode not in WRITE_MODES:
+        return jsonify({
+            "status": "error",
+            "message": f"write_mode invalido: {write_mode}",
+            "available": list(WRITE_MODES)
+        }), 400
+
     dimension_key = dimension_key.upper()
     available = list_available_dimensions()
 
@@ -430,7 +452,8 @@ def extract_single(dimension_key: str):
         load_result = bq_helper.load_report(
             table_name=extraction["table_name"],
             data=extraction["data"],
-            replace_partition=True
+            replace_partition=True,
+            write_mode=write_mode
         )
 
         return jsonify({
@@ -10,10 +10,52 @@ Cada tabela possui:
 As tabelas sao particionadas por dia (campo 'DATE').
 """
 
-from typing import Dict, List, Any
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Tuple
 from dataclasses import dataclass, field
 
 
+# Campos base comuns a todas as tabelas (alem de PK_{NOME_DA_TABELA})
+BASE_FIELD_NAMES = ("GA4_SESSION_KEY", "PROPERTY_ID", "DATE", "LAST_UPDATE")
+
+# Limite do BigQuery para colunas de clustering
+MAX_CLUSTERING_FIELDS = 4
+
+
+@dataclass(frozen=True, slots=True)
+class FieldSpec:
+    """
+    Campo de uma tabela.
+
+    Imutavel e com __slots__: acesso por atributo (sem dict por instancia) e
+    compartilhamento seguro entre workers apos fork.
+    """
+    name: str
+    type: str
+    mode: str = "NULLABLE"
+    description: str = ""
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FieldSpec":
+        """Cria um FieldSpec a partir da definicao em dict."""
+        return cls(
+            name=data["name"],
+            type=data["type"],
+            mode=data.get("mode", "NULLABLE"),
+            description=data.get("description", "")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Retorna o campo no formato dict."""
+        return {
+            "name": self.name,
+            "type": self.type,
+            "mode": self.mode,
+            "description": self.description,
+        }
+
+
 @dataclass
 class TableSchema:
     """Definicao de schema de uma tabela."""
@@ -21,7 +63,124 @@ class TableSchema:
     description: str
     dimensions: List[str]
     metrics: List[str]
-    schema_fields: List[Dict[str, Any]] = field(default_factory=list)
+    schema_fields: Tuple[FieldSpec, ...] = ()
+    cluster_keys: Tuple[str, ...] = ()
+    clustering_fields: Tuple[str, ...] = ()
+    _bq_schema: Optional[Tuple[Any, ...]] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # Definicoes em dict sao convertidas para FieldSpec uma unica vez
+        self.schema_fields = tuple(
+            f if isinstance(f, FieldSpec) else FieldSpec.from_dict(f)
+            for f in self.schema_fields
+        )
+        # Layout da DDL: campos base (inclui DATE) -> chaves de cluster -> demais
+        if self.cluster_keys:
+            self.schema_fields = order_schema_fields(self.schema_fields, self.cluster_keys)
+
+        # Clustering padrao: PROPERTY_ID + chaves de cluster da dimensao
+        if not self.clustering_fields:
+            self.clustering_fields = ("PROPERTY_ID", *self.cluster_keys)[:MAX_CLUSTERING_FIELDS]
+        if len(self.clustering_fields) > MAX_CLUSTERING_FIELDS:
+            raise ValueError(
+                f"{self.table_name}: maximo de {MAX_CLUSTERING_FIELDS} campos de clustering"
+            )
+        field_names = {f.name for f in self.schema_fields}
+        missing = [c for c in self.clustering_fields if c not in field_names]
+        if missing:
+            raise ValueError(f"{self.table_name}: campos de clustering inexistentes: {missing}")
+
+    @property
+    def compiled_bq_schema(self) -> Tuple[Any, ...]:
+        """Schema em bigquery.SchemaField, convertido uma unica vez por processo."""
+        if self._bq_schema is None:
+            from google.cloud import bigquery
+
+            self._bq_schema = tuple(
+                bigquery.SchemaField(
+                    name=f.name,
+                    field_type=f.type,
+                    mode=f.mode,
+                    description=f.description
+                )
+                for f in self.schema_fields
+            )
+        return self._bq_schema
+
+
+def is_base_field(field_name: str) -> bool:
+    """Indica se o campo faz parte dos campos base da tabela."""
+    return field_name.startswith("PK_") or field_name in BASE_FIELD_NAMES
+
+
+def order_schema_fields(
+    schema_fields: Tuple[FieldSpec, ...],
+    cluster_keys: Tuple[str, ...]
+) -> Tuple[FieldSpec, ...]:
+    """
+    Reordena os campos para que as chaves de cluster venham logo apos os campos base.
+
+    Args:
+        schema_fields: Campos da tabela
+        cluster_keys: Campos de clustering, na ordem desejada
+
+    Returns:
+        Nova tupla de campos reordenada
+
+    Raises:
+        ValueError: Se alguma chave de cluster nao existir no schema
+    """
+    fields_by_name = {f.name: f for f in schema_fields}
+    missing = [k for k in cluster_keys if k not in fields_by_name]
+    if missing:
+        raise ValueError(f"Chaves de cluster inexistentes no schema: {missing}")
+
+    base = [f for f in schema_fields if is_base_field(f.name)]
+    cluster = [fields_by_name[k] for k in cluster_keys]
+    rest = [
+        f for f in schema_fields
+        if not is_base_field(f.name) and f.name not in cluster_keys
+    ]
+    return tuple(base + cluster + rest)
+
+
+# Campos base compartilhados (mesmas instancias imutaveis em todas as tabelas)
+BASE_FIELDS: Tuple[FieldSpec, ...] = (
+    FieldSpec(
+        name="GA4_SESSION_KEY",
+        type="STRING",
+        mode="REQUIRED",
+        description="Chave estrangeira para relacionar tabelas GA4 (PROPERTY_ID + DATE)"
+    ),
+    FieldSpec(
+        name="PROPERTY_ID",
+        type="STRING",
+        mode="REQUIRED",
+        description="ID da propriedade GA4"
+    ),
+    FieldSpec(
+        name="DATE",
+        type="DATE",
+        mode="REQUIRED",
+        description="Data do registro (campo de particionamento)"
+    ),
+    FieldSpec(
+        name="LAST_UPDATE",
+        type="TIMESTAMP",
+        mode="REQUIRED",
+        description="Timestamp da execucao e carregamento no BigQuery"
+    ),
+)
+
+
+def get_pk_field(table_name: str) -> FieldSpec:
+    """Retorna o campo de chave primaria (PK_{NOME_DA_TABELA}) da tabela."""
+    return FieldSpec(
+        name=f"PK_{table_name}",
+        type="STRING",
+        mode="REQUIRED",
+        description="Chave primaria unica (UUID)"
+    )
 
 
 def get_base_fields(table_name: str) -> List[Dict[str, Any]]:
@@ -34,45 +193,49 @@ def get_base_fields(table_name: str) -> List[Dict[str, Any]]:
     Returns:
         Lista de campos base
     """
-    return [
-        {
-            "name": f"PK_{table_name}",
-            "type": "STRING",
-            "mode": "REQUIRED",
-            "description": "Chave primaria unica (UUID)"
-        },
-        {
-            "name": "GA4_SESSION_KEY",
-            "type": "STRING",
-            "mode": "REQUIRED",
-            "description": "Chave estrangeira para relacionar tabelas GA4 (PROPERTY_ID + DATE)"
-        },
-        {
-            "name": "PROPERTY_ID",
-            "type": "STRING",
-            "mode": "REQUIRED",
-            "description": "ID da propriedade GA4"
-        },
-        {
-            "name": "DATE",
-            "type": "DATE",
-            "mode": "REQUIRED",
-            "description": "Data do registro (campo de particionamento)"
-        },
-        {
-            "name": "LAST_UPDATE",
-            "type": "TIMESTAMP",
-            "mode": "REQUIRED",
-            "description": "Timestamp da execucao e carregamento no BigQuery"
-        },
-    ]
+    return [f.to_dict() for f in (get_pk_field(table_name), *BASE_FIELDS)]
+
+
+def _fields(table_name: str, *extra: Dict[str, Any]) -> Tuple[Any, ...]:
+    """
+    Monta a tupla de campos: PK + campos base compartilhados + especificos.
+
+    Args:
+        table_name: Nome da tabela
+        *extra: Campos especificos da tabela
+
+    Returns:
+        Tupla de campos da tabela
+    """
+    return (get_pk_field(table_name), *BASE_FIELDS, *extra)
+
+
+# =============================================================================
+# CHAVES DE CLUSTER POR DIMENSAO
+# =============================================================================
+
+# Colunas de maior cardinalidade usadas em filtros; ficam logo apos DATE na DDL
+CLUSTER_KEYS: Dict[str, Tuple[str, ...]] = {
+    "CAMPAIGN": ("CAMPAIGN_ID",),
+    "SOURCE_MEDIUM": ("SESSION_SOURCE", "SESSION_MEDIUM"),
+    "CHANNEL": ("SESSION_DEFAULT_CHANNEL_GROUP",),
+    "GEOGRAPHIC": ("COUNTRY", "REGION"),
+    "DEVICE": ("DEVICE_CATEGORY", "OPERATING_SYSTEM"),
+    "PAGE": ("PAGE_PATH",),
+    "EVENT": ("EVENT_NAME",),
+    "USER": ("NEW_VS_RETURNING",),
+    "ECOMMERCE": ("TRANSACTION_ID", "ITEM_ID"),
+    "SESSION": ("SESSION_SOURCE", "SESSION_MEDIUM"),
+    "GOOGLE_ADS": ("GOOGLE_ADS_CAMPAIGN_ID",),
+}
 
 
 # =============================================================================
 # SCHEMAS POR DIMENSAO
 # =============================================================================
 
-DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
+# Registro somente leitura (MappingProxyType), compartilhado entre workers
+DIMENSION_SCHEMAS: Mapping[str, TableSchema] = MappingProxyType({
     # -------------------------------------------------------------------------
     # CAMPAIGN - Dimensoes de campanha e aquisicao
     # -------------------------------------------------------------------------
@@ -104,7 +267,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             "conversions",
             "totalRevenue",
         ],
-        schema_fields=get_base_fields("GA4_DIM_CAMPAIGN") + [
+        schema_fields=_fields(
+            "GA4_DIM_CAMPAIGN",
             {"name": "CAMPAIGN_ID", "type": "STRING", "mode": "NULLABLE", "description": "ID da campanha"},
             {"name": "CAMPAIGN_NAME", "type": "STRING", "mode": "NULLABLE", "description": "Nome da campanha"},
             {"name": "SESSION_CAMPAIGN_ID", "type": "STRING", "mode": "NULLABLE", "description": "ID da campanha da sessao"},
@@ -125,7 +289,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             {"name": "EVENT_COUNT", "type": "INTEGER", "mode": "NULLABLE", "description": "Contagem de eventos"},
             {"name": "CONVERSIONS", "type": "INTEGER", "mode": "NULLABLE", "description": "Conversoes"},
             {"name": "TOTAL_REVENUE", "type": "FLOAT", "mode": "NULLABLE", "description": "Receita total"},
-        ]
+        ),
+        cluster_keys=CLUSTER_KEYS["CAMPAIGN"]
     ),
 
     # -------------------------------------------------------------------------
@@ -157,7 +322,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             "screenPageViews",
             "conversions",
         ],
-        schema_fields=get_base_fields("GA4_DIM_SOURCE_MEDIUM") + [
+        schema_fields=_fields(
+            "GA4_DIM_SOURCE_MEDIUM",
             {"name": "SESSION_SOURCE", "type": "STRING", "mode": "NULLABLE", "description": "Origem da sessao"},
             {"name": "SESSION_MEDIUM", "type": "STRING", "mode": "NULLABLE", "description": "Midia da sessao"},
             {"name": "SESSION_SOURCE_MEDIUM", "type": "STRING", "mode": "NULLABLE", "description": "Origem/Midia da sessao"},
@@ -176,7 +342,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             {"name": "AVERAGE_SESSION_DURATION", "type": "FLOAT", "mode": "NULLABLE", "description": "Duracao media da sessao"},
             {"name": "SCREEN_PAGE_VIEWS", "type": "INTEGER", "mode": "NULLABLE", "description": "Visualizacoes de pagina"},
             {"name": "CONVERSIONS", "type": "INTEGER", "mode": "NULLABLE", "description": "Conversoes"},
-        ]
+        ),
+        cluster_keys=CLUSTER_KEYS["SOURCE_MEDIUM"]
     ),
 
     # -------------------------------------------------------------------------
@@ -204,7 +371,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             "conversions",
             "totalRevenue",
         ],
-        schema_fields=get_base_fields("GA4_DIM_CHANNEL") + [
+        schema_fields=_fields(
+            "GA4_DIM_CHANNEL",
             {"name": "SESSION_DEFAULT_CHANNEL_GROUP", "type": "STRING", "mode": "NULLABLE", "description": "Grupo de canal padrao da sessao"},
             {"name": "FIRST_USER_DEFAULT_CHANNEL_GROUP", "type": "STRING", "mode": "NULLABLE", "description": "Grupo de canal padrao do primeiro usuario"},
             {"name": "SESSION_PRIMARY_CHANNEL_GROUP", "type": "STRING", "mode": "NULLABLE", "description": "Grupo de canal primario da sessao"},
@@ -219,7 +387,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             {"name": "AVERAGE_SESSION_DURATION", "type": "FLOAT", "mode": "NULLABLE", "description": "Duracao media da sessao"},
             {"name": "CONVERSIONS", "type": "INTEGER", "mode": "NULLABLE", "description": "Conversoes"},
             {"name": "TOTAL_REVENUE", "type": "FLOAT", "mode": "NULLABLE", "description": "Receita total"},
-        ]
+        ),
+        cluster_keys=CLUSTER_KEYS["CHANNEL"]
     ),
 
     # -------------------------------------------------------------------------
@@ -248,7 +417,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             "engagementRate",
             "screenPageViews",
         ],
-        schema_fields=get_base_fields("GA4_DIM_GEOGRAPHIC") + [
+        schema_fields=_fields(
+            "GA4_DIM_GEOGRAPHIC",
             {"name": "COUNTRY", "type": "STRING", "mode": "NULLABLE", "description": "Pais"},
             {"name": "COUNTRY_ID", "type": "STRING", "mode": "NULLABLE", "description": "ID do pais"},
             {"name": "REGION", "type": "STRING", "mode": "NULLABLE", "description": "Regiao/Estado"},
@@ -264,7 +434,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             {"name": "ENGAGED_SESSIONS", "type": "INTEGER", "mode": "NULLABLE", "description": "Sessoes engajadas"},
             {"name": "ENGAGEMENT_RATE", "type": "FLOAT", "mode": "NULLABLE", "description": "Taxa de engajamento"},
             {"name": "SCREEN_PAGE_VIEWS", "type": "INTEGER", "mode": "NULLABLE", "description": "Visualizacoes de pagina"},
-        ]
+        ),
+        cluster_keys=CLUSTER_KEYS["GEOGRAPHIC"]
     ),
 
     # -------------------------------------------------------------------------
@@ -298,7 +469,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             "engagementRate",
             "screenPageViews",
         ],
-        schema_fields=get_base_fields("GA4_DIM_DEVICE") + [
+        schema_fields=_fields(
+            "GA4_DIM_DEVICE",
             {"name": "DEVICE_CATEGORY", "type": "STRING", "mode": "NULLABLE", "description": "Categoria do dispositivo"},
             {"name": "DEVICE_MODEL", "type": "STRING", "mode": "NULLABLE", "description": "Modelo do dispositivo"},
             {"name": "MOBILE_DEVICE_BRANDING", "type": "STRING", "mode": "NULLABLE", "description": "Marca do dispositivo movel"},
@@ -319,7 +491,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             {"name": "ENGAGED_SESSIONS", "type": "INTEGER", "mode": "NULLABLE", "description": "Sessoes engajadas"},
             {"name": "ENGAGEMENT_RATE", "type": "FLOAT", "mode": "NULLABLE", "description": "Taxa de engajamento"},
             {"name": "SCREEN_PAGE_VIEWS", "type": "INTEGER", "mode": "NULLABLE", "description": "Visualizacoes de pagina"},
-        ]
+        ),
+        cluster_keys=CLUSTER_KEYS["DEVICE"]
     ),
 
     # -------------------------------------------------------------------------
@@ -352,7 +525,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             "entrances",
             "exits",
         ],
-        schema_fields=get_base_fields("GA4_DIM_PAGE") + [
+        schema_fields=_fields(
+            "GA4_DIM_PAGE",
             {"name": "PAGE_PATH", "type": "STRING", "mode": "NULLABLE", "description": "Caminho da pagina"},
             {"name": "PAGE_PATH_PLUS_QUERY_STRING", "type": "STRING", "mode": "NULLABLE", "description": "Caminho da pagina com query string"},
             {"name": "PAGE_TITLE", "type": "STRING", "mode": "NULLABLE", "description": "Titulo da pagina"},
@@ -372,7 +546,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             {"name": "BOUNCE_RATE", "type": "FLOAT", "mode": "NULLABLE", "description": "Taxa de rejeicao"},
             {"name": "ENTRANCES", "type": "INTEGER", "mode": "NULLABLE", "description": "Entradas"},
             {"name": "EXITS", "type": "INTEGER", "mode": "NULLABLE", "description": "Saidas"},
-        ]
+        ),
+        cluster_keys=CLUSTER_KEYS["PAGE"]
     ),
 
     # -------------------------------------------------------------------------
@@ -396,7 +571,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             "eventValue",
             "totalRevenue",
         ],
-        schema_fields=get_base_fields("GA4_DIM_EVENT") + [
+        schema_fields=_fields(
+            "GA4_DIM_EVENT",
             {"name": "EVENT_NAME", "type": "STRING", "mode": "NULLABLE", "description": "Nome do evento"},
             {"name": "IS_CONVERSION_EVENT", "type": "STRING", "mode": "NULLABLE", "description": "Indica se e evento de conversao"},
             {"name": "EVENT_COUNT", "type": "INTEGER", "mode": "NULLABLE", "description": "Contagem de eventos"},
@@ -407,7 +583,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             {"name": "CONVERSIONS", "type": "INTEGER", "mode": "NULLABLE", "description": "Conversoes"},
             {"name": "EVENT_VALUE", "type": "FLOAT", "mode": "NULLABLE", "description": "Valor do evento"},
             {"name": "TOTAL_REVENUE", "type": "FLOAT", "mode": "NULLABLE", "description": "Receita total"},
-        ]
+        ),
+        cluster_keys=CLUSTER_KEYS["EVENT"]
     ),
 
     # -------------------------------------------------------------------------
@@ -440,7 +617,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             "averageSessionDuration",
             "screenPageViewsPerSession",
         ],
-        schema_fields=get_base_fields("GA4_DIM_USER") + [
+        schema_fields=_fields(
+            "GA4_DIM_USER",
             {"name": "NEW_VS_RETURNING", "type": "STRING", "mode": "NULLABLE", "description": "Novo vs recorrente"},
             {"name": "USER_AGE_BRACKET", "type": "STRING", "mode": "NULLABLE", "description": "Faixa etaria do usuario"},
             {"name": "USER_GENDER", "type": "STRING", "mode": "NULLABLE", "description": "Genero do usuario"},
@@ -460,7 +638,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             {"name": "ENGAGEMENT_RATE", "type": "FLOAT", "mode": "NULLABLE", "description": "Taxa de engajamento"},
             {"name": "AVERAGE_SESSION_DURATION", "type": "FLOAT", "mode": "NULLABLE", "description": "Duracao media da sessao"},
             {"name": "SCREEN_PAGE_VIEWS_PER_SESSION", "type": "FLOAT", "mode": "NULLABLE", "description": "Visualizacoes por sessao"},
-        ]
+        ),
+        cluster_keys=CLUSTER_KEYS["USER"]
     ),
 
     # -------------------------------------------------------------------------
@@ -504,7 +683,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             "totalRevenue",
             "transactions",
         ],
-        schema_fields=get_base_fields("GA4_DIM_ECOMMERCE") + [
+        schema_fields=_fields(
+            "GA4_DIM_ECOMMERCE",
             {"name": "TRANSACTION_ID", "type": "STRING", "mode": "NULLABLE", "description": "ID da transacao"},
             {"name": "ITEM_ID", "type": "STRING", "mode": "NULLABLE", "description": "ID do item"},
             {"name": "ITEM_NAME", "type": "STRING", "mode": "NULLABLE", "description": "Nome do item"},
@@ -535,7 +715,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             {"name": "PURCHASE_REVENUE", "type": "FLOAT", "mode": "NULLABLE", "description": "Receita de compras"},
             {"name": "TOTAL_REVENUE", "type": "FLOAT", "mode": "NULLABLE", "description": "Receita total"},
             {"name": "TRANSACTIONS", "type": "INTEGER", "mode": "NULLABLE", "description": "Transacoes"},
-        ]
+        ),
+        cluster_keys=CLUSTER_KEYS["ECOMMERCE"]
     ),
 
     # -------------------------------------------------------------------------
@@ -567,7 +748,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             "newUsers",
             "totalUsers",
         ],
-        schema_fields=get_base_fields("GA4_DIM_SESSION") + [
+        schema_fields=_fields(
+            "GA4_DIM_SESSION",
             {"name": "SESSION_DEFAULT_CHANNEL_GROUP", "type": "STRING", "mode": "NULLABLE", "description": "Grupo de canal padrao"},
             {"name": "SESSION_SOURCE", "type": "STRING", "mode": "NULLABLE", "description": "Origem da sessao"},
             {"name": "SESSION_MEDIUM", "type": "STRING", "mode": "NULLABLE", "description": "Midia da sessao"},
@@ -586,7 +768,9 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             {"name": "ACTIVE_USERS", "type": "INTEGER", "mode": "NULLABLE", "description": "Usuarios ativos"},
             {"name": "NEW_USERS", "type": "INTEGER", "mode": "NULLABLE", "description": "Novos usuarios"},
             {"name": "TOTAL_USERS", "type": "INTEGER", "mode": "NULLABLE", "description": "Total de usuarios"},
-        ]
+        ),
+        cluster_keys=CLUSTER_KEYS["SESSION"],
+        clustering_fields=("PROPERTY_ID", "SESSION_SOURCE", "SESSION_MEDIUM", "DEVICE_CATEGORY")
     ),
 
     # -------------------------------------------------------------------------
@@ -627,7 +811,8 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             "advertiserAdCostPerClick",
             "advertiserAdImpressions",
         ],
-        schema_fields=get_base_fields("GA4_DIM_GOOGLE_ADS") + [
+        schema_fields=_fields(
+            "GA4_DIM_GOOGLE_ADS",
             {"name": "SESSION_GOOGLE_ADS_ACCOUNT_NAME", "type": "STRING", "mode": "NULLABLE", "description": "Nome da conta Google Ads da sessao"},
             {"name": "SESSION_GOOGLE_ADS_AD_GROUP_ID", "type": "STRING", "mode": "NULLABLE", "description": "ID do grupo de anuncios da sessao"},
             {"name": "SESSION_GOOGLE_ADS_AD_GROUP_NAME", "type": "STRING", "mode": "NULLABLE", "description": "Nome do grupo de anuncios da sessao"},
@@ -655,22 +840,32 @@ DIMENSION_SCHEMAS: Dict[str, TableSchema] = {
             {"name": "ADVERTISER_AD_COST", "type": "FLOAT", "mode": "NULLABLE", "description": "Custo de anuncios"},
             {"name": "ADVERTISER_AD_COST_PER_CLICK", "type": "FLOAT", "mode": "NULLABLE", "description": "Custo por clique"},
             {"name": "ADVERTISER_AD_IMPRESSIONS", "type": "INTEGER", "mode": "NULLABLE", "description": "Impressoes de anuncios"},
-        ]
+        ),
+        cluster_keys=CLUSTER_KEYS["GOOGLE_ADS"],
+        clustering_fields=("PROPERTY_ID", "GOOGLE_ADS_ACCOUNT_NAME", "GOOGLE_ADS_CAMPAIGN_ID")
     ),
-}
+})
 
 
-def get_all_schemas() -> Dict[str, TableSchema]:
+def get_all_schemas() -> Mapping[str, TableSchema]:
     """Retorna todos os schemas de dimensao."""
     return DIMENSION_SCHEMAS
 
 
+# Indice de chaves em minusculas -> chave canonica (lookup case-insensitive)
+_NORMALIZED_INDEX: Dict[str, str] = {k.lower(): k for k in DIMENSION_SCHEMAS}
+_AVAILABLE_DIMENSIONS: Tuple[str, ...] = tuple(DIMENSION_SCHEMAS)
+_SCHEMA_KEYS: frozenset = frozenset(DIMENSION_SCHEMAS)
+
+
+@lru_cache(maxsize=64)
 def get_schema(dimension_key: str) -> TableSchema:
     """
     Retorna o schema de uma dimensao especifica.
 
     Args:
-        dimension_key: Chave da dimensao (ex: CAMPAIGN, SOURCE_MEDIUM)
+        dimension_key: Chave da dimensao (ex: CAMPAIGN, SOURCE_MEDIUM), sem
+            diferenciar maiusculas/minusculas
 
     Returns:
         TableSchema da dimensao
@@ -678,14 +873,19 @@ def get_schema(dimension_key: str) -> TableSchema:
     Raises:
         KeyError: Se a dimensao nao existir
     """
-    if dimension_key not in DIMENSION_SCHEMAS:
-        raise KeyError(f"Schema nao encontrado: {dimension_key}. Disponiveis: {list(DIMENSION_SCHEMAS.keys())}")
-    return DIMENSION_SCHEMAS[dimension_key]
-
-
-def list_available_dimensions() -> list:
-    """Retorna lista de dimensoes disponiveis."""
-    return list(DIMENSION_SCHEMAS.keys())
+    # Caminho rapido para chaves ja canonicas; senao, indice case-insensitive
+    if dimension_key in _SCHEMA_KEYS:
+        return DIMENSION_SCHEMAS[dimension_key]
+    canonical = _NORMALIZED_INDEX.get(dimension_key.lower())
+    schema = DIMENSION_SCHEMAS.get(canonical) if canonical else None
+    if schema is None:
+        raise KeyError(f"Schema nao encontrado: {dimension_key}. Disponiveis: {list(_AVAILABLE_DIMENSIONS)}")
+    return schema
+
+
+def list_available_dimensions() -> Tuple[str, ...]:
+    """Retorna as dimensoes disponiveis (tupla pre-calculada)."""
+    return _AVAILABLE_DIMENSIONS
 
 
 def get_pk_field_name(table_name: str) -> str:
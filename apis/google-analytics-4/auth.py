@@ -15,15 +15,22 @@ Versão: 2.0.0
 import os
 import json
 import logging
-from typing import Optional, Dict, Any, Tuple
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass
 
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+from cachetools import TTLCache, cached
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fallback para json da stdlib
+    orjson = None
+
+# A configuração de logging fica a cargo da aplicação (main.py)
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
 
 
 # =============================================================================
@@ -42,6 +49,79 @@ class AuthConfig:
 # Configuração global
 AUTH_CONFIG = AuthConfig()
 
+# Canal gRPC do GA4: keepalive evita refazer TCP/TLS após períodos ociosos
+GA4_API_HOST = "analyticsdata.googleapis.com:443"
+GRPC_CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),  # sem limite de pings com o canal ocioso
+    ("grpc.max_concurrent_streams", 1000),
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+]
+
+# Pool HTTP do BigQuery (cobre os threads do gunicorn e as inserções em lote)
+HTTP_POOL_SIZE = 32
+
+# Clientes inicializados por (project_id, credentials_path, use_secret_manager)
+_CLIENT_SINGLETON: Dict[Tuple, Dict[str, Any]] = {}
+_CLIENT_SINGLETON_LOCK = Lock()
+
+# Secrets rotacionam em dias; 1 hora de TTL evita chamadas repetidas ao Secret Manager
+_SECRET_CACHE: TTLCache = TTLCache(maxsize=64, ttl=3600)
+_SECRET_CACHE_LOCK = Lock()
+_SECRET_JSON_CACHE: TTLCache = TTLCache(maxsize=64, ttl=3600)
+_SECRET_JSON_CACHE_LOCK = Lock()
+
+
+# Credenciais construídas a partir de secrets (evita reprocessar a chave privada)
+_CREDENTIALS_CACHE: TTLCache = TTLCache(maxsize=16, ttl=3600)
+_CREDENTIALS_CACHE_LOCK = Lock()
+
+# Clientes do Secret Manager por credenciais (o canal gRPC é reaproveitado)
+_SECRET_MANAGER_CLIENTS: Dict[int, Any] = {}
+_SECRET_MANAGER_CLIENTS_LOCK = Lock()
+
+# Clientes da BigQuery Storage Write API por credenciais (canal gRPC reaproveitado)
+_BIGQUERY_WRITE_CLIENTS: Dict[int, Any] = {}
+_BIGQUERY_WRITE_CLIENTS_LOCK = Lock()
+
+
+def _secret_cache_key(
+    secret_id: str,
+    credentials: Any = None,
+    project_id: Optional[str] = None,
+    version: str = "latest"
+) -> Tuple[str, str, str]:
+    """Chave de cache de um secret (as credenciais não entram na chave)."""
+    return (secret_id, project_id or AUTH_CONFIG.project_id, version)
+
+
+# =============================================================================
+# IMPORTS SOB DEMANDA
+# =============================================================================
+
+# Módulos do Google já carregados (cada um é importado uma única vez)
+_LAZY_MODULES: Dict[str, Any] = {}
+
+
+def _lazy(module_name: str) -> Any:
+    """
+    Importa um módulo pesado do Google apenas no primeiro uso.
+    
+    Args:
+        module_name: Nome completo do módulo (ex: google.cloud.bigquery)
+        
+    Returns:
+        Módulo importado
+    """
+    module = _LAZY_MODULES.get(module_name)
+    if module is None:
+        module = importlib.import_module(module_name)
+        _LAZY_MODULES[module_name] = module
+    return module
+
 
 # =============================================================================
 # FUNÇÕES DE AUTENTICAÇÃO
@@ -73,65 +153,49 @@ def authenticate_gcp(
         >>> credentials, project = authenticate_gcp()
         >>> # Agora pode usar os outros serviços
     """
-    from google.oauth2 import service_account
-    from google.auth import default as google_auth_default
+    service_account = _lazy("google.oauth2.service_account")
     
     project = project_id or AUTH_CONFIG.project_id
-    credentials = None
     
     logger.info(f"Iniciando autenticação GCP para projeto: {project}")
     
-    # Método 1: Credenciais via JSON string
-    if credentials_json:
-        logger.info("Usando credenciais via JSON string")
+    def _from_file(path: Optional[str], warn_missing: bool = False) -> Optional[Tuple[Any, str]]:
+        if not path:
+            return None
+        if not os.path.exists(path):
+            if warn_missing:
+                logger.warning(f"Arquivo de credenciais não encontrado: {path}")
+            return None
+        return service_account.Credentials.from_service_account_file(path), project
+    
+    def _from_json() -> Optional[Tuple[Any, str]]:
+        if not credentials_json:
+            return None
         credentials_dict = json.loads(credentials_json)
-        credentials = service_account.Credentials.from_service_account_info(
-            credentials_dict
-        )
-        logger.info("✓ Autenticação via JSON string bem-sucedida")
-        return credentials, project
-    
-    # Método 2: Credenciais via arquivo local
-    if credentials_path:
-        if os.path.exists(credentials_path):
-            logger.info(f"Usando credenciais do arquivo: {credentials_path}")
-            credentials = service_account.Credentials.from_service_account_file(
-                credentials_path
-            )
-            logger.info("✓ Autenticação via arquivo bem-sucedida")
-            return credentials, project
-        else:
-            logger.warning(f"Arquivo de credenciais não encontrado: {credentials_path}")
+        return service_account.Credentials.from_service_account_info(credentials_dict), project
     
-    # Método 3: Credenciais do AUTH_CONFIG
-    if AUTH_CONFIG.credentials_path and os.path.exists(AUTH_CONFIG.credentials_path):
-        logger.info(f"Usando credenciais do AUTH_CONFIG: {AUTH_CONFIG.credentials_path}")
-        credentials = service_account.Credentials.from_service_account_file(
-            AUTH_CONFIG.credentials_path
-        )
-        logger.info("✓ Autenticação via AUTH_CONFIG bem-sucedida")
-        return credentials, project
-    
-    # Método 4: Variável de ambiente GOOGLE_APPLICATION_CREDENTIALS
-    env_credentials = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS")
-    if env_credentials and os.path.exists(env_credentials):
-        logger.info(f"Usando GOOGLE_APPLICATION_CREDENTIALS: {env_credentials}")
-        credentials = service_account.Credentials.from_service_account_file(
-            env_credentials
-        )
-        logger.info("✓ Autenticação via variável de ambiente bem-sucedida")
-        return credentials, project
-    
-    # Método 5: Credenciais padrão do ambiente (Cloud Run, Compute Engine, etc.)
-    try:
-        logger.info("Tentando usar credenciais padrão do ambiente (ADC)")
-        credentials, detected_project = google_auth_default()
-        if detected_project:
-            project = detected_project
-        logger.info("✓ Autenticação via ADC bem-sucedida")
-        return credentials, project
-    except Exception as e:
-        logger.error(f"Falha na autenticação ADC: {e}")
+    def _from_adc() -> Optional[Tuple[Any, str]]:
+        try:
+            credentials, detected_project = _lazy("google.auth").default()
+        except Exception as e:
+            logger.error(f"Falha na autenticação ADC: {e}")
+            return None
+        return credentials, detected_project or project
+    
+    # Ordem de precedência; cada estratégia só é avaliada se as anteriores falharem
+    strategies = [
+        ("JSON string", _from_json),
+        ("arquivo", lambda: _from_file(credentials_path, warn_missing=True)),
+        ("AUTH_CONFIG", lambda: _from_file(AUTH_CONFIG.credentials_path)),
+        ("variável de ambiente", lambda: _from_file(os.environ.get("GOOGLE_APPLICATION_CREDENTIALS"))),
+        ("ADC", _from_adc),
+    ]
+    
+    for name, loader in strategies:
+        result = loader()
+        if result:
+            logger.info("✓ Autenticação via %s bem-sucedida", name)
+            return result
     
     raise ValueError(
         "Não foi possível autenticar no GCP. "
@@ -144,6 +208,9 @@ def get_secret_manager_client(credentials: Any = None, project_id: Optional[str]
     """
     Obtém um cliente do Secret Manager.
     
+    O cliente é criado uma vez por credenciais e reaproveitado nas chamadas
+    seguintes (sem abrir um novo canal gRPC a cada secret buscado).
+    
     Args:
         credentials: Credenciais GCP (obtidas via authenticate_gcp)
         project_id: ID do projeto
@@ -151,25 +218,30 @@ def get_secret_manager_client(credentials: Any = None, project_id: Optional[str]
     Returns:
         Cliente do Secret Manager
     """
-    from google.cloud import secretmanager
-    
     project = project_id or AUTH_CONFIG.project_id
+    key = _credentials_fingerprint(credentials) if credentials else 0
+    
+    with _SECRET_MANAGER_CLIENTS_LOCK:
+        client = _SECRET_MANAGER_CLIENTS.get(key)
+        if client is None:
+            secretmanager = _lazy("google.cloud.secretmanager")
+            if credentials:
+                client = secretmanager.SecretManagerServiceClient(credentials=credentials)
+            else:
+                client = secretmanager.SecretManagerServiceClient()
+            _SECRET_MANAGER_CLIENTS[key] = client
+            logger.info(f"✓ Cliente Secret Manager inicializado para projeto: {project}")
     
-    if credentials:
-        client = secretmanager.SecretManagerServiceClient(credentials=credentials)
-    else:
-        client = secretmanager.SecretManagerServiceClient()
-    
-    logger.info(f"✓ Cliente Secret Manager inicializado para projeto: {project}")
     return client, project
 
 
+@cached(cache=_SECRET_CACHE, key=_secret_cache_key, lock=_SECRET_CACHE_LOCK)
 def get_secret(
     secret_id: str,
     credentials: Any = None,
     project_id: Optional[str] = None,
     version: str = "latest"
-) -> str:
+) -> bytes:
     """
     Recupera um secret do Secret Manager.
     
@@ -180,7 +252,10 @@ def get_secret(
         version: Versão do secret
         
     Returns:
-        Valor do secret como string
+        Valor do secret em bytes (payload bruto, sem decodificação)
+        
+    Note:
+        O resultado fica em cache por 1 hora por (secret_id, projeto, versão).
     """
     client, project = get_secret_manager_client(credentials, project_id)
     
@@ -188,14 +263,35 @@ def get_secret(
     
     try:
         response = client.access_secret_version(name=name)
-        secret_value = response.payload.data.decode("UTF-8")
-        logger.info(f"✓ Secret recuperado: {secret_id}")
-        return secret_value
+        logger.debug("✓ Secret recuperado: %s", secret_id)
+        return response.payload.data
     except Exception as e:
-        logger.error(f"✗ Erro ao recuperar secret {secret_id}: {e}")
+        logger.error("✗ Erro ao recuperar secret %s: %s", secret_id, e)
         raise
 
 
+def get_secret_as_str(
+    secret_id: str,
+    credentials: Any = None,
+    project_id: Optional[str] = None,
+    version: str = "latest"
+) -> str:
+    """
+    Recupera um secret do Secret Manager como string.
+    
+    Args:
+        secret_id: ID do secret
+        credentials: Credenciais GCP
+        project_id: ID do projeto
+        version: Versão do secret
+        
+    Returns:
+        Valor do secret como string
+    """
+    return get_secret(secret_id, credentials, project_id, version).decode("UTF-8")
+
+
+@cached(cache=_SECRET_JSON_CACHE, key=_secret_cache_key, lock=_SECRET_JSON_CACHE_LOCK)
 def get_secret_as_json(
     secret_id: str,
     credentials: Any = None,
@@ -215,9 +311,18 @@ def get_secret_as_json(
         Valor do secret como dicionário
     """
     secret_value = get_secret(secret_id, credentials, project_id, version)
+    if orjson is not None:
+        return orjson.loads(secret_value)
     return json.loads(secret_value)
 
 
+@cached(
+    cache=_CREDENTIALS_CACHE,
+    key=lambda secret_id, credentials=None, project_id=None: (
+        secret_id, project_id or AUTH_CONFIG.project_id
+    ),
+    lock=_CREDENTIALS_CACHE_LOCK
+)
 def get_credentials_from_secret(
     secret_id: str,
     credentials: Any = None,
@@ -226,6 +331,9 @@ def get_credentials_from_secret(
     """
     Recupera credenciais de conta de serviço de um secret.
     
+    O objeto de credenciais é cacheado por (secret_id, projeto), então
+    chamadas repetidas não reprocessam o JSON nem a chave privada.
+    
     Args:
         secret_id: ID do secret contendo as credenciais JSON
         credentials: Credenciais GCP para acessar o Secret Manager
@@ -234,7 +342,7 @@ def get_credentials_from_secret(
     Returns:
         Objeto de credenciais da conta de serviço
     """
-    from google.oauth2 import service_account
+    service_account = _lazy("google.oauth2.service_account")
     
     credentials_dict = get_secret_as_json(secret_id, credentials, project_id)
     new_credentials = service_account.Credentials.from_service_account_info(
@@ -244,6 +352,43 @@ def get_credentials_from_secret(
     return new_credentials
 
 
+def get_scoped_credentials(base_credentials: Any, scopes: List[str]) -> Any:
+    """
+    Especializa credenciais existentes para um conjunto de escopos.
+    
+    Reaproveita o mesmo signer (with_scopes) em vez de construir novas
+    credenciais a partir do JSON.
+    
+    Args:
+        base_credentials: Credenciais base
+        scopes: Escopos OAuth desejados
+        
+    Returns:
+        Credenciais com os escopos aplicados (ou as próprias, se não suportarem)
+    """
+    google_credentials = _lazy("google.auth.credentials")
+    return google_credentials.with_scopes_if_required(base_credentials, scopes)
+
+
+def _pooled_session(credentials: Any):
+    """
+    Cria uma AuthorizedSession com pool de conexões HTTP mantidas abertas.
+    
+    Args:
+        credentials: Credenciais GCP
+        
+    Returns:
+        AuthorizedSession com HTTPAdapter dimensionado por HTTP_POOL_SIZE
+    """
+    AuthorizedSession = _lazy("google.auth.transport.requests").AuthorizedSession
+    HTTPAdapter = _lazy("requests.adapters").HTTPAdapter
+    
+    session = AuthorizedSession(credentials)
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    return session
+
+
 def get_bigquery_client(credentials: Any = None, project_id: Optional[str] = None):
     """
     Obtém um cliente do BigQuery.
@@ -255,35 +400,81 @@ def get_bigquery_client(credentials: Any = None, project_id: Optional[str] = Non
     Returns:
         Cliente do BigQuery
     """
-    from google.cloud import bigquery
+    bigquery = _lazy("google.cloud.bigquery")
     
     project = project_id or AUTH_CONFIG.project_id
     
-    if credentials:
-        client = bigquery.Client(project=project, credentials=credentials)
-    else:
-        client = bigquery.Client(project=project)
+    if not credentials:
+        credentials, _ = _lazy("google.auth").default(
+            scopes=["https://www.googleapis.com/auth/cloud-platform"]
+        )
+    
+    client = bigquery.Client(
+        project=project,
+        credentials=credentials,
+        _http=_pooled_session(credentials)
+    )
     
     logger.info(f"✓ Cliente BigQuery inicializado para projeto: {project}")
     return client
 
 
+def get_bigquery_write_client(credentials: Any = None):
+    """
+    Obtém um cliente da BigQuery Storage Write API (BigQueryWriteClient).
+    
+    O cliente é criado uma vez por credenciais, como no Secret Manager, e
+    reaproveitado nas gravações seguintes.
+    
+    Args:
+        credentials: Credenciais GCP (None usa as credenciais padrão)
+        
+    Returns:
+        Cliente da Storage Write API
+    """
+    key = _credentials_fingerprint(credentials) if credentials else 0
+    
+    with _BIGQUERY_WRITE_CLIENTS_LOCK:
+        client = _BIGQUERY_WRITE_CLIENTS.get(key)
+        if client is None:
+            bigquery_storage = _lazy("google.cloud.bigquery_storage_v1")
+            client = bigquery_storage.BigQueryWriteClient(credentials=credentials)
+            _BIGQUERY_WRITE_CLIENTS[key] = client
+            logger.info("✓ Cliente BigQuery Storage Write API inicializado")
+    
+    return client
+
+
 def get_ga4_client(credentials: Any = None):
     """
     Obtém um cliente do Google Analytics Data API.
     
+    O canal gRPC é criado com keepalive (GRPC_CHANNEL_OPTIONS); se não for
+    possível montar o transporte customizado, usa o cliente padrão.
+    
     Args:
         credentials: Credenciais GCP (obtidas via authenticate_gcp)
         
     Returns:
         Cliente do GA4 Data API
     """
-    from google.analytics.data_v1beta import BetaAnalyticsDataClient
+    BetaAnalyticsDataClient = _lazy("google.analytics.data_v1beta").BetaAnalyticsDataClient
     
-    if credentials:
-        client = BetaAnalyticsDataClient(credentials=credentials)
-    else:
-        client = BetaAnalyticsDataClient()
+    try:
+        transports = _lazy("google.analytics.data_v1beta.services.beta_analytics_data.transports")
+        channel = transports.BetaAnalyticsDataGrpcTransport.create_channel(
+            GA4_API_HOST,
+            credentials=credentials,
+            options=GRPC_CHANNEL_OPTIONS
+        )
+        transport = transports.BetaAnalyticsDataGrpcTransport(channel=channel)
+        client = BetaAnalyticsDataClient(transport=transport)
+    except Exception as e:
+        logger.warning(f"Usando canal gRPC padrão para GA4: {e}")
+        if credentials:
+            client = BetaAnalyticsDataClient(credentials=credentials)
+        else:
+            client = BetaAnalyticsDataClient()
     
     logger.info("✓ Cliente GA4 Data API inicializado")
     return client
@@ -293,6 +484,24 @@ def get_ga4_client(credentials: Any = None):
 # FUNÇÃO DE INICIALIZAÇÃO COMPLETA
 # =============================================================================
 
+def _credentials_fingerprint(credentials: Any) -> int:
+    """Identifica as credenciais sem depender do token (que muda a cada refresh)."""
+    return hash((
+        type(credentials).__name__,
+        getattr(credentials, "service_account_email", None)
+    ))
+
+
+def reset_clients() -> None:
+    """Descarta os clientes cacheados (initialize_all_clients, Secret Manager e Storage Write API)."""
+    with _CLIENT_SINGLETON_LOCK:
+        _CLIENT_SINGLETON.clear()
+    with _SECRET_MANAGER_CLIENTS_LOCK:
+        _SECRET_MANAGER_CLIENTS.clear()
+    with _BIGQUERY_WRITE_CLIENTS_LOCK:
+        _BIGQUERY_WRITE_CLIENTS.clear()
+
+
 def initialize_all_clients(
     project_id: Optional[str] = None,
     credentials_path: Optional[str] = None,
@@ -324,6 +533,14 @@ def initialize_all_clients(
         >>> bq_client = clients["bigquery"]
         >>> ga4_client = clients["ga4"]
     """
+    # Reutilizar clientes já inicializados neste processo, sem autenticar de novo
+    cache_key = (project_id, credentials_path, use_secret_manager)
+    with _CLIENT_SINGLETON_LOCK:
+        cached_clients = _CLIENT_SINGLETON.get(cache_key)
+    if cached_clients is not None:
+        logger.info("✓ Reutilizando clientes GCP já inicializados")
+        return cached_clients
+    
     logger.info("=" * 50)
     logger.info("INICIALIZANDO CLIENTES GCP")
     logger.info("=" * 50)
@@ -343,46 +560,57 @@ def initialize_all_clients(
         "secret_manager": None
     }
     
-    # 3. Tentar obter credenciais específicas do Secret Manager
+    # 3. Buscar credenciais específicas e o cliente do Secret Manager em paralelo
+    #    (chamadas de I/O independentes)
     ga4_credentials = credentials
     bq_credentials = credentials
     
-    if use_secret_manager:
-        try:
-            # Credenciais para GA4
-            ga4_credentials = get_credentials_from_secret(
-                AUTH_CONFIG.secret_id_ga4,
-                credentials,
-                project
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        secret_manager_future = executor.submit(
+            get_secret_manager_client, credentials, project
+        )
+        
+        if use_secret_manager:
+            ga4_future = executor.submit(
+                get_credentials_from_secret, AUTH_CONFIG.secret_id_ga4, credentials, project
+            )
+            bq_future = executor.submit(
+                get_credentials_from_secret, AUTH_CONFIG.secret_id_bq, credentials, project
             )
+            
+            try:
+                ga4_credentials = ga4_future.result()
+            except Exception as e:
+                logger.warning(f"Usando credenciais padrão para GA4: {e}")
+            
+            try:
+                bq_credentials = bq_future.result()
+            except Exception as e:
+                logger.warning(f"Usando credenciais padrão para BigQuery: {e}")
+        
+        # 4. Inicializar clientes específicos (dependem das credenciais acima)
+        bigquery_future = executor.submit(get_bigquery_client, bq_credentials, project)
+        ga4_client_future = executor.submit(get_ga4_client, ga4_credentials)
+        
+        try:
+            clients["bigquery"] = bigquery_future.result()
         except Exception as e:
-            logger.warning(f"Usando credenciais padrão para GA4: {e}")
+            logger.error(f"Erro ao inicializar BigQuery: {e}")
         
         try:
-            # Credenciais para BigQuery
-            bq_credentials = get_credentials_from_secret(
-                AUTH_CONFIG.secret_id_bq,
-                credentials,
-                project
-            )
+            clients["ga4"] = ga4_client_future.result()
         except Exception as e:
-            logger.warning(f"Usando credenciais padrão para BigQuery: {e}")
-    
-    # 4. Inicializar clientes específicos
-    try:
-        clients["bigquery"] = get_bigquery_client(bq_credentials, project)
-    except Exception as e:
-        logger.error(f"Erro ao inicializar BigQuery: {e}")
-    
-    try:
-        clients["ga4"] = get_ga4_client(ga4_credentials)
-    except Exception as e:
-        logger.error(f"Erro ao inicializar GA4: {e}")
+            logger.error(f"Erro ao inicializar GA4: {e}")
+        
+        try:
+            clients["secret_manager"], _ = secret_manager_future.result()
+        except Exception as e:
+            logger.error(f"Erro ao inicializar Secret Manager: {e}")
     
-    try:
-        clients["secret_manager"], _ = get_secret_manager_client(credentials, project)
-    except Exception as e:
-        logger.error(f"Erro ao inicializar Secret Manager: {e}")
+    # Só cacheia se os clientes principais subiram; falhas são retentadas
+    if clients["bigquery"] is not None and clients["ga4"] is not None:
+        with _CLIENT_SINGLETON_LOCK:
+            clients = _CLIENT_SINGLETON.setdefault(cache_key, clients)
     
     logger.info("=" * 50)
     logger.info("INICIALIZAÇÃO CONCLUÍDA")
@@ -434,5 +662,9 @@ def test_authentication(credentials_path: Optional[str] = None) -> bool:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
     # Executar teste de autenticação
     test_authentication()
@@ -9,13 +9,73 @@ Data: Janeiro de 2026
 Versão: 2.0.0
 """
 
+import hashlib
+import json
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import random
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from itertools import chain
+from threading import Lock, RLock
+from types import MappingProxyType
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from datetime import date, datetime, timedelta, timezone
 
-# Configurar logging
-logging.basicConfig(level=logging.INFO)
+from cachetools import TTLCache
+
+from auth import get_bigquery_write_client
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fallback para json da stdlib
+    orjson = None
+
+# datetime sem timezone é tratado como UTC; arrays numpy são serializados nativamente
+_ORJSON_OPTIONS = (orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY) if orjson is not None else 0
+
+# A configuração de logging fica a cargo da aplicação (main.py)
 logger = logging.getLogger(__name__)
+logger.addHandler(logging.NullHandler())
+
+
+# =============================================================================
+# IMPORT SOB DEMANDA
+# =============================================================================
+
+# google.cloud.bigquery é pesado; importado apenas no primeiro uso
+_bigquery = None
+
+
+def _bq():
+    """Retorna o módulo google.cloud.bigquery, importando-o na primeira chamada."""
+    global _bigquery
+    if _bigquery is None:
+        from google.cloud import bigquery as _bigquery
+    return _bigquery
+
+
+# pyarrow é opcional: sem ele, load jobs usam NDJSON
+_pyarrow = None
+
+
+def _arrow():
+    """
+    Retorna (pyarrow, pyarrow.compute, pyarrow.parquet) ou None se o pyarrow
+    não estiver instalado. O import é feito na primeira chamada.
+    """
+    global _pyarrow
+    if _pyarrow is None:
+        try:
+            import pyarrow
+            import pyarrow.compute
+            import pyarrow.parquet
+            _pyarrow = (pyarrow, pyarrow.compute, pyarrow.parquet)
+        except ImportError:
+            _pyarrow = False
+    return _pyarrow or None
 
 
 # =============================================================================
@@ -24,6 +84,28 @@ logger = logging.getLogger(__name__)
 
 DATASET_ID = "RAW"
 
+# Acima deste número de linhas a inserção usa load job em vez de streaming
+STREAMING_THRESHOLD = 500
+
+# Payload de load job fica em memória até este tamanho; acima disso, em disco
+SPOOL_MAX_BYTES = 64 * 1024 * 1024
+
+# Dados no buffer de streaming não aceitam DELETE por até ~90 minutos
+STREAMING_BUFFER_HORIZON = timedelta(minutes=90)
+
+# Modos de escrita: "auto" escolhe pelo volume; "load" força load job
+# (sem custo por MB, cota de 1.500/dia por tabela); "streaming" força insertAll;
+# "storage" usa a Storage Write API (stream PENDING, commit atômico)
+WRITE_MODES = ("auto", "load", "streaming", "storage")
+
+# Limites por requisição de streaming (API: 50.000 linhas / 10 MB)
+STREAMING_BATCH_SIZE = 500
+MAX_STREAMING_BATCH_SIZE = 10000
+STREAMING_MAX_BYTES = 9 * 1024 * 1024
+
+# Linhas serializadas para estimar o tamanho dos lotes de streaming
+SIZE_SAMPLE_ROWS = 100
+
 # Schema base para todas as tabelas
 BASE_SCHEMA = [
     {"name": "date", "type": "DATE", "description": "Data do registro"},
@@ -32,10 +114,105 @@ BASE_SCHEMA = [
 ]
 
 
+# Cache de tabelas existentes (project, dataset, table) -> bigquery.Table
+# Evita uma chamada à API de metadados a cada carga na mesma tabela
+_TABLE_CACHE: TTLCache = TTLCache(maxsize=1024, ttl=300)
+_TABLE_CACHE_LOCK = RLock()
+
+# Tabelas já garantidas neste processo ("project.dataset.table"); não expira,
+# pois uma tabela criada não deixa de existir entre as execuções diárias
+_ENSURED: set = set()
+_ENSURED_LOCK = Lock()
+
+
 # =============================================================================
 # FUNÇÕES DE TABELA
 # =============================================================================
 
+def _table_key(project_id: str, dataset_id: str, table_name: str) -> Tuple[str, str, str]:
+    """Chave do cache de tabelas."""
+    return (project_id, dataset_id, table_name)
+
+
+def _get_table_uncached(bq_client, project_id: str, dataset_id: str, table_name: str):
+    """
+    Busca a tabela na API do BigQuery, sem passar pelo cache.
+    
+    O get_table já aplica o retry padrão da biblioteca (backoff exponencial
+    para erros transitórios).
+    
+    Returns:
+        bigquery.Table ou None se a tabela não existe
+    """
+    table_ref = f"{project_id}.{dataset_id}.{table_name}"
+    
+    try:
+        return bq_client.get_table(table_ref)
+    except Exception:
+        return None
+
+
+def get_table(bq_client, project_id: str, dataset_id: str, table_name: str):
+    """
+    Retorna a tabela do BigQuery, usando o cache quando possível.
+    
+    Apenas tabelas existentes são cacheadas, para que uma tabela criada
+    por outro processo seja vista na próxima chamada.
+    
+    Args:
+        bq_client: Cliente do BigQuery
+        project_id: ID do projeto
+        dataset_id: ID do dataset
+        table_name: Nome da tabela
+        
+    Returns:
+        bigquery.Table ou None se a tabela não existe
+    """
+    key = _table_key(project_id, dataset_id, table_name)
+    
+    with _TABLE_CACHE_LOCK:
+        table = _TABLE_CACHE.get(key)
+    if table is not None:
+        return table
+    
+    table = _get_table_uncached(bq_client, project_id, dataset_id, table_name)
+    if table is not None:
+        with _TABLE_CACHE_LOCK:
+            _TABLE_CACHE[key] = table
+    return table
+
+
+def has_recent_streaming_buffer(bq_client, project_id: str, dataset_id: str, table_name: str) -> bool:
+    """
+    Indica se a tabela recebeu streaming há menos de STREAMING_BUFFER_HORIZON.
+    
+    Consulta os metadados sem cache, pois o buffer muda a cada inserção.
+    
+    Returns:
+        True se há dados recentes no buffer de streaming
+    """
+    table = _get_table_uncached(bq_client, project_id, dataset_id, table_name)
+    buffer = getattr(table, "streaming_buffer", None) if table is not None else None
+    oldest = getattr(buffer, "oldest_entry_time", None) if buffer is not None else None
+    
+    if oldest is None:
+        return False
+    return datetime.now(timezone.utc) - oldest < STREAMING_BUFFER_HORIZON
+
+
+def invalidate_table_cache(project_id: str, dataset_id: str, table_name: str) -> None:
+    """
+    Remove uma tabela do cache de existência e do registro de ensure.
+    
+    Use só quando a tabela for removida ou recriada; deletar partições não
+    altera a existência nem o schema da tabela.
+    """
+    with _TABLE_CACHE_LOCK:
+        _TABLE_CACHE.pop(_table_key(project_id, dataset_id, table_name), None)
+    with _ENSURED_LOCK:
+        _ENSURED.discard(f"{project_id}.{dataset_id}.{table_name}")
+
+
 def table_exists(bq_client, project_id: str, dataset_id: str, table_name: str) -> bool:
     """
     Verifica se uma tabela existe no BigQuery.
@@ -49,13 +226,31 @@ def table_exists(bq_client, project_id: str, dataset_id: str, table_name: str) -
     Returns:
         True se a tabela existe
     """
-    table_ref = f"{project_id}.{dataset_id}.{table_name}"
+    return get_table(bq_client, project_id, dataset_id, table_name) is not None
+
+
+def _to_schema_fields(schema: List[Dict[str, str]]) -> List[Any]:
+    """Converte o schema em dicts para bigquery.SchemaField."""
+    bigquery = _bq()
+    return [
+        bigquery.SchemaField(
+            name=field["name"],
+            field_type=field["type"],
+            description=field.get("description", "")
+        )
+        for field in schema
+    ]
+
+
+def _partition_suffix(partition_date: str) -> str:
+    """
+    Converte a data da partição para o sufixo do decorador (YYYYMMDD).
     
-    try:
-        bq_client.get_table(table_ref)
-        return True
-    except Exception:
-        return False
+    Aceita YYYY-MM-DD ou YYYYMMDD (formato da dimensão date do GA4).
+    """
+    suffix = partition_date.replace("-", "")
+    datetime.strptime(suffix, "%Y%m%d")
+    return suffix
 
 
 def create_table(
@@ -82,22 +277,12 @@ def create_table(
     Returns:
         True se a tabela foi criada com sucesso
     """
-    from google.cloud import bigquery
+    bigquery = _bq()
     
     table_ref = f"{project_id}.{dataset_id}.{table_name}"
     
-    # Converter schema para formato BigQuery
-    bq_schema = []
-    for field in schema:
-        bq_field = bigquery.SchemaField(
-            name=field["name"],
-            field_type=field["type"],
-            description=field.get("description", "")
-        )
-        bq_schema.append(bq_field)
-    
     # Criar tabela
-    table = bigquery.Table(table_ref, schema=bq_schema)
+    table = bigquery.Table(table_ref, schema=_to_schema_fields(schema))
     table.description = description
     
     # Configurar particionamento
@@ -108,11 +293,14 @@ def create_table(
         )
     
     try:
-        bq_client.create_table(table)
-        logger.info(f"✓ Tabela criada: {table_ref}")
+        created = bq_client.create_table(table)
+        # Substitui qualquer entrada antiga para que a tabela fique visível na hora
+        with _TABLE_CACHE_LOCK:
+            _TABLE_CACHE[_table_key(project_id, dataset_id, table_name)] = created
+        logger.info("✓ Tabela criada: %s", table_ref)
         return True
     except Exception as e:
-        logger.error(f"✗ Erro ao criar tabela {table_ref}: {e}")
+        logger.error("✗ Erro ao criar tabela %s: %s", table_ref, e)
         return False
 
 
@@ -138,25 +326,192 @@ def ensure_table_exists(
     Returns:
         True se a tabela existe ou foi criada
     """
+    key = f"{project_id}.{dataset_id}.{table_name}"
+    with _ENSURED_LOCK:
+        if key in _ENSURED:
+            return True
+    
     if table_exists(bq_client, project_id, dataset_id, table_name):
-        logger.info(f"Tabela já existe: {table_name}")
-        return True
+        logger.debug("Tabela já existe: %s", table_name)
+        ok = True
+    else:
+        ok = create_table(
+            bq_client, project_id, dataset_id, table_name, schema, description
+        )
     
-    return create_table(
-        bq_client, project_id, dataset_id, table_name, schema, description
-    )
+    if ok:
+        with _ENSURED_LOCK:
+            _ENSURED.add(key)
+    return ok
 
 
 # =============================================================================
 # FUNÇÕES DE INSERÇÃO
 # =============================================================================
 
+def _dumps_row(row: Dict[str, Any]) -> bytes:
+    """Serializa uma linha em JSON (orjson quando disponível; senão, json da stdlib)."""
+    if orjson is not None:
+        return orjson.dumps(row, default=str, option=_ORJSON_OPTIONS)
+    return json.dumps(row, default=str).encode("utf-8")
+
+
+def _preformat_rows(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Converte a coluna date de YYYYMMDD (formato do GA4) para YYYY-MM-DD, in-place.
+    
+    Deixa as linhas no formato canônico aceito pelo BigQuery em JSON, para que
+    insert_rows_json e o NDJSON apenas repassem os valores, sem conversão por
+    célula. extraction_timestamp já é gerado em ISO 8601 pelo ga4.py.
+    """
+    for row in rows:
+        value = row.get("date")
+        if isinstance(value, str) and len(value) == 8 and value.isdigit():
+            row["date"] = f"{value[:4]}-{value[4:6]}-{value[6:]}"
+    return rows
+
+
+# Colunas fora do hash do insertId: mudam a cada execução para os mesmos dados
+_ROW_ID_EXCLUDED = frozenset({"extraction_timestamp"})
+
+
+def _row_id(row: Dict[str, Any]) -> str:
+    """
+    insertId estável derivado do conteúdo da linha (blake2b de 128 bits).
+    
+    A mesma linha gera o mesmo id em retries e reexecuções, e o BigQuery
+    descarta a duplicata dentro da janela de deduplicação do streaming.
+    """
+    content = {k: v for k, v in row.items() if k not in _ROW_ID_EXCLUDED}
+    if orjson is not None:
+        payload = orjson.dumps(content, default=str, option=_ORJSON_OPTIONS | orjson.OPT_SORT_KEYS)
+    else:
+        payload = json.dumps(content, default=str, sort_keys=True).encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _streaming_retry():
+    """Retry com backoff exponencial (1s a 30s, até 5 min) para erros transitórios."""
+    from google.api_core import retry as api_retry
+    
+    return api_retry.Retry(
+        predicate=api_retry.if_transient_error,
+        initial=1.0,
+        maximum=30.0,
+        multiplier=2.0,
+        timeout=300.0
+    )
+
+
+def _write_ndjson(rows: List[Dict[str, Any]], buffer: BinaryIO) -> None:
+    """
+    Escreve as linhas em NDJSON (uma linha JSON por registro) no buffer.
+    
+    As linhas são gravadas uma a uma, sem montar o payload inteiro em memória.
+    
+    Args:
+        rows: Lista de dicionários com os dados
+        buffer: Arquivo binário de destino
+    """
+    for row in rows:
+        buffer.write(_dumps_row(row))
+        buffer.write(b"\n")
+
+
+def _to_arrow_table(rows: List[Dict[str, Any]], schema: List[Dict[str, str]]):
+    """
+    Converte as linhas em pyarrow.Table com os tipos do schema.
+    
+    Valida os tipos de todas as linhas antes da carga: um valor incompatível
+    levanta pyarrow.ArrowInvalid/ArrowTypeError aqui, e não no meio do load job.
+    DATE aceita YYYY-MM-DD ou YYYYMMDD; TIMESTAMP aceita ISO 8601 (UTC).
+    """
+    pa, _, _ = _arrow()
+    
+    columns = {}
+    for field in schema:
+        name, field_type = field["name"], field["type"]
+        values = [row.get(name) for row in rows]
+        
+        if field_type in ("DATE", "TIMESTAMP"):
+            columns[name] = _cast_arrow_column(pa.array(values), field_type)
+        else:
+            columns[name] = pa.array(values, type=_arrow_type(field_type))
+    
+    return pa.table(columns)
+
+
+def _arrow_type(field_type: str):
+    """Tipo pyarrow das colunas STRING, INTEGER, FLOAT e BOOLEAN (demais: string)."""
+    pa, _, _ = _arrow()
+    return {
+        "INTEGER": pa.int64(),
+        "FLOAT": pa.float64(),
+        "BOOLEAN": pa.bool_(),
+    }.get(field_type, pa.string())
+
+
+def _cast_arrow_column(array, field_type: str):
+    """
+    Converte uma coluna pyarrow (Array ou ChunkedArray) para o tipo do schema.
+    
+    DATE aceita texto YYYY-MM-DD ou YYYYMMDD; TIMESTAMP aceita ISO 8601 (UTC).
+    """
+    pa, pc, _ = _arrow()
+    
+    if field_type == "DATE":
+        if pa.types.is_string(array.type) or pa.types.is_null(array.type):
+            array = pc.strptime(
+                pc.replace_substring(array.cast(pa.string()), "-", ""),
+                format="%Y%m%d", unit="s"
+            )
+        return array.cast(pa.date32())
+    
+    if field_type == "TIMESTAMP":
+        if pa.types.is_string(array.type) or pa.types.is_null(array.type):
+            array = array.cast(pa.timestamp("us"))
+        if array.type.tz is None:
+            array = array.cast(pa.timestamp("us", tz="UTC"))
+        return array
+    
+    return array.cast(_arrow_type(field_type))
+
+
+def _write_parquet(rows: List[Dict[str, Any]], schema: List[Dict[str, str]], buffer: BinaryIO) -> bool:
+    """
+    Escreve as linhas em Parquet no buffer, se possível.
+    
+    Returns:
+        False se o pyarrow não está instalado, se as linhas têm colunas fora
+        do schema ou se algum valor não é compatível com o tipo da coluna
+        (nesses casos o chamador usa NDJSON)
+    """
+    if _arrow() is None:
+        return False
+    
+    pa, _, pq = _arrow()
+    names = {field["name"] for field in schema}
+    if not names.issuperset(rows[0].keys()):
+        return False
+    
+    try:
+        table = _to_arrow_table(rows, schema)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, ValueError, TypeError) as e:
+        logger.warning("Linhas incompatíveis com o schema; usando NDJSON: %s", e)
+        return False
+    
+    pq.write_table(table, buffer)
+    return True
+
+
 def insert_rows(
     bq_client,
     project_id: str,
     dataset_id: str,
     table_name: str,
-    rows: List[Dict[str, Any]]
+    rows: List[Dict[str, Any]],
+    allow_load_job: bool = True,
+    batch_size: int = STREAMING_BATCH_SIZE
 ) -> Dict[str, Any]:
     """
     Insere linhas em uma tabela do BigQuery.
@@ -167,12 +522,15 @@ def insert_rows(
         dataset_id: ID do dataset
         table_name: Nome da tabela
         rows: Lista de dicionários com os dados
+        allow_load_job: Se False, usa streaming mesmo acima de STREAMING_THRESHOLD
+        batch_size: Linhas por requisição de streaming (até MAX_STREAMING_BATCH_SIZE;
+            cada lote também é limitado a STREAMING_MAX_BYTES)
         
     Returns:
         Resultado da inserção
     """
     if not rows:
-        logger.warning(f"Nenhuma linha para inserir em {table_name}")
+        logger.warning("Nenhuma linha para inserir em %s", table_name)
         return {
             "status": "warning",
             "message": "Nenhuma linha para inserir",
@@ -181,259 +539,1325 @@ def insert_rows(
     
     table_ref = f"{project_id}.{dataset_id}.{table_name}"
     
-    try:
-        errors = bq_client.insert_rows_json(table_ref, rows)
-        
-        if errors:
-            logger.error(f"Erros ao inserir dados em {table_name}: {errors}")
-            return {
-                "status": "error",
-                "message": f"Erros na inserção: {errors}",
-                "rows_inserted": 0,
-                "errors": errors
-            }
-        
-        logger.info(f"✓ Inseridas {len(rows)} linhas em {table_name}")
-        return {
-            "status": "success",
-            "message": f"Inseridas {len(rows)} linhas",
-            "rows_inserted": len(rows)
-        }
-    except Exception as e:
-        logger.error(f"✗ Erro ao inserir dados em {table_name}: {e}")
-        return {
-            "status": "error",
-            "message": str(e),
-            "rows_inserted": 0
-        }
+    # Lotes grandes: um único load job em vez de N chamadas de streaming
+    if allow_load_job and len(rows) > STREAMING_THRESHOLD:
+        return load_rows_job(bq_client, table_ref, table_name, rows)
+    
+    # Streaming em lotes limitados por linhas e bytes, enviados em paralelo
+    return insert_rows_batched(
+        bq_client, project_id, dataset_id, table_name, rows,
+        batch_size=min(batch_size, MAX_STREAMING_BATCH_SIZE)
+    )
 
 
-def delete_partition(
-    bq_client,
-    project_id: str,
-    dataset_id: str,
-    table_name: str,
-    partition_date: str
-) -> bool:
-    """
-    Deleta uma partição específica de uma tabela.
-    
-    Args:
-        bq_client: Cliente do BigQuery
-        project_id: ID do projeto
-        dataset_id: ID do dataset
-        table_name: Nome da tabela
-        partition_date: Data da partição (formato YYYY-MM-DD)
-        
-    Returns:
-        True se a partição foi deletada
+def _rows_per_chunk(rows: List[Dict[str, Any]], n: int, max_bytes: int) -> int:
     """
-    table_ref = f"{project_id}.{dataset_id}.{table_name}"
+    Linhas por lote para caber em `max_bytes`, estimado a partir de uma
+    amostra aleatória de até SIZE_SAMPLE_ROWS linhas.
     
-    query = f"""
-    DELETE FROM `{table_ref}`
-    WHERE date = '{partition_date}'
+    Usa a maior linha da amostra (e não a média) como margem para linhas
+    acima da média; a serialização real acontece uma única vez, no envio.
     """
-    
-    try:
-        job = bq_client.query(query)
-        job.result()
-        logger.info(f"✓ Partição {partition_date} deletada de {table_name}")
-        return True
-    except Exception as e:
-        logger.error(f"✗ Erro ao deletar partição: {e}")
-        return False
+    sample = random.sample(rows, min(SIZE_SAMPLE_ROWS, len(rows)))
+    largest = max(len(_dumps_row(row)) for row in sample)
+    return max(1, min(n, max_bytes // largest))
 
 
-# =============================================================================
-# FUNÇÕES DE CARGA DE RELATÓRIOS
-# =============================================================================
-
-def get_schema_for_report(report_data: Dict[str, Any]) -> List[Dict[str, str]]:
+def _chunked(
+    rows: List[Dict[str, Any]],
+    n: int = STREAMING_BATCH_SIZE,
+    max_bytes: int = STREAMING_MAX_BYTES
+) -> Iterator[List[Dict[str, Any]]]:
     """
-    Gera o schema baseado nos dados do relatório.
+    Divide as linhas em lotes de até `n` registros e aproximadamente
+    `max_bytes` de payload (tamanho estimado por amostragem).
     
     Args:
-        report_data: Dados do relatório extraído
+        rows: Lista de dicionários com os dados
+        n: Máximo de linhas por lote
+        max_bytes: Máximo aproximado de bytes por lote
         
-    Returns:
-        Schema para a tabela
+    Yields:
+        Lotes de linhas
     """
-    if not report_data.get("data"):
-        return BASE_SCHEMA.copy()
-    
-    # Usar a primeira linha para inferir o schema
-    sample_row = report_data["data"][0]
-    schema = []
-    
-    for key, value in sample_row.items():
-        field_type = "STRING"
-        
-        if key == "date":
-            field_type = "DATE"
-        elif key == "extraction_timestamp":
-            field_type = "TIMESTAMP"
-        elif isinstance(value, int):
-            field_type = "INTEGER"
-        elif isinstance(value, float):
-            field_type = "FLOAT"
-        elif isinstance(value, bool):
-            field_type = "BOOLEAN"
-        
-        schema.append({
-            "name": key,
-            "type": field_type,
-            "description": ""
-        })
+    if not rows:
+        return
     
-    return schema
+    size = _rows_per_chunk(rows, n, max_bytes)
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
 
 
-def load_report_to_bigquery(
+def insert_rows_batched(
     bq_client,
     project_id: str,
     dataset_id: str,
-    report_data: Dict[str, Any],
-    replace_partition: bool = True
+    table_name: str,
+    rows: List[Dict[str, Any]],
+    batch_size: int = STREAMING_BATCH_SIZE,
+    max_workers: int = 8
 ) -> Dict[str, Any]:
     """
-    Carrega um relatório extraído no BigQuery.
+    Insere linhas via streaming em lotes enviados em paralelo.
+    
+    Cada lote é limitado a `batch_size` linhas e a STREAMING_MAX_BYTES (limite
+    de 10 MB por requisição) e é retentado com backoff exponencial em erros
+    transitórios. Linhas já no formato JSON final; o insertId derivado do
+    conteúdo permite retentar o lote sem duplicar linhas.
     
     Args:
         bq_client: Cliente do BigQuery
         project_id: ID do projeto
         dataset_id: ID do dataset
-        report_data: Dados do relatório (retorno de extract_*_report)
-        replace_partition: Se True, deleta a partição antes de inserir
+        table_name: Nome da tabela
+        rows: Lista de dicionários com os dados
+        batch_size: Linhas por lote
+        max_workers: Número máximo de lotes simultâneos
         
     Returns:
-        Resultado da carga
+        Resultado da inserção (mesmo formato de insert_rows)
     """
-    table_name = report_data.get("table_name")
-    data = report_data.get("data", [])
-    
-    if not table_name:
-        return {"status": "error", "message": "table_name não encontrado no report_data"}
-    
-    if not data:
+    if not rows:
+        logger.warning("Nenhuma linha para inserir em %s", table_name)
         return {
             "status": "warning",
-            "message": "Nenhum dado para carregar",
-            "table": table_name,
+            "message": "Nenhuma linha para inserir",
             "rows_inserted": 0
         }
     
-    logger.info(f"Carregando {len(data)} linhas em {table_name}")
+    table_ref = f"{project_id}.{dataset_id}.{table_name}"
+    retry = _streaming_retry()
     
-    # Gerar schema
-    schema = get_schema_for_report(report_data)
+    def _insert(chunk: List[Dict[str, Any]]) -> Tuple[int, List[Any]]:
+        try:
+            return len(chunk), bq_client.insert_rows_json(
+                table_ref, chunk, row_ids=[_row_id(row) for row in chunk], retry=retry
+            )
+        except Exception as e:
+            logger.error("✗ Erro ao inserir lote em %s: %s", table_name, e)
+            return len(chunk), [str(e)]
     
-    # Garantir que a tabela existe
-    ensure_table_exists(
-        bq_client, project_id, dataset_id, table_name, schema,
-        description=report_data.get("report_name", "")
-    )
+    _preformat_rows(rows)
+    chunks = list(_chunked(rows, batch_size))
     
-    # Deletar partição existente se necessário
-    if replace_partition and data:
-        partition_date = data[0].get("date")
-        if partition_date:
-            delete_partition(bq_client, project_id, dataset_id, table_name, partition_date)
+    # Um único lote dispensa o pool de threads
+    if len(chunks) == 1:
+        outcomes = [_insert(chunks[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+            outcomes = list(executor.map(_insert, chunks))
     
-    # Inserir dados
-    result = insert_rows(bq_client, project_id, dataset_id, table_name, data)
-    result["table"] = table_name
+    rows_inserted = 0
+    errors: List[Any] = []
+    for count, batch_errors in outcomes:
+        if batch_errors:
+            errors.extend(batch_errors)
+        else:
+            rows_inserted += count
     
-    return result
+    if errors:
+        logger.error("Erros ao inserir dados em %s: %s", table_name, errors)
+        return {
+            "status": "error",
+            "message": f"Erros na inserção: {errors}",
+            "rows_inserted": rows_inserted,
+            "errors": errors
+        }
+    
+    logger.debug("✓ Inseridas %d linhas em %s (%d lotes)", rows_inserted, table_name, len(chunks))
+    return {
+        "status": "success",
+        "message": f"Inseridas {rows_inserted} linhas",
+        "rows_inserted": rows_inserted
+    }
 
 
-def load_all_reports_to_bigquery(
+def load_rows_job(
     bq_client,
-    project_id: str,
-    dataset_id: str,
-    extraction_results: Dict[str, Any],
-    replace_partition: bool = True
+    table_ref: str,
+    table_name: str,
+    rows: List[Dict[str, Any]],
+    write_disposition: str = "WRITE_APPEND",
+    schema: Optional[List[Dict[str, str]]] = None
 ) -> Dict[str, Any]:
     """
-    Carrega todos os relatórios extraídos no BigQuery.
+    Carrega linhas via load job.
+    
+    Com schema explícito e pyarrow instalado, as linhas são validadas e
+    enviadas em Parquet (formato colunar, sem serialização JSON); caso
+    contrário, em NEWLINE_DELIMITED_JSON.
     
     Args:
         bq_client: Cliente do BigQuery
+        table_ref: Destino (project.dataset.table ou table$YYYYMMDD)
+        table_name: Nome da tabela (para logs)
+        rows: Lista de dicionários com os dados
+        write_disposition: WRITE_APPEND ou WRITE_TRUNCATE
+        schema: Schema explícito da carga (opcional)
+        
+    Returns:
+        Resultado da inserção
+    """
+    bigquery = _bq()
+    
+    job_config = bigquery.LoadJobConfig(
+        write_disposition=write_disposition,
+        schema_update_options=[bigquery.SchemaUpdateOption.ALLOW_FIELD_ADDITION]
+    )
+    if schema:
+        job_config.schema = _to_schema_fields(schema)
+    
+    try:
+        # Arquivo em memória até SPOOL_MAX_BYTES; acima disso vai para disco
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as buffer:
+            if schema and _write_parquet(rows, schema, buffer):
+                job_config.source_format = bigquery.SourceFormat.PARQUET
+            else:
+                buffer.seek(0)
+                buffer.truncate()
+                job_config.source_format = bigquery.SourceFormat.NEWLINE_DELIMITED_JSON
+                _write_ndjson(_preformat_rows(rows), buffer)
+            job = bq_client.load_table_from_file(
+                buffer, table_ref, job_config=job_config, rewind=True
+            )
+            job.result()
+        
+        logger.debug("✓ Carregadas %d linhas em %s (load job)", len(rows), table_name)
+        return {
+            "status": "success",
+            "message": f"Inseridas {len(rows)} linhas",
+            "rows_inserted": len(rows)
+        }
+    except Exception as e:
+        logger.error("✗ Erro no load job de %s: %s", table_name, e)
+        return {
+            "status": "error",
+            "message": str(e),
+            "rows_inserted": 0
+        }
+
+
+# =============================================================================
+# STORAGE WRITE API
+# =============================================================================
+
+# Tamanho alvo de cada AppendRows (limite da API: 10 MB por requisição)
+STORAGE_APPEND_MAX_BYTES = 5 * 1024 * 1024
+
+# Linhas por AppendRows: com linhas vindas de um iterador (ver
+# stream_report_to_bigquery), cada lote é enviado enquanto o próximo é lido
+STORAGE_APPEND_MAX_ROWS = 2000
+
+_EPOCH_DATE = date(1970, 1, 1)
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Tipos BigQuery -> tipos proto aceitos pela Storage Write API
+_PROTO_TYPES = {
+    "STRING": "TYPE_STRING",
+    "INTEGER": "TYPE_INT64",
+    "FLOAT": "TYPE_DOUBLE",
+    "BOOLEAN": "TYPE_BOOL",
+    "DATE": "TYPE_INT32",       # dias desde 1970-01-01
+    "TIMESTAMP": "TYPE_INT64",  # microssegundos desde a época (UTC)
+}
+
+
+@lru_cache(maxsize=64)
+def _row_message_class(table_name: str, fields: Tuple[Tuple[str, str], ...]):
+    """
+    Gera (e cacheia) a classe protobuf das linhas a partir do schema da tabela.
+    
+    Returns:
+        (classe da mensagem, DescriptorProto usado no writer_schema)
+    """
+    from google.protobuf import descriptor_pb2, descriptor_pool, message_factory
+    
+    message_name = f"Row_{table_name}"
+    descriptor = descriptor_pb2.DescriptorProto(name=message_name)
+    for number, (name, field_type) in enumerate(fields, start=1):
+        descriptor.field.add(
+            name=name,
+            number=number,
+            type=getattr(descriptor_pb2.FieldDescriptorProto, _PROTO_TYPES.get(field_type, "TYPE_STRING")),
+            label=descriptor_pb2.FieldDescriptorProto.LABEL_OPTIONAL
+        )
+    
+    file_proto = descriptor_pb2.FileDescriptorProto(
+        name=f"{message_name}.proto", package="ga4_rows", syntax="proto2"
+    )
+    file_proto.message_type.add().CopyFrom(descriptor)
+    
+    pool = descriptor_pool.DescriptorPool()
+    pool.Add(file_proto)
+    message_descriptor = pool.FindMessageTypeByName(f"ga4_rows.{message_name}")
+    
+    try:
+        message_class = message_factory.GetMessageClass(message_descriptor)
+    except AttributeError:  # protobuf < 4.21
+        message_class = message_factory.MessageFactory(pool).GetPrototype(message_descriptor)
+    
+    return message_class, descriptor
+
+
+def _to_proto_value(value: Any, field_type: str) -> Any:
+    """Converte um valor da linha para o tipo proto correspondente ao campo."""
+    if field_type == "DATE":
+        if isinstance(value, str):
+            value = datetime.strptime(value.replace("-", ""), "%Y%m%d").date()
+        return (value - _EPOCH_DATE).days
+    if field_type == "TIMESTAMP":
+        if isinstance(value, str):
+            value = datetime.fromisoformat(value)
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return (value - _EPOCH) // timedelta(microseconds=1)
+    if field_type == "FLOAT":
+        return float(value)
+    if field_type == "INTEGER":
+        return int(value)
+    if field_type == "STRING":
+        return str(value)
+    return value
+
+
+def write_rows_storage_api(
+    bq_client,
+    project_id: str,
+    dataset_id: str,
+    table_name: str,
+    rows: Iterable[Dict[str, Any]],
+    schema: List[Dict[str, str]],
+    before_commit: Optional[Callable[[], None]] = None
+) -> Dict[str, Any]:
+    """
+    Grava linhas via BigQuery Storage Write API, em stream do tipo PENDING.
+    
+    As linhas são serializadas em protobuf (gerado a partir do schema),
+    enviadas em requisições AppendRows de até STORAGE_APPEND_MAX_ROWS linhas
+    e STORAGE_APPEND_MAX_BYTES, e confirmadas de forma atômica com
+    FinalizeWriteStream + BatchCommitWriteStreams. Não tem custo de
+    streaming por MB nem conta na cota diária de load jobs.
+    
+    rows pode ser um iterador: os envios são assíncronos, então cada lote
+    segue para o BigQuery enquanto as próximas linhas são produzidas.
+    
+    Args:
+        bq_client: Cliente do BigQuery (as credenciais são reaproveitadas)
         project_id: ID do projeto
         dataset_id: ID do dataset
-        extraction_results: Resultado de extract_all_reports
-        replace_partition: Se True, deleta a partição antes de inserir
+        table_name: Nome da tabela
+        rows: Dicionários com os dados (lista ou iterador)
+        schema: Schema da tabela
+        before_commit: Chamado após o envio de todas as linhas, antes do
+            commit (ex.: deletar a partição que será substituída)
         
     Returns:
-        Resultado consolidado da carga
+        Resultado da inserção (mesmo formato de insert_rows)
     """
-    logger.info("=" * 50)
-    logger.info("CARREGANDO RELATÓRIOS NO BIGQUERY")
-    logger.info("=" * 50)
+    try:
+        from google.cloud.bigquery_storage_v1 import types, writer
+    except ImportError:
+        return {
+            "status": "error",
+            "message": "google-cloud-bigquery-storage não instalado (write_mode=storage)",
+            "rows_inserted": 0
+        }
+    
+    fields = tuple((field["name"], field["type"]) for field in schema)
+    types_by_name = dict(fields)
+    message_class, descriptor = _row_message_class(table_name, fields)
+    
+    # Mesmas credenciais do cliente BigQuery; um cliente gRPC por credenciais
+    client = get_bigquery_write_client(getattr(bq_client, "_credentials", None))
+    parent = client.table_path(project_id, dataset_id, table_name)
+    append_stream = None
     
-    results = {
-        "dimension_loads": {},
-        "metric_loads": {},
-        "summary": {
-            "total_tables": 0,
-            "successful": 0,
-            "failed": 0,
-            "total_rows": 0
+    try:
+        write_stream = client.create_write_stream(
+            parent=parent,
+            write_stream=types.WriteStream(type_=types.WriteStream.Type.PENDING)
+        )
+        
+        template = types.AppendRowsRequest(
+            write_stream=write_stream.name,
+            proto_rows=types.AppendRowsRequest.ProtoData(
+                writer_schema=types.ProtoSchema(proto_descriptor=descriptor)
+            )
+        )
+        append_stream = writer.AppendRowsStream(client, template)
+        
+        futures = []
+        serialized: List[bytes] = []
+        batch_bytes = 0
+        offset = 0
+        rows_written = 0
+        
+        def _send() -> None:
+            nonlocal serialized, batch_bytes, offset
+            request = types.AppendRowsRequest(
+                offset=offset,
+                proto_rows=types.AppendRowsRequest.ProtoData(
+                    rows=types.ProtoRows(serialized_rows=serialized)
+                )
+            )
+            futures.append(append_stream.send(request))
+            offset += len(serialized)
+            serialized, batch_bytes = [], 0
+        
+        for row in rows:
+            message = message_class(**{
+                name: _to_proto_value(value, types_by_name[name])
+                for name, value in row.items()
+                if value is not None and name in types_by_name
+            })
+            payload = message.SerializeToString()
+            if serialized and (
+                len(serialized) >= STORAGE_APPEND_MAX_ROWS
+                or batch_bytes + len(payload) > STORAGE_APPEND_MAX_BYTES
+            ):
+                _send()
+            serialized.append(payload)
+            batch_bytes += len(payload)
+            rows_written += 1
+        
+        if serialized:
+            _send()
+        
+        for future in futures:
+            future.result()
+        append_stream.close()
+        append_stream = None
+        
+        client.finalize_write_stream(name=write_stream.name)
+        if before_commit is not None:
+            before_commit()
+        commit = client.batch_commit_write_streams(
+            types.BatchCommitWriteStreamsRequest(parent=parent, write_streams=[write_stream.name])
+        )
+        if commit.stream_errors:
+            raise RuntimeError(f"Erros no commit: {list(commit.stream_errors)}")
+        
+        logger.debug("✓ Gravadas %d linhas em %s (Storage Write API)", rows_written, table_name)
+        return {
+            "status": "success",
+            "message": f"Inseridas {rows_written} linhas",
+            "rows_inserted": rows_written
         }
-    }
+    except Exception as e:
+        logger.error("✗ Erro na Storage Write API em %s: %s", table_name, e)
+        return {
+            "status": "error",
+            "message": str(e),
+            "rows_inserted": 0
+        }
+    finally:
+        if append_stream is not None:
+            append_stream.close()
+
+
+def delete_partition(
+    bq_client,
+    project_id: str,
+    dataset_id: str,
+    table_name: str,
+    partition_date: str
+) -> bool:
+    """
+    Deleta uma partição específica de uma tabela.
     
-    # Carregar relatórios de dimensão
-    for key, report in extraction_results.get("dimensions", {}).items():
-        if "error" in report:
-            results["dimension_loads"][key] = {"status": "skipped", "reason": report["error"]}
-            continue
+    Args:
+        bq_client: Cliente do BigQuery
+        project_id: ID do projeto
+        dataset_id: ID do dataset
+        table_name: Nome da tabela
+        partition_date: Data da partição (formato YYYY-MM-DD)
         
-        try:
-            load_result = load_report_to_bigquery(
-                bq_client, project_id, dataset_id, report, replace_partition
+    Returns:
+        True se a partição foi deletada
+    """
+    table_ref = f"{project_id}.{dataset_id}.{table_name}"
+    
+    # Decorador de partição: operação só de metadados, sem DML
+    partition_ref = f"{table_ref}${_partition_suffix(partition_date)}"
+    
+    try:
+        bq_client.delete_table(partition_ref, not_found_ok=True)
+        logger.info("✓ Partição %s deletada de %s", partition_date, table_name)
+        return True
+    except Exception as e:
+        # Tabelas não particionadas não aceitam o decorador; usa DML
+        logger.warning("Decorador de partição falhou em %s, usando DML: %s", table_name, e)
+        return delete_partition_dml(bq_client, table_ref, table_name, partition_date)
+
+
+def delete_partition_dml(
+    bq_client,
+    table_ref: str,
+    table_name: str,
+    partition_date: str
+) -> bool:
+    """
+    Deleta os registros de uma data via DML parametrizado.
+    
+    Args:
+        bq_client: Cliente do BigQuery
+        table_ref: Referência completa da tabela (project.dataset.table)
+        table_name: Nome da tabela (para logs)
+        partition_date: Data da partição (formato YYYY-MM-DD)
+        
+    Returns:
+        True se os registros foram deletados
+    """
+    bigquery = _bq()
+    
+    query = f"DELETE FROM `{table_ref}` WHERE date = @part"
+    job_config = bigquery.QueryJobConfig(
+        query_parameters=[
+            bigquery.ScalarQueryParameter("part", "DATE", partition_date)
+        ]
+    )
+    
+    try:
+        bq_client.query(query, job_config=job_config).result()
+        logger.info("✓ Partição %s deletada de %s (DML)", partition_date, table_name)
+        return True
+    except Exception as e:
+        logger.error("✗ Erro ao deletar partição: %s", e)
+        return False
+
+
+# =============================================================================
+# MANIFESTO DE CARGAS (IDEMPOTÊNCIA)
+# =============================================================================
+
+MANIFEST_TABLE = "GA4_LOAD_MANIFEST"
+
+MANIFEST_SCHEMA = [
+    {"name": "table_name", "type": "STRING", "description": "Tabela carregada"},
+    {"name": "partition_date", "type": "DATE", "description": "Partição carregada"},
+    {"name": "row_count", "type": "INTEGER", "description": "Linhas carregadas"},
+    {"name": "loaded_at", "type": "TIMESTAMP", "description": "Timestamp da carga"},
+]
+
+
+class ManifestCache:
+    """
+    Registro de partições já carregadas, persistido em RAW.GA4_LOAD_MANIFEST.
+    
+    Uma partição é considerada carregada se houve carga há menos de
+    `ttl_seconds`; após esse prazo ela pode ser recarregada (dados do GA4
+    que chegam com atraso).
+    """
+    
+    def __init__(self, bq_client, project_id: str, dataset_id: str, ttl_seconds: int = 6 * 3600):
+        self.client = bq_client
+        self.project_id = project_id
+        self.dataset_id = dataset_id
+        self.ttl_seconds = ttl_seconds
+        self.table_ref = f"{project_id}.{dataset_id}.{MANIFEST_TABLE}"
+        self._loaded: TTLCache = TTLCache(maxsize=4096, ttl=ttl_seconds)
+        self._lock = RLock()
+        self._table_ready = False
+    
+    def _ensure_table(self) -> None:
+        """Cria a tabela de manifesto na primeira utilização."""
+        if self._table_ready:
+            return
+        if not table_exists(self.client, self.project_id, self.dataset_id, MANIFEST_TABLE):
+            create_table(
+                self.client, self.project_id, self.dataset_id, MANIFEST_TABLE,
+                MANIFEST_SCHEMA, description="Manifesto de cargas GA4",
+                partition_field=None
             )
-            results["dimension_loads"][key] = load_result
+        self._table_ready = True
+    
+    def is_loaded(self, table_name: str, partition_date: str) -> bool:
+        """
+        Verifica se a partição foi carregada dentro do TTL.
+        
+        Args:
+            table_name: Nome da tabela
+            partition_date: Data da partição (YYYY-MM-DD)
             
-            if load_result.get("status") == "success":
-                results["summary"]["successful"] += 1
-                results["summary"]["total_rows"] += load_result.get("rows_inserted", 0)
-            else:
-                results["summary"]["failed"] += 1
+        Returns:
+            True se a partição já foi carregada
+        """
+        key = (table_name, partition_date)
+        with self._lock:
+            if key in self._loaded:
+                return True
+        
+        bigquery = _bq()
+        self._ensure_table()
+        
+        query = f"""
+        SELECT 1
+        FROM `{self.table_ref}`
+        WHERE table_name = @table_name
+          AND partition_date = @partition_date
+          AND loaded_at >= TIMESTAMP_SUB(CURRENT_TIMESTAMP(), INTERVAL @ttl SECOND)
+        LIMIT 1
+        """
+        job_config = bigquery.QueryJobConfig(
+            query_parameters=[
+                bigquery.ScalarQueryParameter("table_name", "STRING", table_name),
+                bigquery.ScalarQueryParameter("partition_date", "DATE", partition_date),
+                bigquery.ScalarQueryParameter("ttl", "INT64", self.ttl_seconds),
+            ]
+        )
+        
+        try:
+            loaded = any(True for _ in self.client.query(query, job_config=job_config).result())
         except Exception as e:
-            logger.error(f"Erro ao carregar {key}: {e}")
-            results["dimension_loads"][key] = {"status": "error", "message": str(e)}
-            results["summary"]["failed"] += 1
+            logger.warning("Erro ao consultar manifesto, seguindo com a carga: %s", e)
+            return False
         
-        results["summary"]["total_tables"] += 1
+        if loaded:
+            with self._lock:
+                self._loaded[key] = True
+        return loaded
     
-    # Carregar relatórios de métrica
-    for key, report in extraction_results.get("metrics", {}).items():
-        if "error" in report:
-            results["metric_loads"][key] = {"status": "skipped", "reason": report["error"]}
-            continue
+    def mark_loaded(self, table_name: str, partition_date: str, row_count: int) -> None:
+        """
+        Registra a carga de uma partição.
+        
+        Args:
+            table_name: Nome da tabela
+            partition_date: Data da partição (YYYY-MM-DD)
+            row_count: Número de linhas carregadas
+        """
+        self._ensure_table()
+        
+        row = {
+            "table_name": table_name,
+            "partition_date": partition_date,
+            "row_count": row_count,
+            "loaded_at": datetime.now(timezone.utc).isoformat(),
+        }
         
         try:
-            load_result = load_report_to_bigquery(
-                bq_client, project_id, dataset_id, report, replace_partition
+            errors = self.client.insert_rows_json(self.table_ref, [row])
+            if errors:
+                logger.warning("Erro ao registrar carga no manifesto: %s", errors)
+                return
+        except Exception as e:
+            logger.warning("Erro ao registrar carga no manifesto: %s", e)
+            return
+        
+        with self._lock:
+            self._loaded[(table_name, partition_date)] = True
+
+
+# Manifestos por (projeto, dataset)
+_MANIFESTS: Dict[Tuple[str, str], ManifestCache] = {}
+_MANIFESTS_LOCK = RLock()
+
+
+def get_manifest(bq_client, project_id: str, dataset_id: str) -> ManifestCache:
+    """Retorna o manifesto de cargas do dataset (um por processo)."""
+    with _MANIFESTS_LOCK:
+        manifest = _MANIFESTS.get((project_id, dataset_id))
+        if manifest is None:
+            manifest = ManifestCache(bq_client, project_id, dataset_id)
+            _MANIFESTS[(project_id, dataset_id)] = manifest
+        return manifest
+
+
+# =============================================================================
+# FUNÇÕES DE CARGA DE RELATÓRIOS
+# =============================================================================
+
+# Tipos BigQuery por nome de coluna (têm precedência) e por tipo Python.
+# Lookup por type() exato: bool não cai em INTEGER (bool é subclasse de int).
+_NAME_TYPES = {"date": "DATE", "extraction_timestamp": "TIMESTAMP"}
+_PY_TYPES = {bool: "BOOLEAN", int: "INTEGER", float: "FLOAT"}
+
+
+@lru_cache(maxsize=64)
+def _infer_schema(
+    table_name: str,
+    keys: Tuple[str, ...],
+    types: Tuple[type, ...]
+) -> Tuple[Tuple[str, str], ...]:
+    """
+    Infere o schema (nome, tipo) a partir das colunas e tipos da amostra.
+    
+    Função pura e hashable: o resultado fica em cache por tabela/colunas.
+    """
+    return tuple(
+        (key, _NAME_TYPES.get(key) or _PY_TYPES.get(value_type, "STRING"))
+        for key, value_type in zip(keys, types)
+    )
+
+
+# Métricas GA4 de contagem (inteiras); as demais são razões, médias ou valores
+_INTEGER_METRICS = frozenset({
+    "activeUsers", "newUsers", "totalUsers", "sessions", "engagedSessions",
+    "screenPageViews", "eventCount", "conversions", "transactions", "ecommercePurchases",
+})
+
+
+def _build_table_schema(dimensions: List[str], metrics: List[str]) -> Tuple[Dict[str, str], ...]:
+    """
+    Monta o schema de uma tabela a partir das dimensões e métricas configuradas.
+    
+    Segue a ordem das colunas geradas por ga4.run_ga4_report: dimensões,
+    métricas, property_id e extraction_timestamp.
+    """
+    base = {field["name"]: field for field in BASE_SCHEMA}
+    fields = [
+        base.get(name) or {"name": name, "type": "STRING", "description": ""}
+        for name in dimensions
+    ]
+    fields += [
+        {"name": name, "type": "INTEGER" if name in _INTEGER_METRICS else "FLOAT", "description": ""}
+        for name in metrics
+    ]
+    fields += [base["property_id"], base["extraction_timestamp"]]
+    return tuple(MappingProxyType(field) for field in fields)
+
+
+def _build_table_schemas() -> Mapping[str, Tuple[Dict[str, str], ...]]:
+    """Pré-monta o schema de cada tabela configurada em ga4 (na importação)."""
+    from ga4 import DIMENSION_REPORTS, METRIC_REPORTS
+    
+    return MappingProxyType({
+        config.table_name: _build_table_schema(config.dimensions, config.metrics)
+        for config in chain(DIMENSION_REPORTS.values(), METRIC_REPORTS.values())
+    })
+
+
+# Schemas fixos por tabela: evitam inferência a cada carga e variação de
+# tipo entre execuções (ex.: métrica "0" inferida como INTEGER)
+TABLE_SCHEMAS = _build_table_schemas()
+
+
+def get_schema_for_report(
+    report_data: Dict[str, Any],
+    sample_row: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, str]]:
+    """
+    Retorna o schema do relatório.
+    
+    Tabelas configuradas em ga4 usam o schema pré-montado em TABLE_SCHEMAS;
+    as demais têm o schema inferido a partir de uma linha de amostra.
+    
+    Args:
+        report_data: Dados do relatório extraído
+        sample_row: Linha usada na inferência (padrão: a primeira de data)
+        
+    Returns:
+        Schema para a tabela
+    """
+    static = TABLE_SCHEMAS.get(report_data.get("table_name"))
+    if static is not None:
+        return list(static)
+    
+    if sample_row is None:
+        data = report_data.get("data")
+        if not data:
+            return BASE_SCHEMA.copy()
+        # Usar a primeira linha para inferir o schema
+        sample_row = data[0]
+    
+    inferred = _infer_schema(
+        report_data.get("table_name", ""),
+        tuple(sample_row.keys()),
+        tuple(type(value) for value in sample_row.values())
+    )
+    
+    return [
+        {"name": name, "type": field_type, "description": ""}
+        for name, field_type in inferred
+    ]
+
+
+# Nomes GoogleSQL -> nomes legados usados nos schemas deste módulo
+_LEGACY_TYPES = {"INT64": "INTEGER", "FLOAT64": "FLOAT", "BOOL": "BOOLEAN"}
+
+
+def get_load_schema(
+    bq_client,
+    project_id: str,
+    dataset_id: str,
+    table_name: str,
+    schema: List[Dict[str, str]]
+) -> List[Dict[str, str]]:
+    """
+    Schema usado nas cargas: o da tabela existente mais as colunas novas de `schema`.
+    
+    Load jobs com schema explícito falham se um tipo divergir do da tabela
+    (ex.: tabelas criadas com tipos inferidos antes de TABLE_SCHEMAS). O schema
+    fixo vale apenas na criação da tabela e para colunas ainda inexistentes
+    (adicionadas via ALLOW_FIELD_ADDITION).
+    
+    Args:
+        bq_client: Cliente do BigQuery
+        project_id: ID do projeto
+        dataset_id: ID do dataset
+        table_name: Nome da tabela
+        schema: Schema fixo ou inferido do relatório
+        
+    Returns:
+        Schema para a carga
+    """
+    table = get_table(bq_client, project_id, dataset_id, table_name)
+    if table is None or not table.schema:
+        return schema
+    
+    existing = [
+        {
+            "name": field.name,
+            "type": _LEGACY_TYPES.get(field.field_type, field.field_type),
+            "description": field.description or ""
+        }
+        for field in table.schema
+    ]
+    names = {field["name"] for field in existing}
+    return existing + [field for field in schema if field["name"] not in names]
+
+
+def load_report_to_bigquery(
+    bq_client,
+    project_id: str,
+    dataset_id: str,
+    report_data: Dict[str, Any],
+    replace_partition: bool = True,
+    skip_loaded: bool = False,
+    write_mode: str = "auto",
+    streaming_batch_size: int = STREAMING_BATCH_SIZE
+) -> Dict[str, Any]:
+    """
+    Carrega um relatório extraído no BigQuery.
+    
+    Args:
+        bq_client: Cliente do BigQuery
+        project_id: ID do projeto
+        dataset_id: ID do dataset
+        report_data: Dados do relatório (retorno de extract_*_report)
+        replace_partition: Se True, deleta a partição antes de inserir
+        skip_loaded: Se True, pula partições já registradas no manifesto
+        write_mode: "auto", "load", "streaming" ou "storage" (ver WRITE_MODES)
+        streaming_batch_size: Linhas por requisição de streaming
+        
+    Returns:
+        Resultado da carga
+    """
+    if write_mode not in WRITE_MODES:
+        raise ValueError(f"write_mode inválido: {write_mode} (use {', '.join(WRITE_MODES)})")
+    
+    table_name, data, report_name = (
+        report_data.get(key) for key in ("table_name", "data", "report_name")
+    )
+    
+    if not table_name:
+        return {"status": "error", "message": "table_name não encontrado no report_data"}
+    
+    if not data:
+        return {
+            "status": "warning",
+            "message": "Nenhum dado para carregar",
+            "table": table_name,
+            "rows_inserted": 0
+        }
+    
+    logger.info("Carregando %s linhas em %s", len(data), table_name)
+    
+    # Datas no formato do BigQuery (YYYY-MM-DD) antes de derivar as partições
+    _preformat_rows(data)
+    
+    # Linha de amostra e datas das partições extraídas uma única vez
+    sample = data[0]
+    dates = {row.get("date") for row in data}
+    partition_dates = sorted(d for d in dates if d)
+    
+    # Gerar schema
+    schema = get_schema_for_report(report_data, sample)
+    
+    # Garantir que a tabela existe
+    ensure_table_exists(
+        bq_client, project_id, dataset_id, table_name, schema,
+        description=report_name or ""
+    )
+    schema = get_load_schema(bq_client, project_id, dataset_id, table_name, schema)
+    
+    # Carga idempotente: partições já registradas no manifesto ficam de fora
+    manifest = None
+    if skip_loaded and partition_dates:
+        manifest = get_manifest(bq_client, project_id, dataset_id)
+        loaded = {d for d in partition_dates if manifest.is_loaded(table_name, d)}
+        if loaded:
+            logger.info("Partições %s de %s já carregadas, pulando", sorted(loaded), table_name)
+            data = [row for row in data if row.get("date") not in loaded]
+            partition_dates = [d for d in partition_dates if d not in loaded]
+            dates -= loaded
+        if not data:
+            return {
+                "status": "skipped",
+                "message": "Partições já carregadas",
+                "table": table_name,
+                "rows_inserted": 0
+            }
+    
+    single_partition = len(dates) == 1 and bool(partition_dates)
+    
+    result = _write_report_rows(
+        bq_client, project_id, dataset_id, table_name, data, schema,
+        partition_dates, single_partition, replace_partition, write_mode,
+        streaming_batch_size
+    )
+    result["table"] = table_name
+    
+    if manifest is not None and result.get("status") == "success":
+        counts = Counter(row.get("date") for row in data)
+        for partition_date in partition_dates:
+            manifest.mark_loaded(table_name, partition_date, counts[partition_date])
+    
+    return result
+
+
+def _write_report_rows(
+    bq_client,
+    project_id: str,
+    dataset_id: str,
+    table_name: str,
+    data: List[Dict[str, Any]],
+    schema: List[Dict[str, str]],
+    partition_dates: List[str],
+    single_partition: bool,
+    replace_partition: bool,
+    write_mode: str,
+    streaming_batch_size: int
+) -> Dict[str, Any]:
+    """Grava as linhas de um relatório conforme write_mode (ver load_report_to_bigquery)."""
+    # Lotes grandes de uma única data: load job com WRITE_TRUNCATE no decorador
+    # da partição, que substitui a partição sem DELETE separado
+    large_batch = write_mode == "load" or (
+        write_mode == "auto" and len(data) >= STREAMING_THRESHOLD
+    )
+    
+    # Partição com streaming recente não aceita DELETE; nesse caso também usa load job
+    buffer_active = (
+        replace_partition
+        and bool(partition_dates)
+        and not (large_batch and single_partition)
+        and has_recent_streaming_buffer(bq_client, project_id, dataset_id, table_name)
+    )
+    
+    if replace_partition and single_partition and (large_batch or buffer_active):
+        destination = f"{project_id}.{dataset_id}.{table_name}${_partition_suffix(partition_dates[0])}"
+        return load_rows_job(
+            bq_client, destination, table_name, data,
+            write_disposition="WRITE_TRUNCATE", schema=schema
+        )
+    
+    # Fallback (lotes pequenos ou várias datas): delete de cada partição + inserção
+    if replace_partition and partition_dates:
+        if buffer_active:
+            logger.warning(
+                "Buffer de streaming ativo em %s; DELETE das partições %s não executado",
+                table_name, partition_dates
             )
-            results["metric_loads"][key] = load_result
-            
-            if load_result.get("status") == "success":
-                results["summary"]["successful"] += 1
-                results["summary"]["total_rows"] += load_result.get("rows_inserted", 0)
+        else:
+            for partition_date in partition_dates:
+                delete_partition(bq_client, project_id, dataset_id, table_name, partition_date)
+    
+    # Inserir dados
+    if write_mode == "storage":
+        return write_rows_storage_api(
+            bq_client, project_id, dataset_id, table_name, data, schema
+        )
+    if write_mode == "load":
+        return load_rows_job(
+            bq_client, f"{project_id}.{dataset_id}.{table_name}", table_name, data,
+            schema=schema
+        )
+    return insert_rows(
+        bq_client, project_id, dataset_id, table_name, data,
+        allow_load_job=write_mode == "auto",
+        batch_size=streaming_batch_size
+    )
+
+
+def _arrow_schema(table_name: str, table) -> List[Dict[str, str]]:
+    """Schema de uma pyarrow.Table: o de TABLE_SCHEMAS ou inferido dos tipos das colunas."""
+    static = TABLE_SCHEMAS.get(table_name)
+    if static is not None:
+        return list(static)
+    
+    pa, _, _ = _arrow()
+    schema = []
+    for field in table.schema:
+        if pa.types.is_boolean(field.type):
+            field_type = "BOOLEAN"
+        elif pa.types.is_integer(field.type):
+            field_type = "INTEGER"
+        elif pa.types.is_floating(field.type):
+            field_type = "FLOAT"
+        else:
+            field_type = "STRING"
+        schema.append({
+            "name": field.name,
+            "type": _NAME_TYPES.get(field.name, field_type),
+            "description": ""
+        })
+    return schema
+
+
+def load_arrow_report_to_bigquery(
+    bq_client,
+    project_id: str,
+    dataset_id: str,
+    report_data: Dict[str, Any],
+    replace_partition: bool = True,
+    skip_loaded: bool = False
+) -> Dict[str, Any]:
+    """
+    Carrega no BigQuery um relatório em formato colunar (ga4.extract_all_reports
+    com columnar=True).
+    
+    A tabela é convertida para os tipos do schema coluna a coluna e enviada em
+    Parquet num load job, sem passar por dicionários por linha. Com uma única
+    data e replace_partition, a partição é substituída (WRITE_TRUNCATE no
+    decorador); com várias datas, as partições são deletadas e a carga é
+    feita com WRITE_APPEND.
+    
+    Args:
+        bq_client: Cliente do BigQuery
+        project_id: ID do projeto
+        dataset_id: ID do dataset
+        report_data: Relatório com "table_name" e "table" (pyarrow.Table)
+        replace_partition: Se True, substitui as partições das datas carregadas
+        skip_loaded: Se True, pula partições já registradas no manifesto
+        
+    Returns:
+        Resultado da carga
+    """
+    table_name, table = report_data.get("table_name"), report_data.get("table")
+    
+    if not table_name:
+        return {"status": "error", "message": "table_name não encontrado no report_data"}
+    
+    if table is None or table.num_rows == 0:
+        return {
+            "status": "warning",
+            "message": "Nenhum dado para carregar",
+            "table": table_name,
+            "rows_inserted": 0
+        }
+    
+    bigquery = _bq()
+    pa, pc, pq = _arrow()
+    
+    logger.info("Carregando %s linhas em %s (colunar)", table.num_rows, table_name)
+    
+    schema = _arrow_schema(table_name, table)
+    ensure_table_exists(
+        bq_client, project_id, dataset_id, table_name, schema,
+        description=report_data.get("report_name") or ""
+    )
+    schema = get_load_schema(bq_client, project_id, dataset_id, table_name, schema)
+    
+    # Colunas da tabela do BigQuery ausentes no relatório vão nulas, como em load_rows_job
+    try:
+        table = pa.table({
+            field["name"]: _cast_arrow_column(
+                table.column(field["name"]) if field["name"] in table.column_names
+                else pa.nulls(table.num_rows),
+                field["type"]
+            )
+            for field in schema
+        })
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as e:
+        logger.error("✗ Tabela incompatível com o schema de %s: %s", table_name, e)
+        return {"status": "error", "message": str(e), "table": table_name, "rows_inserted": 0}
+    
+    partition_dates: List[str] = []
+    if "date" in table.column_names:
+        partition_dates = sorted(
+            d.isoformat() for d in pc.unique(table.column("date")).to_pylist() if d is not None
+        )
+    
+    # Carga idempotente: partições já registradas no manifesto ficam de fora
+    manifest = None
+    if skip_loaded and partition_dates:
+        manifest = get_manifest(bq_client, project_id, dataset_id)
+        loaded = [d for d in partition_dates if manifest.is_loaded(table_name, d)]
+        if loaded:
+            logger.info("Partições %s de %s já carregadas, pulando", loaded, table_name)
+            loaded_dates = pa.array([date.fromisoformat(d) for d in loaded], type=pa.date32())
+            table = table.filter(pc.invert(pc.is_in(table.column("date"), value_set=loaded_dates)))
+            partition_dates = [d for d in partition_dates if d not in loaded]
+        if table.num_rows == 0:
+            return {
+                "status": "skipped",
+                "message": "Partições já carregadas",
+                "table": table_name,
+                "rows_inserted": 0
+            }
+    
+    destination = f"{project_id}.{dataset_id}.{table_name}"
+    write_disposition = "WRITE_APPEND"
+    
+    if replace_partition and len(partition_dates) == 1:
+        destination += f"${_partition_suffix(partition_dates[0])}"
+        write_disposition = "WRITE_TRUNCATE"
+    elif replace_partition and partition_dates:
+        if has_recent_streaming_buffer(bq_client, project_id, dataset_id, table_name):
+            logger.warning(
+                "Buffer de streaming ativo em %s; DELETE das partições %s não executado",
+                table_name, partition_dates
+            )
+        else:
+            for partition_date in partition_dates:
+                delete_partition(bq_client, project_id, dataset_id, table_name, partition_date)
+    
+    job_config = bigquery.LoadJobConfig(
+        source_format=bigquery.SourceFormat.PARQUET,
+        write_disposition=write_disposition,
+        schema=_to_schema_fields(schema),
+        schema_update_options=[bigquery.SchemaUpdateOption.ALLOW_FIELD_ADDITION]
+    )
+    
+    try:
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as buffer:
+            pq.write_table(table, buffer)
+            job = bq_client.load_table_from_file(
+                buffer, destination, job_config=job_config, rewind=True
+            )
+            job.result()
+    except Exception as e:
+        logger.error("✗ Erro no load job de %s: %s", table_name, e)
+        return {"status": "error", "message": str(e), "table": table_name, "rows_inserted": 0}
+    
+    if manifest is not None:
+        counts = {
+            item["values"].isoformat(): item["counts"]
+            for item in pc.value_counts(table.column("date")).to_pylist()
+            if item["values"] is not None
+        }
+        for partition_date in partition_dates:
+            manifest.mark_loaded(table_name, partition_date, counts.get(partition_date, 0))
+    
+    logger.debug("✓ Carregadas %d linhas em %s (load job, colunar)", table.num_rows, table_name)
+    return {
+        "status": "success",
+        "message": f"Inseridas {table.num_rows} linhas",
+        "rows_inserted": table.num_rows,
+        "table": table_name
+    }
+
+
+def stream_report_to_bigquery(
+    bq_client,
+    ga4_client,
+    project_id: str,
+    dataset_id: str,
+    property_id: str,
+    report_key: str,
+    start_date: str,
+    end_date: str,
+    replace_partition: bool = True
+) -> Dict[str, Any]:
+    """
+    Extrai um relatório do GA4 e grava no BigQuery em streaming, sem
+    materializar as linhas: cada página lida do GA4 (ga4.iter_*_report)
+    segue direto para a Storage Write API (write_rows_storage_api), e a
+    gravação de um lote se sobrepõe à leitura da próxima página.
+    
+    A gravação só é confirmada (commit do stream PENDING) se a extração
+    terminar sem erros. Com replace_partition, as partições do período
+    (datas YYYY-MM-DD) são deletadas logo antes do commit, de modo que uma
+    falha na extração não apaga os dados anteriores.
+    
+    Usado por /extract/dimension/<key> e /extract/metric/<key> com
+    write_mode="storage".
+    
+    Args:
+        bq_client: Cliente do BigQuery
+        ga4_client: Cliente do GA4
+        project_id: ID do projeto
+        dataset_id: ID do dataset
+        property_id: ID da propriedade GA4
+        report_key: Chave do relatório (ex: "USUARIO", "SESSAO")
+        start_date: Data de início (YYYY-MM-DD)
+        end_date: Data de fim (YYYY-MM-DD)
+        replace_partition: Se True, substitui as partições do período
+        
+    Returns:
+        Resultado da carga
+    """
+    from ga4 import DIMENSION_REPORTS, METRIC_REPORTS, iter_dimension_report, iter_metric_report
+    
+    if report_key in DIMENSION_REPORTS:
+        config, iter_report = DIMENSION_REPORTS[report_key], iter_dimension_report
+    elif report_key in METRIC_REPORTS:
+        config, iter_report = METRIC_REPORTS[report_key], iter_metric_report
+    else:
+        raise ValueError(f"Relatório não encontrado: {report_key}")
+    
+    schema = list(TABLE_SCHEMAS[config.table_name])
+    ensure_table_exists(
+        bq_client, project_id, dataset_id, config.table_name, schema,
+        description=config.name
+    )
+    schema = get_load_schema(bq_client, project_id, dataset_id, config.table_name, schema)
+    
+    partition_dates: List[str] = []
+    if replace_partition:
+        try:
+            first = date.fromisoformat(start_date)
+            days = (date.fromisoformat(end_date) - first).days + 1
+            partition_dates = [(first + timedelta(days=n)).isoformat() for n in range(days)]
+        except ValueError:
+            # Datas relativas do GA4 ("yesterday", "7daysAgo"): partições desconhecidas
+            logger.warning(
+                "Período %s a %s sem datas absolutas; partições de %s não substituídas",
+                start_date, end_date, config.table_name
+            )
+    
+    def before_commit() -> None:
+        # Sem replace_partition (ou sem datas absolutas), nada a deletar
+        for partition_date in partition_dates:
+            delete_partition(bq_client, project_id, dataset_id, config.table_name, partition_date)
+    
+    result = write_rows_storage_api(
+        bq_client, project_id, dataset_id, config.table_name,
+        iter_report(ga4_client, property_id, report_key, start_date, end_date),
+        schema, before_commit=before_commit
+    )
+    result["table"] = config.table_name
+    return result
+
+
+def _iter_reports(extraction_results: Dict[str, Any]) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """Percorre dimensões e métricas numa única iteração: (destino, chave, relatório)."""
+    return chain(
+        (("dimension_loads", key, report)
+         for key, report in extraction_results.get("dimensions", {}).items()),
+        (("metric_loads", key, report)
+         for key, report in extraction_results.get("metrics", {}).items()),
+    )
+
+
+@dataclass(slots=True)
+class LoadSummary:
+    """Contadores da carga; alterados apenas sob o lock de load_all_reports_to_bigquery."""
+    total_tables: int = 0
+    successful: int = 0
+    skipped: int = 0
+    failed: int = 0
+    total_rows: int = 0
+
+
+def _record_load(
+    results: Dict[str, Any],
+    summary: LoadSummary,
+    loads_key: str,
+    key: str,
+    load_result: Dict[str, Any]
+) -> None:
+    """Registra o resultado de uma carga e atualiza o resumo."""
+    results[loads_key][key] = load_result
+    
+    if load_result.get("status") == "success":
+        summary.successful += 1
+        summary.total_rows += load_result.get("rows_inserted", 0)
+    elif load_result.get("status") == "skipped":
+        # Partições já registradas no manifesto (skip_loaded)
+        summary.skipped += 1
+    else:
+        summary.failed += 1
+
+
+def load_all_reports_to_bigquery(
+    bq_client,
+    project_id: str,
+    dataset_id: str,
+    extraction_results: Dict[str, Any],
+    replace_partition: bool = True,
+    max_workers: int = 8,
+    write_mode: str = "auto",
+    streaming_batch_size: int = STREAMING_BATCH_SIZE,
+    skip_loaded: bool = False
+) -> Dict[str, Any]:
+    """
+    Carrega todos os relatórios extraídos no BigQuery, em paralelo.
+    
+    Args:
+        bq_client: Cliente do BigQuery
+        project_id: ID do projeto
+        dataset_id: ID do dataset
+        extraction_results: Resultado de extract_all_reports (relatórios
+            colunares, com "table", vão por load_arrow_report_to_bigquery)
+        replace_partition: Se True, deleta a partição antes de inserir
+        max_workers: Número máximo de tabelas carregadas simultaneamente
+        write_mode: "auto", "load", "streaming" ou "storage" (ver WRITE_MODES)
+        streaming_batch_size: Linhas por requisição de streaming
+        skip_loaded: Se True, pula partições já registradas no manifesto
+        
+    Returns:
+        Resultado consolidado da carga
+    """
+    logger.info("=" * 50)
+    logger.info("CARREGANDO RELATÓRIOS NO BIGQUERY")
+    logger.info("=" * 50)
+    
+    # Dimensões e métricas numa única lista, montada uma vez
+    reports = list(_iter_reports(extraction_results))
+    tasks = [
+        (key, report, loads_key)
+        for loads_key, key, report in reports
+        if "error" not in report
+    ]
+    
+    results = {"dimension_loads": {}, "metric_loads": {}}
+    summary = LoadSummary(total_tables=len(tasks))
+    results_lock = Lock()
+    
+    for loads_key, key, report in reports:
+        if "error" in report:
+            results[loads_key][key] = {"status": "skipped", "reason": report["error"]}
+    
+    # Cada carga fica bloqueada em I/O do BigQuery; executa em paralelo
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for key, report, loads_key in tasks:
+            if "table" in report:
+                # Relatório colunar (extract_all_reports com columnar=True): Parquet direto
+                future = executor.submit(
+                    load_arrow_report_to_bigquery,
+                    bq_client, project_id, dataset_id, report, replace_partition,
+                    skip_loaded=skip_loaded
+                )
             else:
-                results["summary"]["failed"] += 1
-        except Exception as e:
-            logger.error(f"Erro ao carregar {key}: {e}")
-            results["metric_loads"][key] = {"status": "error", "message": str(e)}
-            results["summary"]["failed"] += 1
+                future = executor.submit(
+                    load_report_to_bigquery,
+                    bq_client, project_id, dataset_id, report, replace_partition,
+                    skip_loaded=skip_loaded, write_mode=write_mode,
+                    streaming_batch_size=streaming_batch_size
+                )
+            futures[future] = (key, loads_key)
         
-        results["summary"]["total_tables"] += 1
+        for future in as_completed(futures):
+            key, loads_key = futures[future]
+            
+            try:
+                load_result = future.result()
+            except Exception as e:
+                logger.error("Erro ao carregar %s: %s", key, e)
+                load_result = {"status": "error", "message": str(e)}
+            
+            with results_lock:
+                _record_load(results, summary, loads_key, key, load_result)
+    
+    # Mantém o formato de retorno (dict) esperado pelos chamadores
+    results["summary"] = asdict(summary)
     
     logger.info("=" * 50)
     logger.info("CARGA CONCLUÍDA")
-    logger.info(f"Tabelas: {results['summary']['successful']}/{results['summary']['total_tables']}")
-    logger.info(f"Total de linhas: {results['summary']['total_rows']}")
+    logger.info("Tabelas: %s/%s", summary.successful, summary.total_tables)
+    logger.info("Total de linhas: %s", summary.total_rows)
     logger.info("=" * 50)
     
     return results
@@ -19,23 +19,52 @@ Variáveis Airflow necessárias:
     - ga4_property_ids: Lista de IDs das propriedades GA4 (JSON)
     - gcp_project_id: ID do projeto GCP (opcional, usa default)
     - ga4_secret_id: ID do secret no Secret Manager (opcional, usa default)
+    - ga4_api_last_health_check: mantida pela própria DAG (último health check por URL)
+    - ga4_fail_fast_threshold: lotes seguidos com falha de conexão/5xx que
+      interrompem a carga diária (opcional, default 2; 0 desativa)
 
 Connections Airflow necessárias:
     - google_cloud_default: Conexão com o GCP
+
+Pools Airflow necessários:
+    - ga4_api (3 slots): limita as chamadas simultâneas à API em todas as DAGs
+      deste arquivo (ex.: airflow pools set ga4_api 3 "Chamadas à API GA4")
+
+XCom:
+    As tasks retornam apenas resumos (status e linhas por propriedade).
+    Recomenda-se ainda um backend de XCom em Object Storage, para que
+    valores grandes não sejam gravados no banco de metadados (airflow.cfg):
+
+        [core]
+        xcom_backend = airflow.providers.common.io.xcom.backend.XComObjectStorageBackend
+
+        [common.io]
+        xcom_objectstorage_path = gs://<bucket>/xcom
+        xcom_objectstorage_threshold = 65536
+
+    Onde o Object Storage não estiver disponível, ga4_xcom_backend.py oferece
+    um backend que serializa os XComs com orjson (xcom_backend =
+    ga4_xcom_backend.OrjsonXComBackend).
 """
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
+from types import MappingProxyType
 from typing import Dict, List, Any
+import asyncio
 import json
 import logging
+import time
 
-from airflow.decorators import dag, task, task_group
+from airflow.decorators import dag, task
 from airflow.models import Variable
+from airflow.models.xcom import XCOM_RETURN_KEY
 from airflow.providers.http.operators.http import SimpleHttpOperator
 from airflow.operators.python import get_current_context
 from airflow.utils.trigger_rule import TriggerRule
 
-import requests
+import httpx
+
+log = logging.getLogger(__name__)
 
 
 # =============================================================================
@@ -62,6 +91,43 @@ SECRET_ID = "ga4-credentials"
 # Pode ser sobrescrita pela variável Airflow 'ga4_api_url'
 CLOUD_RUN_URL = "https://ga4-api-xxxxxxxxxx-uc.a.run.app"
 
+# Cliente HTTP compartilhado pelas chamadas da task (keep-alive + HTTP/2)
+# 5 minutos de leitura; em /report/batch/stream o limite vale entre linhas,
+# ou seja, por propriedade, e não para o lote inteiro
+HTTP_TIMEOUT = httpx.Timeout(300.0, connect=5.0)
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+# A API comprime com gzip as respostas JSON maiores (GZIP_MIN_SIZE)
+HTTP_HEADERS = {'Accept-Encoding': 'gzip'}
+_HTTP = None
+
+# Health check da API: reaproveitado por até HEALTH_CHECK_TTL segundos, no processo
+# e entre execuções (variável Airflow com o timestamp do último sucesso por URL)
+HEALTH_CHECK_TTL = 300
+HEALTH_CHECK_VARIABLE = "ga4_api_last_health_check"
+_HEALTH_CHECKS: Dict[str, float] = {}
+
+# Retentativas: falhas de conexão (no transporte) e status transitórios (em call_api)
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+# Default compartilhado (somente leitura) para .get() em resultados sem resumo
+_EMPTY: Dict[str, Any] = MappingProxyType({})
+
+# Propriedades por chamada a /report/batch/stream (limite MAX_BATCH_SIZE da API)
+BATCH_SIZE = 50
+
+# Chamadas simultâneas a /report/batch/stream (antigo max_active_tis_per_dag=3)
+MAX_CONCURRENT_BATCHES = 3
+
+# Pool que limita as chamadas à API entre todas as DAGs e execuções; a task
+# diária ocupa MAX_CONCURRENT_BATCHES slots, pois faz essa quantidade de chamadas
+GA4_API_POOL = "ga4_api"
+
+# Fail-fast: lotes seguidos com falha de conexão/5xx antes de cancelar os
+# lotes pendentes (0 desativa; sobrescrito pela variável ga4_fail_fast_threshold)
+FAIL_FAST_THRESHOLD = 2
+
 # Tabelas de dimensões
 DIMENSION_TABLES = [
     "TB_001_GA4_DIM_USUARIO",
@@ -110,16 +176,100 @@ def get_property_ids() -> List[str]:
         property_ids_json = Variable.get("ga4_property_ids")
         return json.loads(property_ids_json)
     except Exception as e:
-        logging.warning(f"Variável ga4_property_ids não encontrada: {e}")
+        log.warning("Variável ga4_property_ids não encontrada: %s", e)
         return []
 
 
+def get_fail_fast_threshold() -> int:
+    """
+    Obtém o limite de fail-fast da variável Airflow ga4_fail_fast_threshold.
+    
+    Usa FAIL_FAST_THRESHOLD se a variável não existir ou for inválida.
+    """
+    try:
+        return int(Variable.get("ga4_fail_fast_threshold", default_var=FAIL_FAST_THRESHOLD))
+    except Exception:
+        return FAIL_FAST_THRESHOLD
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Retorna o cliente HTTP do processo, criado na primeira chamada.
+    
+    Criado sob demanda para não abrir conexões durante o parse da DAG.
+    Usa HTTP/2 quando o pacote h2 está instalado; senão, HTTP/1.1 com keep-alive.
+    """
+    global _HTTP
+    if _HTTP is None:
+        try:
+            transport = httpx.HTTPTransport(http2=True, limits=HTTP_LIMITS, retries=HTTP_MAX_RETRIES)
+        except ImportError:
+            transport = httpx.HTTPTransport(limits=HTTP_LIMITS, retries=HTTP_MAX_RETRIES)
+        _HTTP = httpx.Client(transport=transport, timeout=HTTP_TIMEOUT, headers=HTTP_HEADERS)
+    return _HTTP
+
+
+def request_with_retry(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Executa a requisição no cliente compartilhado, retentando status transitórios
+    (429/5xx) com backoff exponencial (0,5s, 1s, 2s).
+    
+    Returns:
+        Resposta da última tentativa
+    """
+    client = get_http_client()
+    for attempt in range(HTTP_MAX_RETRIES + 1):
+        response = client.request(method, url, **kwargs)
+        if response.status_code not in HTTP_RETRY_STATUS or attempt == HTTP_MAX_RETRIES:
+            return response
+        delay = HTTP_BACKOFF_FACTOR * (2 ** attempt)
+        log.warning("Status %s em %s; nova tentativa em %ss", response.status_code, url, delay)
+        time.sleep(delay)
+    return response
+
+
+def check_api_health(api_url: str) -> None:
+    """
+    Verifica se a API está acessível, reaproveitando verificações recentes.
+    
+    Pula a requisição se houve sucesso há menos de HEALTH_CHECK_TTL segundos
+    (neste processo ou registrado na variável Airflow). Caso contrário faz um
+    HEAD em "/", sem baixar nem decodificar o corpo.
+    
+    Raises:
+        httpx.HTTPError: Se a API não responder com sucesso
+    """
+    now = time.time()
+    if now - _HEALTH_CHECKS.get(api_url, 0) < HEALTH_CHECK_TTL:
+        return
+    
+    try:
+        last_checks = json.loads(Variable.get(HEALTH_CHECK_VARIABLE, default_var="{}"))
+    except Exception:
+        last_checks = {}
+    
+    last_check = last_checks.get(api_url, 0)
+    if now - last_check < HEALTH_CHECK_TTL:
+        _HEALTH_CHECKS[api_url] = last_check
+        return
+    
+    response = request_with_retry("HEAD", f"{api_url}/", timeout=5)
+    response.raise_for_status()
+    
+    _HEALTH_CHECKS[api_url] = now
+    last_checks[api_url] = now
+    try:
+        Variable.set(HEALTH_CHECK_VARIABLE, json.dumps(last_checks))
+    except Exception as e:
+        log.warning("Não foi possível registrar o health check: %s", e)
+
+
 def call_api(endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     """
     Faz uma chamada à API do Cloud Run.
     
     Args:
-        endpoint: Endpoint da API (ex: /report/all)
+        endpoint: Endpoint da API (ex: /extract)
         payload: Dados a serem enviados no body da requisição
         
     Returns:
@@ -128,20 +278,201 @@ def call_api(endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
     api_url = get_api_url()
     url = f"{api_url}{endpoint}"
     
-    logging.info(f"Chamando API: {url}")
-    logging.info(f"Payload: {json.dumps(payload)}")
-    
-    response = requests.post(
-        url,
-        json=payload,
-        headers={"Content-Type": "application/json"},
-        timeout=300  # 5 minutos de timeout
-    )
+    log.info("Chamando API: %s", url)
+    log.info("Payload: %s", payload)
     
+    response = request_with_retry("POST", url, json=payload)
     response.raise_for_status()
     return response.json()
 
 
+def slim_result(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reduz o resultado de uma propriedade ao que é usado depois da task
+    (status, linhas processadas e erro), mantendo a XCom pequena.
+    """
+    slim = {
+        'property_id': entry.get('property_id'),
+        'status': entry.get('status'),
+        'summary': {
+            'total_rows_processed': entry.get('summary', {}).get('total_rows_processed', 0)
+        }
+    }
+    for key in ('error', 'step', 'message'):
+        if entry.get(key):
+            slim[key] = entry[key]
+    return slim
+
+
+def split_batches(property_ids: List[str]) -> List[List[str]]:
+    """
+    Divide as propriedades em até MAX_CONCURRENT_BATCHES lotes equilibrados
+    (mais lotes apenas se algum passar de BATCH_SIZE).
+    """
+    size = -(-len(property_ids) // MAX_CONCURRENT_BATCHES)  # divisão com teto
+    size = max(1, min(BATCH_SIZE, size))
+    return [property_ids[i:i + size] for i in range(0, len(property_ids), size)]
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Cliente assíncrono com as mesmas configurações de get_http_client."""
+    try:
+        transport = httpx.AsyncHTTPTransport(http2=True, limits=HTTP_LIMITS, retries=HTTP_MAX_RETRIES)
+    except ImportError:
+        transport = httpx.AsyncHTTPTransport(limits=HTTP_LIMITS, retries=HTTP_MAX_RETRIES)
+    return httpx.AsyncClient(transport=transport, timeout=HTTP_TIMEOUT, headers=HTTP_HEADERS)
+
+
+class BatchInterruptedError(Exception):
+    """Stream de um lote interrompido; `results` traz as propriedades já recebidas (por índice)."""
+    
+    def __init__(self, message: str, results: Dict[int, Dict[str, Any]]):
+        super().__init__(message)
+        self.results = results
+
+
+async def read_batch_stream(response: httpx.Response) -> Dict[int, Dict[str, Any]]:
+    """
+    Lê o NDJSON de /report/batch/stream, registrando cada propriedade assim
+    que chega.
+    
+    Returns:
+        Resultado reduzido (slim_result) por índice da propriedade no lote
+    
+    Raises:
+        BatchInterruptedError: Se o stream falhar ou terminar sem o resumo
+            final (com as propriedades recebidas até então)
+    """
+    received: Dict[int, Dict[str, Any]] = {}
+    try:
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            entry = json.loads(line)
+            if entry.get('type') == 'summary':
+                return received
+            if entry.get('type') == 'result':
+                received[entry['index']] = slim_result(entry)
+                log.info("Propriedade %s: %s", entry.get('property_id'), entry.get('status'))
+        raise httpx.RemoteProtocolError("stream encerrado antes do resumo", request=response.request)
+    except Exception as e:
+        raise BatchInterruptedError(
+            f"Lote interrompido após {len(received)} propriedades: {e}", received
+        ) from e
+
+
+async def post_batch(
+    client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    url: str,
+    batch: List[str],
+    base_payload: Dict[str, Any]
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Envia um lote de propriedades a /report/batch/stream, limitado pelo semáforo.
+    
+    Retenta status transitórios (429/5xx) com backoff exponencial, antes de
+    o stream começar. Cada propriedade é registrada assim que a API a devolve.
+    
+    Returns:
+        Resultado por índice da propriedade no lote
+    """
+    payload = {'requests': [{**base_payload, 'property_id': property_id} for property_id in batch]}
+    
+    async with semaphore:
+        log.info("Processando lote de %d propriedades", len(batch))
+        for attempt in range(HTTP_MAX_RETRIES + 1):
+            async with client.stream('POST', url, json=payload) as response:
+                if response.status_code not in HTTP_RETRY_STATUS or attempt == HTTP_MAX_RETRIES:
+                    response.raise_for_status()
+                    return await read_batch_stream(response)
+            await asyncio.sleep(HTTP_BACKOFF_FACTOR * (2 ** attempt))
+
+
+class ApiUnavailableError(ConnectionError):
+    """Fail-fast de process_batches; `results` traz o que foi processado até então."""
+    
+    def __init__(self, message: str, results: List[Dict[str, Any]]):
+        super().__init__(message)
+        self.results = results
+
+
+def is_outage_error(error: BaseException) -> bool:
+    """Indica se o erro sugere indisponibilidade da API (conexão, timeout ou 5xx)."""
+    if isinstance(error, BatchInterruptedError):
+        error = error.__cause__
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+async def process_batches(
+    url: str,
+    batches: List[List[str]],
+    base_payload: Dict[str, Any],
+    fail_fast_threshold: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Envia todos os lotes concorrentemente (até MAX_CONCURRENT_BATCHES por vez).
+    
+    Um lote com falha vira um resultado de erro para cada propriedade dele
+    que a API não chegou a devolver, sem interromper os demais. Se fail_fast_threshold > 0 e essa quantidade
+    de lotes seguidos falhar por indisponibilidade da API, os lotes
+    pendentes são cancelados e a task falha.
+    
+    Returns:
+        Resultado por propriedade
+    
+    Raises:
+        ApiUnavailableError: Se o limite de fail-fast for atingido (com os
+            resultados parciais)
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+    results = []
+    consecutive_failures = 0  # lotes, não propriedades
+    
+    async with get_async_http_client() as client:
+        async def run(batch: List[str]):
+            try:
+                return batch, await post_batch(client, semaphore, url, batch, base_payload)
+            except Exception as e:
+                return batch, e
+        
+        pending = [asyncio.create_task(run(batch)) for batch in batches]
+        try:
+            for next_done in asyncio.as_completed(pending):
+                batch, outcome = await next_done
+                if not isinstance(outcome, Exception):
+                    consecutive_failures = 0
+                    results.extend(outcome.values())
+                    results.extend(
+                        {'property_id': property_id, 'status': 'error', 'error': 'Sem resultado da API'}
+                        for index, property_id in enumerate(batch) if index not in outcome
+                    )
+                    continue
+                
+                log.error("Erro ao processar lote %s: %s", batch, outcome)
+                received = outcome.results if isinstance(outcome, BatchInterruptedError) else {}
+                results.extend(received.values())
+                results.extend(
+                    {'property_id': property_id, 'status': 'error', 'error': str(outcome)}
+                    for index, property_id in enumerate(batch) if index not in received
+                )
+                consecutive_failures = consecutive_failures + 1 if is_outage_error(outcome) else 0
+                if 0 < fail_fast_threshold <= consecutive_failures:
+                    raise ApiUnavailableError(
+                        f"API indisponível: {consecutive_failures} lotes seguidos com falha "
+                        f"(último erro: {outcome}); lotes pendentes cancelados",
+                        results
+                    )
+        finally:
+            for pending_task in pending:
+                pending_task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    return results
+
+
 # =============================================================================
 # DEFINIÇÃO DA DAG
 # =============================================================================
@@ -163,7 +494,7 @@ def dag_ga4_daily_load():
     
     Fluxo:
     1. Validar configurações
-    2. Para cada propriedade GA4:
+    2. Processar as propriedades GA4 em lotes (/report/batch/stream):
         a. Executar relatórios de dimensões
         b. Executar relatórios de métricas
     3. Consolidar resultados
@@ -175,14 +506,17 @@ def dag_ga4_daily_load():
     # =========================================================================
     
     @task(task_id='validate_config')
-    def validate_config() -> Dict[str, Any]:
+    def validate_config(**context) -> Dict[str, Any]:
         """
         Valida as configurações necessárias para a execução da DAG.
         
+        A data de execução vem do contexto do Airflow (ds), para que
+        reexecuções e backfills produzam o mesmo valor.
+        
         Returns:
             Dicionário com configurações validadas
         """
-        logging.info("Validando configurações...")
+        log.info("Validando configurações...")
         
         # Obter Property IDs
         property_ids = get_property_ids()
@@ -198,126 +532,95 @@ def dag_ga4_daily_load():
         
         # Verificar se a API está acessível
         try:
-            response = requests.get(f"{api_url}/", timeout=30)
-            response.raise_for_status()
-            api_status = response.json()
-            logging.info(f"API Status: {api_status}")
+            check_api_health(api_url)
+            log.info("API acessível: %s", api_url)
         except Exception as e:
             raise ConnectionError(f"Não foi possível conectar à API: {e}")
         
         config = {
             'property_ids': property_ids,
             'api_url': api_url,
-            'project_id': GCP_PROJECT_ID,
-            'dataset_id': DATASET_ID,
-            'secret_id': SECRET_ID,
-            'execution_date': datetime.now().strftime('%Y-%m-%d'),
-            'date_range': {
+            'execution_date': context['ds'],
+            # Campos comuns a todas as propriedades da execução, montados uma vez
+            'base_payload': {
                 'start_date': 'yesterday',
-                'end_date': 'yesterday'
+                'end_date': 'yesterday',
+                'project_id': GCP_PROJECT_ID,
+                'secret_id': SECRET_ID,
+                # Carga diária: load job (sem custo de streaming por MB)
+                'write_mode': 'load'
             }
         }
         
-        logging.info(f"Configuração validada: {len(property_ids)} propriedades")
+        log.info("Configuração validada: %d propriedades", len(property_ids))
         return config
     
     # =========================================================================
-    # TASK GROUP: Processar Propriedade
+    # TASK: Processar Propriedades
     # =========================================================================
     
-    @task_group(group_id='process_properties')
-    def process_properties(config: Dict[str, Any]):
-        """
-        Grupo de tasks para processar todas as propriedades GA4.
+    @task(task_id='process_properties', pool=GA4_API_POOL, pool_slots=MAX_CONCURRENT_BATCHES)
+    def process_properties(config: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
+        Processa as propriedades GA4 via /report/batch/stream.
         
-        @task(task_id='get_properties')
-        def get_properties(config: Dict[str, Any]) -> List[str]:
-            """Retorna a lista de propriedades a processar."""
-            return config['property_ids']
+        Uma única task envia os lotes de propriedades concorrentemente
+        (asyncio), em vez de uma task mapeada por propriedade.
         
-        @task(task_id='process_property', max_active_tis_per_dag=3)
-        def process_property(property_id: str, config: Dict[str, Any]) -> Dict[str, Any]:
-            """
-            Processa uma propriedade GA4 específica.
-            
-            Executa todos os relatórios (dimensões e métricas) para a propriedade.
-            
-            Args:
-                property_id: ID da propriedade GA4
-                config: Configurações da execução
-                
-            Returns:
-                Resultado do processamento
-            """
-            logging.info(f"Processando propriedade: {property_id}")
-            
-            payload = {
-                'property_id': property_id,
-                'start_date': config['date_range']['start_date'],
-                'end_date': config['date_range']['end_date'],
-                'project_id': config['project_id'],
-                'secret_id': config['secret_id']
-            }
+        Args:
+            config: Configurações da execução (property_ids e base_payload);
+                única XCom lida pela task
             
-            try:
-                result = call_api('/report/all', payload)
-                
-                logging.info(f"Propriedade {property_id} processada com sucesso")
-                logging.info(f"Resumo: {result.get('results', {}).get('summary', {})}")
-                
-                return {
-                    'property_id': property_id,
-                    'status': 'success',
-                    'result': result
-                }
-                
-            except Exception as e:
-                logging.error(f"Erro ao processar propriedade {property_id}: {e}")
-                return {
-                    'property_id': property_id,
-                    'status': 'error',
-                    'error': str(e)
-                }
-        
-        # Obter lista de propriedades
-        properties = get_properties(config)
-        
-        # Processar cada propriedade (com paralelismo limitado)
-        return process_property.expand(
-            property_id=properties,
-            config=[config] * len(config['property_ids'])
-        )
+        Returns:
+            Resultado por propriedade
+        """
+        try:
+            return asyncio.run(process_batches(
+                f"{config['api_url']}/report/batch/stream",
+                split_batches(config['property_ids']),
+                config['base_payload'],
+                fail_fast_threshold=get_fail_fast_threshold()
+            ))
+        except ApiUnavailableError as e:
+            # Resultados parciais seguem para consolidate_results (ALL_DONE)
+            get_current_context()['ti'].xcom_push(key=XCOM_RETURN_KEY, value=e.results)
+            raise
     
     # =========================================================================
     # TASK: Consolidar Resultados
     # =========================================================================
     
     @task(task_id='consolidate_results', trigger_rule=TriggerRule.ALL_DONE)
-    def consolidate_results(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def consolidate_results(results: List[Dict[str, Any]], **context) -> Dict[str, Any]:
         """
         Consolida os resultados de todas as propriedades processadas.
         
         Args:
-            results: Lista de resultados de cada propriedade
+            results: Lista de resultados de cada propriedade (parcial, ou
+                None, se process_properties falhou)
             
         Returns:
             Resumo consolidado da execução
         """
-        logging.info("Consolidando resultados...")
-        
-        total_properties = len(results)
-        successful = sum(1 for r in results if r.get('status') == 'success')
-        failed = total_properties - successful
+        log.info("Consolidando resultados...")
+        results = results or []
         
+        # Uma única passada: contagens, linhas e propriedades com falha
+        successful = 0
         total_rows = 0
+        failed_properties = []
         for result in results:
             if result.get('status') == 'success':
-                summary = result.get('result', {}).get('results', {}).get('summary', {})
-                total_rows += summary.get('total_rows_processed', 0)
+                successful += 1
+                total_rows += result.get('summary', _EMPTY).get('total_rows_processed', 0)
+            else:
+                failed_properties.append(result.get('property_id'))
+        
+        total_properties = len(results)
+        failed = len(failed_properties)
         
         consolidated = {
-            'execution_date': datetime.now().isoformat(),
+            'execution_date': context['ts'],
             'total_properties': total_properties,
             'successful': successful,
             'failed': failed,
@@ -326,12 +629,11 @@ def dag_ga4_daily_load():
             'details': results
         }
         
-        logging.info(f"Execução concluída: {successful}/{total_properties} propriedades processadas com sucesso")
-        logging.info(f"Total de linhas processadas: {total_rows}")
+        log.info("Execução concluída: %d/%d propriedades processadas com sucesso", successful, total_properties)
+        log.info("Total de linhas processadas: %d", total_rows)
         
         if failed > 0:
-            failed_properties = [r['property_id'] for r in results if r.get('status') == 'error']
-            logging.warning(f"Propriedades com falha: {failed_properties}")
+            log.warning("Propriedades com falha: %s", failed_properties)
         
         return consolidated
     
@@ -347,28 +649,23 @@ def dag_ga4_daily_load():
         Args:
             summary: Resumo consolidado da execução
         """
-        context = get_current_context()
-        dag_run = context['dag_run']
-        
-        message = f"""
-        ========================================
-        DAG GA4 Daily Load - Execução Concluída
-        ========================================
-        
-        Data de Execução: {summary['execution_date']}
-        DAG Run ID: {dag_run.run_id}
-        
-        Resumo:
-        - Total de Propriedades: {summary['total_properties']}
-        - Sucesso: {summary['successful']}
-        - Falhas: {summary['failed']}
-        - Taxa de Sucesso: {summary['success_rate']}
-        - Total de Linhas: {summary['total_rows_processed']:,}
-        
-        ========================================
-        """
-        
-        logging.info(message)
+        # Mensagem montada só se o nível INFO estiver habilitado
+        if log.isEnabledFor(logging.INFO):
+            dag_run = get_current_context()['dag_run']
+            log.info("\n".join((
+                "========================================",
+                "DAG GA4 Daily Load - Execução Concluída",
+                "========================================",
+                f"Data de Execução: {summary['execution_date']}",
+                f"DAG Run ID: {dag_run.run_id}",
+                "Resumo:",
+                f"- Total de Propriedades: {summary['total_properties']}",
+                f"- Sucesso: {summary['successful']}",
+                f"- Falhas: {summary['failed']}",
+                f"- Taxa de Sucesso: {summary['success_rate']}",
+                f"- Total de Linhas: {summary['total_rows_processed']:,}",
+                "========================================",
+            )))
         
         # Aqui você pode adicionar notificações adicionais:
         # - Enviar email
@@ -393,6 +690,106 @@ def dag_ga4_daily_load():
     notify_completion(summary)
 
 
+# =============================================================================
+# TASKS DAS DAGS DE PROPRIEDADE INDIVIDUAL
+# =============================================================================
+
+def build_property_flow(
+    run_task_id: str,
+    log_task_id: str,
+    write_mode: str,
+    require_dates: bool
+) -> None:
+    """
+    Cria o fluxo validar → executar → registrar de uma propriedade individual.
+    
+    As DAGs manual e de backfill compartilham as mesmas tasks e diferem
+    apenas nos valores capturados aqui. Deve ser chamada dentro de uma @dag.
+    
+    Args:
+        run_task_id: task_id da task que chama a API
+        log_task_id: task_id da task que registra o resultado
+        write_mode: Modo de escrita no BigQuery enviado à API
+        require_dates: Se True, start_date e end_date são obrigatórios
+            (YYYY-MM-DD); senão, o padrão é 'yesterday'
+    """
+    
+    @task(task_id='validate_params')
+    def validate_params(**context) -> Dict[str, Any]:
+        """Valida os parâmetros fornecidos."""
+        params = context['params']
+        
+        property_id = params.get('property_id')
+        
+        if require_dates:
+            start_date = params.get('start_date')
+            end_date = params.get('end_date')
+            
+            if not all([property_id, start_date, end_date]):
+                raise ValueError("property_id, start_date e end_date são obrigatórios")
+            
+            # Validar formato das datas (fromisoformat: caminho rápido em C) e
+            # normalizar para YYYY-MM-DD, único formato de data explícita do GA4
+            try:
+                start_date = date.fromisoformat(start_date).isoformat()
+                end_date = date.fromisoformat(end_date).isoformat()
+            except ValueError:
+                raise ValueError("Datas devem estar no formato YYYY-MM-DD")
+        else:
+            if not property_id:
+                raise ValueError("property_id é obrigatório")
+            
+            start_date = params.get('start_date', 'yesterday')
+            end_date = params.get('end_date', 'yesterday')
+        
+        return {
+            'property_id': property_id,
+            'start_date': start_date,
+            'end_date': end_date,
+            'project_id': GCP_PROJECT_ID,
+            'secret_id': SECRET_ID
+        }
+    
+    @task(task_id=run_task_id, pool=GA4_API_POOL)
+    def run_property(config: Dict[str, Any]) -> Dict[str, Any]:
+        """Executa os relatórios da propriedade para o período."""
+        log.info("Processando propriedade: %s", config['property_id'])
+        log.info("Período: %s a %s", config['start_date'], config['end_date'])
+        
+        payload = {**config, 'write_mode': write_mode}
+        
+        # /extract devolve só os resumos da extração e da carga; seguem via XCom
+        response = call_api('/extract', payload)
+        result = {
+            'status': response.get('status'),
+            'extraction': response.get('extraction', {}),
+            'load': response.get('load', {})
+        }
+        
+        log.info("Resultado: %s", result)
+        return result
+    
+    @task(task_id=log_task_id)
+    def log_result(result: Dict[str, Any]) -> None:
+        """Registra o resultado da execução."""
+        if not log.isEnabledFor(logging.INFO):
+            return
+        
+        extraction = result.get('extraction', _EMPTY)
+        load = result.get('load', _EMPTY)
+        log.info(
+            "Execução concluída: %s relatórios processados, %s com sucesso, "
+            "%s falhas, %s linhas carregadas",
+            extraction.get('total_reports', 0),
+            extraction.get('successful', 0),
+            extraction.get('failed', 0),
+            load.get('total_rows', 0)
+        )
+    
+    # Fluxo
+    log_result(run_property(validate_params()))
+
+
 # =============================================================================
 # DAG ALTERNATIVA: Processar Propriedade Individual
 # =============================================================================
@@ -426,58 +823,13 @@ def dag_ga4_daily_load():
 )
 def dag_ga4_single_property():
     """DAG para processar uma única propriedade GA4."""
-    
-    @task(task_id='validate_params')
-    def validate_params(**context) -> Dict[str, Any]:
-        """Valida os parâmetros fornecidos."""
-        params = context['params']
-        
-        property_id = params.get('property_id')
-        if not property_id:
-            raise ValueError("property_id é obrigatório")
-        
-        return {
-            'property_id': property_id,
-            'start_date': params.get('start_date', 'yesterday'),
-            'end_date': params.get('end_date', 'yesterday'),
-            'project_id': GCP_PROJECT_ID,
-            'secret_id': SECRET_ID
-        }
-    
-    @task(task_id='run_reports')
-    def run_reports(config: Dict[str, Any]) -> Dict[str, Any]:
-        """Executa os relatórios para a propriedade."""
-        logging.info(f"Processando propriedade: {config['property_id']}")
-        
-        payload = {
-            'property_id': config['property_id'],
-            'start_date': config['start_date'],
-            'end_date': config['end_date'],
-            'project_id': config['project_id'],
-            'secret_id': config['secret_id']
-        }
-        
-        result = call_api('/report/all', payload)
-        
-        logging.info(f"Resultado: {result.get('results', {}).get('summary', {})}")
-        return result
-    
-    @task(task_id='log_result')
-    def log_result(result: Dict[str, Any]) -> None:
-        """Registra o resultado da execução."""
-        summary = result.get('results', {}).get('summary', {})
-        logging.info(f"""
-        Execução concluída:
-        - Relatórios processados: {summary.get('total_reports', 0)}
-        - Sucesso: {summary.get('successful', 0)}
-        - Falhas: {summary.get('failed', 0)}
-        - Total de linhas: {summary.get('total_rows_processed', 0)}
-        """)
-    
-    # Fluxo
-    config = validate_params()
-    result = run_reports(config)
-    log_result(result)
+    # Trigger manual: streaming, para os dados ficarem disponíveis logo
+    build_property_flow(
+        run_task_id='run_reports',
+        log_task_id='log_result',
+        write_mode='streaming',
+        require_dates=False
+    )
 
 
 # =============================================================================
@@ -514,61 +866,12 @@ def dag_ga4_single_property():
 )
 def dag_ga4_backfill():
     """DAG para backfill de dados históricos."""
-    
-    @task(task_id='validate_params')
-    def validate_params(**context) -> Dict[str, Any]:
-        """Valida os parâmetros de backfill."""
-        params = context['params']
-        
-        property_id = params.get('property_id')
-        start_date = params.get('start_date')
-        end_date = params.get('end_date')
-        
-        if not all([property_id, start_date, end_date]):
-            raise ValueError("property_id, start_date e end_date são obrigatórios")
-        
-        # Validar formato das datas
-        try:
-            datetime.strptime(start_date, '%Y-%m-%d')
-            datetime.strptime(end_date, '%Y-%m-%d')
-        except ValueError:
-            raise ValueError("Datas devem estar no formato YYYY-MM-DD")
-        
-        return {
-            'property_id': property_id,
-            'start_date': start_date,
-            'end_date': end_date,
-            'project_id': GCP_PROJECT_ID,
-            'secret_id': SECRET_ID
-        }
-    
-    @task(task_id='run_backfill')
-    def run_backfill(config: Dict[str, Any]) -> Dict[str, Any]:
-        """Executa o backfill para o período especificado."""
-        logging.info(f"Executando backfill para {config['property_id']}")
-        logging.info(f"Período: {config['start_date']} a {config['end_date']}")
-        
-        payload = {
-            'property_id': config['property_id'],
-            'start_date': config['start_date'],
-            'end_date': config['end_date'],
-            'project_id': config['project_id'],
-            'secret_id': config['secret_id']
-        }
-        
-        result = call_api('/report/all', payload)
-        return result
-    
-    @task(task_id='log_backfill_result')
-    def log_backfill_result(result: Dict[str, Any]) -> None:
-        """Registra o resultado do backfill."""
-        summary = result.get('results', {}).get('summary', {})
-        logging.info(f"Backfill concluído: {summary.get('total_rows_processed', 0)} linhas processadas")
-    
-    # Fluxo
-    config = validate_params()
-    result = run_backfill(config)
-    log_backfill_result(result)
+    build_property_flow(
+        run_task_id='run_backfill',
+        log_task_id='log_backfill_result',
+        write_mode='load',
+        require_dates=True
+    )
 
 
 # =============================================================================
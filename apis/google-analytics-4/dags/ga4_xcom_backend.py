@@ -0,0 +1,88 @@
+"""
+Backend de XCom com serialização via orjson.
+
+Os resumos devolvidos pelas DAGs do GA4 passam por XCom a cada task; com
+orjson a serialização é mais rápida e o payload menor que o do json padrão
+do Airflow. Apenas valores JSON nativos (dict com chaves str, list, str,
+int, float, bool e None) passam pelo orjson, gravados com o prefixo
+_ORJSON_TAG; os demais (tuplas, datetimes, dataclasses...) e todos os
+valores sem orjson instalado seguem o serde do BaseXCom, que preserva os
+tipos. Na leitura, só valores com o prefixo são decodificados pelo orjson.
+
+Configuração (airflow.cfg):
+
+    [core]
+    xcom_backend = ga4_xcom_backend.OrjsonXComBackend
+    enable_xcom_pickling = False
+"""
+
+import math
+from typing import Any
+
+from airflow.models.xcom import BaseXCom
+
+try:
+    import orjson
+except ImportError:  # opcional: sem ele, usa o json padrão do Airflow
+    orjson = None
+
+# Prefixo dos valores gravados pelo orjson; nenhum JSON ou pickle começa com \x00
+_ORJSON_TAG = b"\x00orjson\x00"
+
+# Faixa de inteiros aceita pelo orjson (64 bits, com ou sem sinal)
+_INT_MIN = -(2 ** 63)
+_INT_MAX = 2 ** 64 - 1
+
+
+def _is_json_native(value: Any) -> bool:
+    """True se o valor é JSON nativo e volta idêntico após dumps/loads."""
+    # type() exato: subclasses (ex.: enums) não voltariam com o mesmo tipo
+    value_type = type(value)
+    if value is None or value_type is str or value_type is bool:
+        return True
+    if value_type is int:
+        return _INT_MIN <= value <= _INT_MAX
+    if value_type is float:
+        # NaN e infinito viram null no orjson
+        return math.isfinite(value)
+    if value_type is list:
+        return all(_is_json_native(item) for item in value)
+    if value_type is dict:
+        return all(
+            type(key) is str and _is_json_native(item)
+            for key, item in value.items()
+        )
+    return False
+
+
+def _tagged_payload(value: Any) -> Any:
+    """Conteúdo JSON de um valor gravado com _ORJSON_TAG, ou None se não for o caso."""
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = bytes(value)
+        if value.startswith(_ORJSON_TAG):
+            return value[len(_ORJSON_TAG):]
+    return None
+
+
+class OrjsonXComBackend(BaseXCom):
+    """XCom serializado com orjson (bytes JSON, com prefixo, na coluna value)."""
+
+    @staticmethod
+    def serialize_value(value: Any, **kwargs) -> Any:
+        if orjson is not None and _is_json_native(value):
+            return _ORJSON_TAG + orjson.dumps(value)
+        return BaseXCom.serialize_value(value, **kwargs)
+
+    @staticmethod
+    def deserialize_value(result) -> Any:
+        payload = _tagged_payload(result.value) if orjson is not None else None
+        if payload is not None:
+            return orjson.loads(payload)
+        return BaseXCom.deserialize_value(result)
+
+    def orm_deserialize_value(self) -> Any:
+        # Exibição na UI: o BaseXCom não reconhece o prefixo
+        payload = _tagged_payload(self.value) if orjson is not None else None
+        if payload is not None:
+            return orjson.loads(payload)
+        return super().orm_deserialize_value()
@@ -9,28 +9,75 @@ Data: Janeiro de 2026
 Versão: 2.0.0
 """
 
+import os
+import json
+import hashlib
+import importlib.util
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import chain
+from threading import Lock
+from types import MappingProxyType
+from typing import List, Dict, Any, Iterable, Iterator, Mapping, Optional, Tuple
+from dataclasses import dataclass
 import pytz
+from cachetools import TTLCache
+
+try:
+    import orjson
+except ImportError:  # opcional: sem ele, usa o json da stdlib
+    orjson = None
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Mensagens de log usam formatação %s (adiada): com INFO desligado, nada é formatado
+_BANNER = "=" * 50
+
+
+# =============================================================================
+# IMPORT SOB DEMANDA
+# =============================================================================
+
+# google.analytics.data_v1beta é pesado; importado apenas no primeiro uso
+# (GET /reports, por exemplo, não precisa dele)
+_ga4_types_module = None
+
+
+def _ga4_types():
+    """Retorna o módulo google.analytics.data_v1beta.types, importando-o na primeira chamada."""
+    global _ga4_types_module
+    if _ga4_types_module is None:
+        from google.analytics.data_v1beta import types as _ga4_types_module
+    return _ga4_types_module
+
+
+@lru_cache(maxsize=128)
+def _dim(name: str):
+    """Dimension reaproveitada entre relatórios ("date" aparece em todos)."""
+    return _ga4_types().Dimension(name=name)
+
+
+@lru_cache(maxsize=128)
+def _met(name: str):
+    """Metric reaproveitada entre relatórios."""
+    return _ga4_types().Metric(name=name)
+
 
 # =============================================================================
 # CONFIGURAÇÃO DE RELATÓRIOS
 # =============================================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ReportConfig:
-    """Configuração de um relatório GA4."""
+    """Configuração de um relatório GA4 (imutável e hashable)."""
     name: str
     table_name: str
-    dimensions: List[str]
-    metrics: List[str]
+    dimensions: Tuple[str, ...]
+    metrics: Tuple[str, ...]
     description: str = ""
 
 
@@ -39,50 +86,50 @@ DIMENSION_REPORTS = {
     "USUARIO": ReportConfig(
         name="Dimensões de Usuário",
         table_name="TB_001_GA4_DIM_USUARIO",
-        dimensions=["date", "newVsReturning", "userAgeBracket", "userGender"],
-        metrics=["activeUsers", "newUsers", "totalUsers"],
+        dimensions=("date", "newVsReturning", "userAgeBracket", "userGender"),
+        metrics=("activeUsers", "newUsers", "totalUsers"),
         description="Dados demográficos e comportamentais dos usuários"
     ),
     "GEOGRAFICA": ReportConfig(
         name="Dimensões Geográficas",
         table_name="TB_002_GA4_DIM_GEOGRAFICA",
-        dimensions=["date", "city", "cityId", "country", "countryId", "region", "continent"],
-        metrics=["activeUsers", "sessions"],
+        dimensions=("date", "city", "cityId", "country", "countryId", "region", "continent"),
+        metrics=("activeUsers", "sessions"),
         description="Localização geográfica dos usuários"
     ),
     "DISPOSITIVO": ReportConfig(
         name="Dimensões de Dispositivo",
         table_name="TB_003_GA4_DIM_DISPOSITIVO",
-        dimensions=["date", "browser", "deviceCategory", "operatingSystem", "platform", "screenResolution"],
-        metrics=["activeUsers", "sessions"],
+        dimensions=("date", "browser", "deviceCategory", "operatingSystem", "platform", "screenResolution"),
+        metrics=("activeUsers", "sessions"),
         description="Informações de dispositivo e tecnologia"
     ),
     "AQUISICAO": ReportConfig(
         name="Dimensões de Aquisição",
         table_name="TB_004_GA4_DIM_AQUISICAO",
-        dimensions=["date", "sessionSource", "sessionMedium", "sessionSourceMedium", "sessionCampaignId", "sessionCampaignName", "sessionDefaultChannelGroup"],
-        metrics=["activeUsers", "sessions", "newUsers"],
+        dimensions=("date", "sessionSource", "sessionMedium", "sessionSourceMedium", "sessionCampaignId", "sessionCampaignName", "sessionDefaultChannelGroup"),
+        metrics=("activeUsers", "sessions", "newUsers"),
         description="Origem e campanhas de aquisição"
     ),
     "PAGINA": ReportConfig(
         name="Dimensões de Página",
         table_name="TB_005_GA4_DIM_PAGINA",
-        dimensions=["date", "pagePath", "pageTitle", "landingPage", "hostName"],
-        metrics=["screenPageViews", "activeUsers"],
+        dimensions=("date", "pagePath", "pageTitle", "landingPage", "hostName"),
+        metrics=("screenPageViews", "activeUsers"),
         description="Páginas e conteúdo acessado"
     ),
     "EVENTO": ReportConfig(
         name="Dimensões de Evento",
         table_name="TB_006_GA4_DIM_EVENTO",
-        dimensions=["date", "eventName", "isConversionEvent"],
-        metrics=["eventCount", "activeUsers"],
+        dimensions=("date", "eventName", "isConversionEvent"),
+        metrics=("eventCount", "activeUsers"),
         description="Eventos e conversões"
     ),
     "PUBLICO": ReportConfig(
         name="Dimensões de Público",
         table_name="TB_007_GA4_DIM_PUBLICO",
-        dimensions=["date", "audienceId", "audienceName"],
-        metrics=["activeUsers"],
+        dimensions=("date", "audienceId", "audienceName"),
+        metrics=("activeUsers",),
         description="Públicos-alvo configurados"
     ),
 }
@@ -91,45 +138,114 @@ METRIC_REPORTS = {
     "USUARIOS": ReportConfig(
         name="Métricas de Usuários",
         table_name="TB_008_GA4_MET_USUARIOS",
-        dimensions=["date"],
-        metrics=["activeUsers", "newUsers", "totalUsers", "dauPerMau", "dauPerWau", "wauPerMau"],
+        dimensions=("date",),
+        metrics=("activeUsers", "newUsers", "totalUsers", "dauPerMau", "dauPerWau", "wauPerMau"),
         description="Métricas de usuários ativos e novos"
     ),
     "SESSAO": ReportConfig(
         name="Métricas de Sessão",
         table_name="TB_009_GA4_MET_SESSAO",
-        dimensions=["date"],
-        metrics=["sessions", "sessionsPerUser", "averageSessionDuration", "bounceRate", "engagedSessions", "engagementRate"],
+        dimensions=("date",),
+        metrics=("sessions", "sessionsPerUser", "averageSessionDuration", "bounceRate", "engagedSessions", "engagementRate"),
         description="Métricas de sessões e engajamento"
     ),
     "EVENTOS": ReportConfig(
         name="Métricas de Eventos",
         table_name="TB_010_GA4_MET_EVENTOS",
-        dimensions=["date"],
-        metrics=["eventCount", "eventCountPerUser", "eventsPerSession", "conversions"],
+        dimensions=("date",),
+        metrics=("eventCount", "eventCountPerUser", "eventsPerSession", "conversions"),
         description="Métricas de eventos e conversões"
     ),
     "VISUALIZACAO": ReportConfig(
         name="Métricas de Visualização",
         table_name="TB_011_GA4_MET_VISUALIZACAO",
-        dimensions=["date"],
-        metrics=["screenPageViews", "screenPageViewsPerSession", "screenPageViewsPerUser"],
+        dimensions=("date",),
+        metrics=("screenPageViews", "screenPageViewsPerSession", "screenPageViewsPerUser"),
         description="Métricas de visualizações de página"
     ),
     "ECOMMERCE": ReportConfig(
         name="Métricas de E-commerce",
         table_name="TB_012_GA4_MET_ECOMMERCE",
-        dimensions=["date"],
-        metrics=["totalRevenue", "purchaseRevenue", "transactions", "ecommercePurchases", "averagePurchaseRevenue"],
+        dimensions=("date",),
+        metrics=("totalRevenue", "purchaseRevenue", "transactions", "ecommercePurchases", "averagePurchaseRevenue"),
         description="Métricas de receita e transações"
     ),
 }
 
 
+# =============================================================================
+# CACHE DE RELATÓRIOS
+# =============================================================================
+
+# Resultados de run_ga4_report por (property, dimensões, métricas, período):
+# extrações repetidas dentro do TTL não voltam à API do GA4 (nem gastam quota)
+_REPORT_CACHE: TTLCache = TTLCache(
+    maxsize=int(os.environ.get("GA4_CACHE_SIZE", "256")),
+    ttl=int(os.environ.get("GA4_CACHE_TTL", "300"))
+)
+_REPORT_CACHE_LOCK = Lock()
+_REPORT_CACHE_STATS = {"hits": 0, "misses": 0}
+
+# Relatórios extraídos simultaneamente por extract_all_reports (chamadas
+# independentes, limitadas por I/O; o cliente gRPC do GA4 é thread-safe)
+GA4_MAX_WORKERS = int(os.environ.get("GA4_MAX_WORKERS", "8"))
+
+# Relatórios por chamada batchRunReports (limite da API: 5 por requisição)
+GA4_BATCH_SIZE = 5
+
+# Métricas por relatório (limite da API: 10 por requisição)
+GA4_MAX_METRICS = 10
+
+# GA4_DEDUP_REQUESTS=1: extract_all_reports atende relatórios com as mesmas
+# dimensões em um único request (ver _merge_report_tasks)
+GA4_DEDUP_REQUESTS = os.environ.get("GA4_DEDUP_REQUESTS") == "1"
+
+# Linhas por página (limit/offset); relatórios maiores são paginados
+GA4_PAGE_SIZE = 10000
+
+
+def _copy_rows(
+    rows: List[Dict[str, Any]],
+    extra_fields: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Copia as linhas (dicts de valores escalares) para o chamador poder alterá-las,
+    já incluindo extra_fields (ex.: property_id) na mesma passada.
+    """
+    if extra_fields:
+        return [{**row, **extra_fields} for row in rows]
+    return [dict(row) for row in rows]
+
+
+def clear_report_cache() -> None:
+    """Esvazia o cache de relatórios e zera os contadores."""
+    with _REPORT_CACHE_LOCK:
+        _REPORT_CACHE.clear()
+        _REPORT_CACHE_STATS["hits"] = 0
+        _REPORT_CACHE_STATS["misses"] = 0
+
+
+def get_report_cache_stats() -> Dict[str, int]:
+    """Retorna tamanho, capacidade, TTL e acertos/falhas do cache de relatórios."""
+    with _REPORT_CACHE_LOCK:
+        return {
+            "size": len(_REPORT_CACHE),
+            "maxsize": int(_REPORT_CACHE.maxsize),
+            "ttl": int(_REPORT_CACHE.ttl),
+            **_REPORT_CACHE_STATS
+        }
+
+
 # =============================================================================
 # FUNÇÕES DE EXTRAÇÃO
 # =============================================================================
 
+@lru_cache(maxsize=32)
+def _tz(name: str):
+    """Timezone pytz pelo nome, resolvida uma vez por processo."""
+    return pytz.timezone(name)
+
+
 def get_date_range(days_back: int = 1, timezone: str = "America/Sao_Paulo") -> tuple:
     """
     Calcula o range de datas para extração (D-1 por padrão).
@@ -141,8 +257,7 @@ def get_date_range(days_back: int = 1, timezone: str = "America/Sao_Paulo") -> t
     Returns:
         Tupla (start_date, end_date) no formato YYYY-MM-DD
     """
-    tz = pytz.timezone(timezone)
-    now = datetime.now(tz)
+    now = datetime.now(_tz(timezone))
     
     target_date = now - timedelta(days=days_back)
     date_str = target_date.strftime("%Y-%m-%d")
@@ -150,16 +265,360 @@ def get_date_range(days_back: int = 1, timezone: str = "America/Sao_Paulo") -> t
     return date_str, date_str
 
 
+def _normalize_property_id(property_id: str) -> str:
+    """Garante o formato "properties/<id>" exigido pela API."""
+    if not property_id.startswith("properties/"):
+        return f"properties/{property_id}"
+    return property_id
+
+
+def _is_replay() -> bool:
+    """Modo replay (GA4_REPLAY=1): relatórios vêm só do cache em disco, nunca da API."""
+    return os.environ.get("GA4_REPLAY") == "1"
+
+
+def _is_absolute_date(value: str) -> bool:
+    """True para datas YYYY-MM-DD; False para datas relativas ("yesterday", "7daysAgo")."""
+    try:
+        datetime.strptime(value, "%Y-%m-%d")
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def _disk_cache_path(cache_key: tuple, cache_dir: Optional[str]) -> Optional[str]:
+    """
+    Caminho do arquivo Parquet do relatório no cache em disco, ou None se o
+    cache em disco estiver desativado (sem cache_dir nem GA4_CACHE_DIR).
+    
+    Períodos com datas relativas (últimos itens de cache_key) não vão para o
+    disco: "yesterday" gravado hoje serviria dados de ontem para sempre.
+    """
+    cache_dir = cache_dir or os.environ.get("GA4_CACHE_DIR")
+    if not cache_dir:
+        return None
+    if not all(_is_absolute_date(value) for value in cache_key[-2:]):
+        return None
+    digest = hashlib.sha1(repr(cache_key).encode()).hexdigest()
+    return os.path.join(cache_dir, f"{digest}.parquet")
+
+
+def _read_disk_cache(path: str) -> Optional[List[Dict[str, Any]]]:
+    """
+    Lê as linhas de um relatório gravado em Parquet (None se ausente ou sem pyarrow).
+    
+    Arquivos ilegíveis (truncados ou corrompidos) são removidos, e o
+    relatório volta a ser buscado na API.
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        logger.warning("pyarrow não instalado; cache em disco ignorado")
+        return None
+    try:
+        return pq.read_table(path).to_pylist()
+    except Exception as e:
+        logger.warning("Cache em disco ilegível %s, descartando: %s", path, e)
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+
+def _write_disk_cache(path: str, rows: List[Dict[str, Any]]) -> None:
+    """Grava as linhas em Parquet (zstd); falhas apenas geram aviso."""
+    try:
+        import pyarrow
+        import pyarrow.parquet as pq
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        pq.write_table(pyarrow.Table.from_pylist(rows), tmp_path, compression="zstd")
+        os.replace(tmp_path, path)  # leitores nunca veem um arquivo parcial
+    except Exception as e:
+        logger.warning("Não foi possível gravar o cache em disco %s: %s", path, e)
+
+
+def _cache_lookup(
+    cache_key: tuple,
+    cache_dir: Optional[str] = None,
+    extra_fields: Optional[Dict[str, Any]] = None
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Retorna uma cópia das linhas em cache, com extra_fields (ou None),
+    contabilizando acerto/falha.
+    
+    Consulta a memória e, em seguida, o cache em disco (que repovoa a memória).
+    """
+    with _REPORT_CACHE_LOCK:
+        cached_rows = _REPORT_CACHE.get(cache_key)
+        _REPORT_CACHE_STATS["hits" if cached_rows is not None else "misses"] += 1
+    if cached_rows is not None:
+        return _copy_rows(cached_rows, extra_fields)
+    
+    path = _disk_cache_path(cache_key, cache_dir)
+    cached_rows = _read_disk_cache(path) if path else None
+    if cached_rows is None:
+        return None
+    
+    logger.info("Relatório GA4 lido do cache em disco: %s", path)
+    with _REPORT_CACHE_LOCK:
+        _REPORT_CACHE[cache_key] = cached_rows
+    return _copy_rows(cached_rows, extra_fields)
+
+
+def _cache_store(
+    cache_key: tuple,
+    rows: List[Dict[str, Any]],
+    cache_dir: Optional[str] = None,
+    extra_fields: Optional[Dict[str, Any]] = None
+) -> List[Dict[str, Any]]:
+    """Guarda as linhas no cache (memória e, se ativo, disco) e retorna uma cópia com extra_fields."""
+    with _REPORT_CACHE_LOCK:
+        _REPORT_CACHE[cache_key] = rows
+    
+    path = _disk_cache_path(cache_key, cache_dir)
+    if path:
+        _write_disk_cache(path, rows)
+    return _copy_rows(rows, extra_fields)
+
+
+def _replay_miss(cache_key: tuple) -> LookupError:
+    """Erro para relatório ausente do cache em modo replay."""
+    return LookupError(
+        f"GA4_REPLAY=1 e relatório ausente do cache em disco (GA4_CACHE_DIR): {cache_key}"
+    )
+
+
+def _build_report_request(
+    property_id: Optional[str],
+    dimensions: List[str],
+    metrics: List[str],
+    start_date: str,
+    end_date: str,
+    limit: int = GA4_PAGE_SIZE,
+    offset: int = 0
+):
+    """
+    Monta o RunReportRequest de uma página de um relatório.
+    
+    property_id é None dentro de um BatchRunReportsRequest (a propriedade
+    vai no request do lote).
+    """
+    types = _ga4_types()
+    
+    request = types.RunReportRequest(
+        dimensions=[_dim(d) for d in dimensions],
+        metrics=[_met(m) for m in metrics],
+        date_ranges=[types.DateRange(start_date=start_date, end_date=end_date)],
+        limit=limit,
+        offset=offset
+    )
+    if property_id:
+        request.property = property_id
+    return request
+
+
+def _convert_metric_value(value: str) -> Any:
+    """Converte um valor de métrica para int/float quando possível (tipo desconhecido)."""
+    try:
+        if "." in value:
+            return float(value)
+        return int(value)
+    except ValueError:
+        return value
+
+
+def _metric_converters(response_pb, metrics: List[str]) -> List[Any]:
+    """
+    Escolhe um conversor por coluna de métrica, uma vez por resposta, a partir
+    do tipo informado em metric_headers (int para TYPE_INTEGER, float para os
+    demais tipos numéricos).
+    """
+    MetricType = _ga4_types().MetricType
+    
+    converters = []
+    for header in response_pb.metric_headers:
+        if header.type_ == MetricType.TYPE_INTEGER:
+            converters.append(int)
+        elif header.type_ == MetricType.METRIC_TYPE_UNSPECIFIED:
+            converters.append(_convert_metric_value)
+        else:
+            converters.append(float)
+    
+    # Sem cabeçalho para alguma métrica: conversão genérica
+    converters.extend([_convert_metric_value] * (len(metrics) - len(converters)))
+    return converters
+
+
+def _row_parser_source(dimensions: Tuple[str, ...], metrics: Tuple[str, ...]) -> str:
+    """
+    Código-fonte de um parser de linhas especializado para as colunas dadas:
+    o dicionário de cada linha é um literal com os índices já desenrolados.
+    """
+    fields = [f"{name!r}: dv[{i}].value" for i, name in enumerate(dimensions)]
+    fields += [f"{name!r}: c{i}(mv[{i}].value)" for i, name in enumerate(metrics)]
+    
+    lines = ["def parse(rows, converters, extra, fallback):"]
+    if metrics:
+        lines.append("    " + "".join(f"c{i}, " for i in range(len(metrics))) + "= converters")
+    lines += [
+        "    for row in rows:",
+        "        dv = row.dimension_values",
+        "        mv = row.metric_values",
+        "        try:",
+        f"            row_data = {{{', '.join(fields)}}}",
+        "        except ValueError:",
+        "            row_data = fallback(row)",
+        "        row_data.update(extra)",
+        "        yield row_data",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+@lru_cache(maxsize=64)
+def _row_parser(dimensions: Tuple[str, ...], metrics: Tuple[str, ...]):
+    """
+    Compila (uma vez por combinação de colunas) o parser especializado de
+    _row_parser_source. Os relatórios configurados são compilados na importação.
+    """
+    namespace: Dict[str, Any] = {}
+    exec(_row_parser_source(dimensions, metrics), namespace)
+    return namespace["parse"]
+
+
+def _iter_response_rows(
+    response,
+    dimensions: List[str],
+    metrics: List[str],
+    extra_fields: Optional[Dict[str, Any]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Converte as linhas de um RunReportResponse em dicionários, uma a uma.
+    
+    Métricas são convertidas pelo tipo do cabeçalho (ver _metric_converters);
+    se algum valor não for numérico, a linha usa a conversão genérica.
+    extra_fields (valores constantes) são incluídos em cada linha.
+    
+    Percorre a mensagem protobuf crua (response._pb): o proto-plus cria um
+    wrapper a cada acesso a row.dimension_values[i], o que domina o custo em
+    relatórios grandes. Cada linha é montada pelo parser especializado das
+    colunas do relatório (ver _row_parser).
+    """
+    response_pb = getattr(response, "_pb", response)
+    converters = _metric_converters(response_pb, metrics)
+    
+    def fallback(row):
+        # Algum valor não numérico: conversão genérica da linha inteira
+        row_data = dict(zip(dimensions, (dim_value.value for dim_value in row.dimension_values)))
+        for metric_name, metric_value in zip(metrics, row.metric_values):
+            row_data[metric_name] = _convert_metric_value(metric_value.value)
+        return row_data
+    
+    parse = _row_parser(tuple(dimensions), tuple(metrics))
+    return parse(response_pb.rows, converters[:len(metrics)], extra_fields or {}, fallback)
+
+
+def _parse_report_response(
+    response,
+    dimensions: List[str],
+    metrics: List[str]
+) -> List[Dict[str, Any]]:
+    """Converte as linhas de um RunReportResponse em uma lista de dicionários."""
+    return list(_iter_response_rows(response, dimensions, metrics))
+
+
+def _iter_ga4_pages(
+    ga4_client,
+    property_id: str,
+    dimensions: List[str],
+    metrics: List[str],
+    start_date: str,
+    end_date: str,
+    page_size: int = GA4_PAGE_SIZE,
+    offset: int = 0
+) -> Iterator[Any]:
+    """
+    Executa um relatório no GA4 e produz as respostas (RunReportResponse)
+    página a página, sem cache.
+    
+    Busca páginas de `page_size` linhas (limit/offset) até atingir o row_count
+    informado pelo GA4; cada página só é pedida quando a anterior é consumida.
+    """
+    property_id = _normalize_property_id(property_id)
+    
+    while True:
+        # Construir request
+        request = _build_report_request(
+            property_id, dimensions, metrics, start_date, end_date,
+            limit=page_size, offset=offset
+        )
+        
+        # Executar
+        try:
+            response = ga4_client.run_report(request)
+        except Exception as e:
+            logger.error("Erro ao executar relatório (offset %s): %s", offset, e)
+            raise
+        
+        yield response
+        
+        fetched = offset + len(response.rows)
+        if not response.rows or fetched >= response.row_count:
+            break
+        
+        logger.info("  Página lida: %s/%s linhas (row_count do GA4)", fetched, response.row_count)
+        offset = fetched
+
+
+def _iter_ga4_rows(
+    ga4_client,
+    property_id: str,
+    dimensions: List[str],
+    metrics: List[str],
+    start_date: str,
+    end_date: str,
+    page_size: int = GA4_PAGE_SIZE,
+    offset: int = 0,
+    extra_fields: Optional[Dict[str, Any]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Executa um relatório no GA4 e produz as linhas uma a uma, sem cache
+    (páginas buscadas sob demanda, ver _iter_ga4_pages).
+    """
+    logger.info("Executando relatório GA4 para %s", _normalize_property_id(property_id))
+    logger.info("  Período: %s a %s", start_date, end_date)
+    logger.info("  Dimensões: %s", dimensions)
+    logger.info("  Métricas: %s", metrics)
+    
+    for response in _iter_ga4_pages(
+        ga4_client, property_id, dimensions, metrics, start_date, end_date,
+        page_size=page_size, offset=offset
+    ):
+        yield from _iter_response_rows(response, dimensions, metrics, extra_fields)
+
+
 def run_ga4_report(
     ga4_client,
     property_id: str,
     dimensions: List[str],
     metrics: List[str],
     start_date: str,
-    end_date: str
+    end_date: str,
+    bypass_cache: bool = False,
+    page_size: int = GA4_PAGE_SIZE,
+    cache_dir: Optional[str] = None,
+    extra_fields: Optional[Dict[str, Any]] = None
 ) -> List[Dict[str, Any]]:
     """
-    Executa um relatório no GA4.
+    Executa um relatório no GA4, paginando de `page_size` em `page_size` linhas.
+    
+    Resultados ficam em cache por GA4_CACHE_TTL segundos (padrão: 300) e,
+    com cache_dir (ou GA4_CACHE_DIR), em arquivos Parquet sem expiração.
+    Com GA4_REPLAY=1, o relatório precisa estar em cache (sem chamar a API).
     
     Args:
         ga4_client: Cliente do GA4 (obtido via auth.get_ga4_client)
@@ -168,69 +627,406 @@ def run_ga4_report(
         metrics: Lista de métricas
         start_date: Data de início (YYYY-MM-DD)
         end_date: Data de fim (YYYY-MM-DD)
+        bypass_cache: Se True, ignora o cache e consulta a API (ex.: refresh manual)
+        page_size: Linhas por página
+        cache_dir: Diretório do cache em disco (padrão: GA4_CACHE_DIR)
+        extra_fields: Campos constantes incluídos em cada linha retornada
+            (o cache guarda as linhas sem eles)
         
     Returns:
         Lista de dicionários com os dados
+        
+    Raises:
+        LookupError: Em modo replay, se o relatório não estiver em cache
     """
-    from google.analytics.data_v1beta.types import (
-        RunReportRequest,
-        Dimension,
-        Metric,
-        DateRange
-    )
+    property_id = _normalize_property_id(property_id)
+    replay = _is_replay()
     
-    # Garantir formato correto do property_id
-    if not property_id.startswith("properties/"):
-        property_id = f"properties/{property_id}"
+    cache_key = (property_id, tuple(dimensions), tuple(metrics), start_date, end_date)
+    if not bypass_cache or replay:
+        cached_rows = _cache_lookup(cache_key, cache_dir, extra_fields)
+        if cached_rows is not None:
+            logger.info("Relatório GA4 em cache para %s (%s linhas)", property_id, len(cached_rows))
+            return cached_rows
+        if replay:
+            raise _replay_miss(cache_key)
+    
+    rows = list(_iter_ga4_rows(
+        ga4_client, property_id, dimensions, metrics, start_date, end_date, page_size=page_size
+    ))
+    
+    logger.info("  ✓ %s linhas retornadas", len(rows))
     
-    logger.info(f"Executando relatório GA4 para {property_id}")
-    logger.info(f"  Período: {start_date} a {end_date}")
-    logger.info(f"  Dimensões: {dimensions}")
-    logger.info(f"  Métricas: {metrics}")
+    return _cache_store(cache_key, rows, cache_dir, extra_fields)
+
+
+def _batch_run_reports(
+    ga4_client,
+    property_id: str,
+    configs: List[ReportConfig],
+    start_date: str,
+    end_date: str
+) -> List[Any]:
+    """
+    Executa os relatórios em uma chamada batchRunReports e retorna as
+    respostas (primeira página de cada uma), na ordem de configs.
     
-    # Construir request
-    request = RunReportRequest(
+    Raises:
+        ValueError: Se a API devolver um número de relatórios diferente do
+            pedido (o chamador recorre às chamadas individuais)
+    """
+    request = _ga4_types().BatchRunReportsRequest(
         property=property_id,
-        dimensions=[Dimension(name=d) for d in dimensions],
-        metrics=[Metric(name=m) for m in metrics],
-        date_ranges=[DateRange(start_date=start_date, end_date=end_date)],
-        limit=100000
+        requests=[
+            _build_report_request(None, config.dimensions, config.metrics, start_date, end_date)
+            for config in configs
+        ]
     )
     
-    # Executar
     try:
-        response = ga4_client.run_report(request)
+        response = ga4_client.batch_run_reports(request)
     except Exception as e:
-        logger.error(f"Erro ao executar relatório: {e}")
+        logger.error("Erro ao executar lote de relatórios: %s", e)
         raise
     
-    # Processar resposta
-    rows = []
+    if len(response.reports) != len(configs):
+        raise ValueError(
+            f"batchRunReports devolveu {len(response.reports)} relatórios "
+            f"para {len(configs)} requests"
+        )
+    return list(response.reports)
+
+
+def run_ga4_report_batch(
+    ga4_client,
+    property_id: str,
+    configs: List[ReportConfig],
+    start_date: str,
+    end_date: str,
+    bypass_cache: bool = False,
+    cache_dir: Optional[str] = None,
+    extra_fields: Optional[Dict[str, Any]] = None
+) -> List[List[Dict[str, Any]]]:
+    """
+    Executa até GA4_BATCH_SIZE relatórios da mesma propriedade em uma única
+    chamada batchRunReports.
+    
+    Relatórios já em cache não são enviados; se todos estiverem em cache,
+    nenhuma chamada é feita. O lote traz a primeira página de cada relatório;
+    as demais são buscadas com run_report (limit/offset).
     
-    for row in response.rows:
-        row_data = {}
+    Args:
+        ga4_client: Cliente do GA4
+        property_id: ID da propriedade GA4
+        configs: Configurações dos relatórios (no máximo GA4_BATCH_SIZE)
+        start_date: Data de início (YYYY-MM-DD)
+        end_date: Data de fim (YYYY-MM-DD)
+        bypass_cache: Se True, ignora o cache e consulta a API
+        cache_dir: Diretório do cache em disco (padrão: GA4_CACHE_DIR)
+        extra_fields: Campos constantes incluídos em cada linha retornada
         
-        # Adicionar dimensões
-        for i, dim_value in enumerate(row.dimension_values):
-            dim_name = dimensions[i]
-            row_data[dim_name] = dim_value.value
+    Returns:
+        Linhas de cada relatório, na mesma ordem de configs
         
-        # Adicionar métricas
-        for i, metric_value in enumerate(row.metric_values):
-            metric_name = metrics[i]
-            # Converter para número se possível
-            try:
-                if "." in metric_value.value:
-                    row_data[metric_name] = float(metric_value.value)
-                else:
-                    row_data[metric_name] = int(metric_value.value)
-            except ValueError:
-                row_data[metric_name] = metric_value.value
+    Raises:
+        LookupError: Em modo replay, se algum relatório não estiver em cache
+    """
+    if len(configs) > GA4_BATCH_SIZE:
+        raise ValueError(f"batchRunReports aceita no máximo {GA4_BATCH_SIZE} relatórios")
+    
+    property_id = _normalize_property_id(property_id)
+    
+    cache_keys = [
+        (property_id, config.dimensions, config.metrics, start_date, end_date)
+        for config in configs
+    ]
+    replay = _is_replay()
+    results: List[Optional[List[Dict[str, Any]]]] = [
+        _cache_lookup(key, cache_dir, extra_fields) if not bypass_cache or replay else None
+        for key in cache_keys
+    ]
+    pending = [i for i, rows in enumerate(results) if rows is None]
+    if pending and replay:
+        raise _replay_miss(cache_keys[pending[0]])
+    
+    if pending:
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Executando %s relatórios GA4 em lote para %s", len(pending), property_id)
+            logger.info("  Período: %s a %s", start_date, end_date)
+            logger.info("  Relatórios: %s", [configs[i].table_name for i in pending])
+        
+        reports = _batch_run_reports(
+            ga4_client, property_id, [configs[i] for i in pending], start_date, end_date
+        )
+        for i, report in zip(pending, reports):
+            rows = _parse_report_response(report, configs[i].dimensions, configs[i].metrics)
+            if rows and len(rows) < report.row_count:
+                rows.extend(_iter_ga4_rows(
+                    ga4_client, property_id, configs[i].dimensions, configs[i].metrics,
+                    start_date, end_date, offset=len(rows)
+                ))
+            logger.info("  ✓ %s: %s linhas retornadas", configs[i].table_name, len(rows))
+            results[i] = _cache_store(cache_keys[i], rows, cache_dir, extra_fields)
+    
+    return results
+
+
+def _arrow_metric_column(values: List[str], header_type: Optional[int]):
+    """
+    Converte os valores (texto) de uma métrica em coluna pyarrow tipada.
+    
+    A conversão é feita pelo pyarrow (cast de string), sem int()/float() por
+    valor: int64 para TYPE_INTEGER, float64 para os demais tipos numéricos.
+    Tipo desconhecido tenta int64, depois float64 e, por fim, mantém texto.
+    """
+    import pyarrow as pa
+    
+    MetricType = _ga4_types().MetricType
+    if header_type in (None, MetricType.TYPE_INTEGER, MetricType.METRIC_TYPE_UNSPECIFIED):
+        candidates = (pa.int64(), pa.float64())
+    else:
+        candidates = (pa.float64(),)
+    
+    array = pa.array(values, type=pa.string())
+    for arrow_type in candidates:
+        try:
+            return array.cast(arrow_type)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+            continue
+    return array
+
+
+def _arrow_report_table(
+    responses: Iterable[Any],
+    dimensions: List[str],
+    metrics: List[str],
+    extra_fields: Optional[Dict[str, Any]] = None
+):
+    """
+    Monta a pyarrow.Table de um relatório a partir das páginas da resposta,
+    sem criar um dicionário por linha.
+    
+    Cada página é lida da mensagem protobuf crua direto para uma lista por
+    coluna; as métricas são tipadas uma única vez, no final (ver
+    _arrow_metric_column). extra_fields viram colunas constantes.
+    """
+    import pyarrow as pa
+    
+    dim_cols = [[] for _ in dimensions]
+    met_cols = [[] for _ in metrics]
+    met_types: Optional[List[Optional[int]]] = None
+    
+    for response in responses:
+        response_pb = getattr(response, "_pb", response)
+        if met_types is None:
+            met_types = [header.type_ for header in response_pb.metric_headers[:len(metrics)]]
+        for row in response_pb.rows:
+            for column, dim_value in zip(dim_cols, row.dimension_values):
+                column.append(dim_value.value)
+            for column, metric_value in zip(met_cols, row.metric_values):
+                column.append(metric_value.value)
+    
+    met_types = (met_types or []) + [None] * (len(metrics) - len(met_types or []))
+    columns = {name: pa.array(values, type=pa.string()) for name, values in zip(dimensions, dim_cols)}
+    for name, values, header_type in zip(metrics, met_cols, met_types):
+        columns[name] = _arrow_metric_column(values, header_type)
+    
+    num_rows = len(dim_cols[0]) if dim_cols else len(met_cols[0]) if met_cols else 0
+    for name, value in (extra_fields or {}).items():
+        columns[name] = pa.repeat(pa.scalar(value), num_rows)
+    
+    return pa.table(columns)
+
+
+def run_ga4_report_arrow(
+    ga4_client,
+    property_id: str,
+    dimensions: List[str],
+    metrics: List[str],
+    start_date: str,
+    end_date: str,
+    page_size: int = GA4_PAGE_SIZE,
+    extra_fields: Optional[Dict[str, Any]] = None
+):
+    """
+    Executa um relatório no GA4 e retorna as linhas em formato colunar
+    (pyarrow.Table), sem criar um dicionário por linha. Não usa o cache.
+    Requer pyarrow.
+    
+    Args:
+        ga4_client: Cliente do GA4
+        property_id: ID da propriedade
+        dimensions: Lista de dimensões
+        metrics: Lista de métricas
+        start_date: Data de início (YYYY-MM-DD)
+        end_date: Data de fim (YYYY-MM-DD)
+        page_size: Linhas por página (limit da API)
+        extra_fields: Colunas constantes (ex.: property_id)
         
-        rows.append(row_data)
+    Returns:
+        pyarrow.Table com as dimensões (texto), as métricas tipadas e extra_fields
+    """
+    logger.info("Executando relatório GA4 (colunar) para %s", _normalize_property_id(property_id))
+    
+    table = _arrow_report_table(
+        _iter_ga4_pages(
+            ga4_client, property_id, dimensions, metrics, start_date, end_date, page_size=page_size
+        ),
+        dimensions, metrics, extra_fields
+    )
+    
+    logger.info("  ✓ %s linhas retornadas (colunar)", table.num_rows)
+    return table
+
+
+def run_ga4_report_batch_arrow(
+    ga4_client,
+    property_id: str,
+    configs: List[ReportConfig],
+    start_date: str,
+    end_date: str,
+    extra_fields: Optional[Dict[str, Any]] = None
+) -> List[Any]:
+    """
+    Versão colunar de run_ga4_report_batch: uma chamada batchRunReports e uma
+    pyarrow.Table por relatório, na ordem de configs. Não usa o cache.
+    
+    Returns:
+        pyarrow.Table de cada relatório
+    """
+    if len(configs) > GA4_BATCH_SIZE:
+        raise ValueError(f"batchRunReports aceita no máximo {GA4_BATCH_SIZE} relatórios")
+    
+    property_id = _normalize_property_id(property_id)
+    logger.info("Executando %s relatórios GA4 em lote (colunar) para %s", len(configs), property_id)
+    
+    reports = _batch_run_reports(ga4_client, property_id, configs, start_date, end_date)
     
-    logger.info(f"  ✓ {len(rows)} linhas retornadas")
-    return rows
+    tables = []
+    for config, report in zip(configs, reports):
+        pages: Iterable[Any] = [report]
+        if report.rows and len(report.rows) < report.row_count:
+            pages = chain(pages, _iter_ga4_pages(
+                ga4_client, property_id, config.dimensions, config.metrics,
+                start_date, end_date, offset=len(report.rows)
+            ))
+        table = _arrow_report_table(pages, config.dimensions, config.metrics, extra_fields)
+        logger.info("  ✓ %s: %s linhas retornadas (colunar)", config.table_name, table.num_rows)
+        tables.append(table)
+    
+    return tables
+
+
+def _pyarrow_available() -> bool:
+    """Indica se o pyarrow está instalado (necessário para a extração colunar)."""
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _build_report(
+    report_key: str,
+    config: ReportConfig,
+    rows: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Monta o resultado do relatório (linhas já com property_id e extraction_timestamp)."""
+    return {
+        "report_key": report_key,
+        "report_name": config.name,
+        "table_name": config.table_name,
+        "rows_count": len(rows),
+        "data": rows
+    }
+
+
+def _build_arrow_report(report_key: str, config: ReportConfig, table) -> Dict[str, Any]:
+    """Como _build_report, com as linhas em "table" (pyarrow.Table) em vez de "data"."""
+    return {
+        "report_key": report_key,
+        "report_name": config.name,
+        "table_name": config.table_name,
+        "rows_count": table.num_rows,
+        "table": table
+    }
+
+
+def _extraction_fields(property_id: str) -> Dict[str, Any]:
+    """Campos de metadados incluídos em cada linha extraída (property_id e extraction_timestamp)."""
+    return {
+        "property_id": property_id.replace("properties/", ""),
+        "extraction_timestamp": datetime.now().isoformat()
+    }
+
+
+def _iter_report(
+    reports: Dict[str, ReportConfig],
+    ga4_client,
+    property_id: str,
+    report_key: str,
+    start_date: str,
+    end_date: str
+) -> Iterator[Dict[str, Any]]:
+    """Produz as linhas anotadas de um relatório de `reports` (sem cache)."""
+    config = reports[report_key]
+    logger.info("Extraindo (streaming): %s", config.name)
+    return _iter_ga4_rows(
+        ga4_client, property_id, config.dimensions, config.metrics, start_date, end_date,
+        extra_fields=_extraction_fields(property_id)
+    )
+
+
+def iter_dimension_report(
+    ga4_client,
+    property_id: str,
+    report_key: str,
+    start_date: str,
+    end_date: str
+) -> Iterator[Dict[str, Any]]:
+    """
+    Versão em streaming de extract_dimension_report: produz as linhas, já com
+    property_id e extraction_timestamp, sem montar a lista do relatório.
+    
+    Para gravar no BigQuery, consuma o iterador em blocos (ex.: 500 linhas por
+    chamada a bigquery.insert_rows) em vez de materializar todas as linhas.
+    
+    Args:
+        ga4_client: Cliente do GA4
+        property_id: ID da propriedade
+        report_key: Chave do relatório (ex: "USUARIO", "GEOGRAFICA")
+        start_date: Data de início
+        end_date: Data de fim
+        
+    Returns:
+        Iterador de linhas do relatório
+    """
+    if report_key not in DIMENSION_REPORTS:
+        raise ValueError(f"Relatório de dimensão não encontrado: {report_key}")
+    
+    return _iter_report(DIMENSION_REPORTS, ga4_client, property_id, report_key, start_date, end_date)
+
+
+def iter_metric_report(
+    ga4_client,
+    property_id: str,
+    report_key: str,
+    start_date: str,
+    end_date: str
+) -> Iterator[Dict[str, Any]]:
+    """
+    Versão em streaming de extract_metric_report (ver iter_dimension_report).
+    
+    Args:
+        ga4_client: Cliente do GA4
+        property_id: ID da propriedade
+        report_key: Chave do relatório (ex: "USUARIOS", "SESSAO")
+        start_date: Data de início
+        end_date: Data de fim
+        
+    Returns:
+        Iterador de linhas do relatório
+    """
+    if report_key not in METRIC_REPORTS:
+        raise ValueError(f"Relatório de métrica não encontrado: {report_key}")
+    
+    return _iter_report(METRIC_REPORTS, ga4_client, property_id, report_key, start_date, end_date)
 
 
 def extract_dimension_report(
@@ -258,7 +1054,7 @@ def extract_dimension_report(
     
     config = DIMENSION_REPORTS[report_key]
     
-    logger.info(f"Extraindo: {config.name}")
+    logger.info("Extraindo: %s", config.name)
     
     rows = run_ga4_report(
         ga4_client=ga4_client,
@@ -266,22 +1062,11 @@ def extract_dimension_report(
         dimensions=config.dimensions,
         metrics=config.metrics,
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        extra_fields=_extraction_fields(property_id)
     )
     
-    # Adicionar metadados
-    extraction_time = datetime.now().isoformat()
-    for row in rows:
-        row["property_id"] = property_id.replace("properties/", "")
-        row["extraction_timestamp"] = extraction_time
-    
-    return {
-        "report_key": report_key,
-        "report_name": config.name,
-        "table_name": config.table_name,
-        "rows_count": len(rows),
-        "data": rows
-    }
+    return _build_report(report_key, config, rows)
 
 
 def extract_metric_report(
@@ -309,7 +1094,7 @@ def extract_metric_report(
     
     config = METRIC_REPORTS[report_key]
     
-    logger.info(f"Extraindo: {config.name}")
+    logger.info("Extraindo: %s", config.name)
     
     rows = run_ga4_report(
         ga4_client=ga4_client,
@@ -317,38 +1102,176 @@ def extract_metric_report(
         dimensions=config.dimensions,
         metrics=config.metrics,
         start_date=start_date,
-        end_date=end_date
+        end_date=end_date,
+        extra_fields=_extraction_fields(property_id)
     )
     
-    # Adicionar metadados
-    extraction_time = datetime.now().isoformat()
-    for row in rows:
-        row["property_id"] = property_id.replace("properties/", "")
-        row["extraction_timestamp"] = extraction_time
+    return _build_report(report_key, config, rows)
+
+
+def _merge_report_tasks(tasks: List[tuple]) -> List[Tuple[ReportConfig, List[tuple]]]:
+    """
+    Agrupa relatórios (categoria, chave, ReportConfig) com exatamente as
+    mesmas dimensões em um único request, com a união das métricas (até
+    GA4_MAX_METRICS; first-fit, na ordem de configuração).
+    
+    Só dimensões idênticas são agrupadas: cada linha do request combinado
+    corresponde a uma linha de cada relatório, sem reagregação (somar
+    métricas ao descartar dimensões seria incorreto para usuários e razões).
     
-    return {
-        "report_key": report_key,
-        "report_name": config.name,
-        "table_name": config.table_name,
-        "rows_count": len(rows),
-        "data": rows
-    }
+    Returns:
+        Lista de (ReportConfig do request, relatórios atendidos por ele)
+    """
+    groups: List[list] = []
+    for task in tasks:
+        config = task[2]
+        for group in groups:
+            if group[0] != config.dimensions:
+                continue
+            union = group[1] + tuple(m for m in config.metrics if m not in group[1])
+            if len(union) <= GA4_MAX_METRICS:
+                group[1] = union
+                group[2].append(task)
+                break
+        else:
+            groups.append([config.dimensions, config.metrics, [task]])
+    
+    units = []
+    for dimensions, metrics, members in groups:
+        if len(members) == 1:
+            units.append((members[0][2], members))
+            continue
+        merged = ReportConfig(
+            name=" + ".join(config.name for _, _, config in members),
+            table_name=" + ".join(config.table_name for _, _, config in members),
+            dimensions=dimensions,
+            metrics=metrics
+        )
+        units.append((merged, members))
+    return units
+
+
+def _project_rows(
+    rows: List[Dict[str, Any]],
+    config: ReportConfig,
+    extra_fields: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Extrai de um request combinado as colunas de um relatório.
+    
+    Linhas com todas as métricas do relatório zeradas são descartadas, como
+    o GA4 faria no request individual.
+    """
+    columns = config.dimensions + config.metrics + tuple(extra_fields)
+    return [
+        {column: row[column] for column in columns}
+        for row in rows
+        if any(row[metric] for metric in config.metrics)
+    ]
+
+
+def _project_table(table, config: ReportConfig, extra_fields: Dict[str, Any]):
+    """Versão colunar de _project_rows (mesmo descarte de linhas zeradas)."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    
+    keep = None
+    for metric in config.metrics:
+        column = table.column(metric)
+        nonzero = pc.not_equal(column, "" if pa.types.is_string(column.type) else 0)
+        keep = nonzero if keep is None else pc.or_(keep, nonzero)
+    
+    projected = table.select(list(config.dimensions + config.metrics + tuple(extra_fields)))
+    return projected.filter(keep) if keep is not None else projected
+
+
+def _extract_report_batch(
+    ga4_client,
+    property_id: str,
+    units: List[Tuple[ReportConfig, List[tuple]]],
+    start_date: str,
+    end_date: str,
+    columnar: bool = False
+) -> List[tuple]:
+    """
+    Extrai um lote de requests via batchRunReports. Cada request (ReportConfig)
+    atende um ou mais relatórios (categoria, chave, ReportConfig); ver
+    _merge_report_tasks.
+    
+    Se o lote falhar (ex.: um relatório inválido invalida o lote inteiro), cada
+    request é executado individualmente, para que os demais não sejam perdidos.
+    Com columnar, os relatórios trazem pyarrow.Table em "table" (sem cache).
+    
+    Returns:
+        Lista de (categoria, chave, resultado do relatório ou exceção)
+    """
+    if columnar:
+        run_batch, run_single = run_ga4_report_batch_arrow, run_ga4_report_arrow
+        project, build = _project_table, _build_arrow_report
+    else:
+        run_batch, run_single = run_ga4_report_batch, run_ga4_report
+        project, build = _project_rows, _build_report
+    
+    extra_fields = _extraction_fields(property_id)
+    try:
+        batch_rows = run_batch(
+            ga4_client, property_id, [config for config, _ in units], start_date, end_date,
+            extra_fields=extra_fields
+        )
+    except Exception as e:
+        logger.warning(
+            "Lote %s falhou (%s); executando individualmente",
+            [key for _, members in units for _, key, _ in members], e
+        )
+        batch_rows = None
+    
+    outcomes = []
+    for i, (config, members) in enumerate(units):
+        try:
+            rows = batch_rows[i] if batch_rows is not None else run_single(
+                ga4_client, property_id, config.dimensions, config.metrics, start_date, end_date,
+                extra_fields=extra_fields
+            )
+            if len(members) == 1:
+                category, key, member_config = members[0]
+                unit_outcomes = [(category, key, build(key, member_config, rows))]
+            else:
+                unit_outcomes = [
+                    (category, key, build(
+                        key, member_config, project(rows, member_config, extra_fields)
+                    ))
+                    for category, key, member_config in members
+                ]
+        except Exception as e:
+            outcomes.extend((category, key, e) for category, key, _ in members)
+            continue
+        outcomes.extend(unit_outcomes)
+    return outcomes
 
 
 def extract_all_reports(
     ga4_client,
     property_id: str,
     start_date: str = None,
-    end_date: str = None
+    end_date: str = None,
+    max_workers: int = GA4_MAX_WORKERS,
+    columnar: bool = False
 ) -> Dict[str, Any]:
     """
-    Extrai todos os relatórios configurados.
+    Extrai todos os relatórios configurados, em lotes batchRunReports
+    (até GA4_BATCH_SIZE relatórios por chamada) executados em paralelo.
     
     Args:
         ga4_client: Cliente do GA4
         property_id: ID da propriedade
         start_date: Data de início (opcional, usa D-1 se não fornecido)
         end_date: Data de fim (opcional, usa D-1 se não fornecido)
+        max_workers: Número máximo de lotes extraídos simultaneamente
+        columnar: Se True, cada relatório traz as linhas em "table"
+            (pyarrow.Table montada direto das respostas do GA4, sem um dict
+            por linha nem cache) em vez de "data"; para carregar, ver
+            bigquery.load_arrow_report_to_bigquery. Ignorado sem pyarrow e
+            em modo replay (GA4_REPLAY), que depende do cache
         
     Returns:
         Dicionário com todos os relatórios extraídos
@@ -357,11 +1280,16 @@ def extract_all_reports(
     if not start_date or not end_date:
         start_date, end_date = get_date_range()
     
-    logger.info("=" * 50)
-    logger.info("EXTRAINDO TODOS OS RELATÓRIOS GA4")
-    logger.info(f"Property: {property_id}")
-    logger.info(f"Período: {start_date} a {end_date}")
-    logger.info("=" * 50)
+    if columnar and (_is_replay() or not _pyarrow_available()):
+        logger.warning("Extração colunar indisponível (replay ou sem pyarrow); usando linhas")
+        columnar = False
+    
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(_BANNER)
+        logger.info("EXTRAINDO TODOS OS RELATÓRIOS GA4")
+        logger.info("Property: %s", property_id)
+        logger.info("Período: %s a %s", start_date, end_date)
+        logger.info(_BANNER)
     
     results = {
         "property_id": property_id,
@@ -376,57 +1304,157 @@ def extract_all_reports(
         }
     }
     
-    # Extrair relatórios de dimensão
-    for key in DIMENSION_REPORTS:
-        try:
-            report = extract_dimension_report(
-                ga4_client, property_id, key, start_date, end_date
-            )
-            results["dimensions"][key] = report
-            results["summary"]["successful"] += 1
-            results["summary"]["total_rows"] += report["rows_count"]
-        except Exception as e:
-            logger.error(f"Erro ao extrair {key}: {e}")
-            results["dimensions"][key] = {"error": str(e)}
-            results["summary"]["failed"] += 1
-        
-        results["summary"]["total_reports"] += 1
+    # 12 relatórios -> 3 chamadas (5 + 5 + 2); com GA4_DEDUP_REQUESTS, os 5
+    # relatórios de métricas (só "date") viram 3 requests -> 2 chamadas (5 + 5)
+    units = _REPORT_UNITS
+    batches = [units[i:i + GA4_BATCH_SIZE] for i in range(0, len(units), GA4_BATCH_SIZE)]
     
-    # Extrair relatórios de métrica
-    for key in METRIC_REPORTS:
-        try:
-            report = extract_metric_report(
-                ga4_client, property_id, key, start_date, end_date
-            )
-            results["metrics"][key] = report
-            results["summary"]["successful"] += 1
-            results["summary"]["total_rows"] += report["rows_count"]
-        except Exception as e:
-            logger.error(f"Erro ao extrair {key}: {e}")
-            results["metrics"][key] = {"error": str(e)}
-            results["summary"]["failed"] += 1
+    # Cada lote fica bloqueado em I/O da API do GA4; executa em paralelo.
+    # Os resultados são gravados apenas nesta thread, ao consumir os futures.
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(
+                _extract_report_batch, ga4_client, property_id, batch, start_date, end_date, columnar
+            ): batch
+            for batch in batches
+        }
         
-        results["summary"]["total_reports"] += 1
+        for future in as_completed(futures):
+            try:
+                outcomes = future.result()
+            except Exception as e:
+                # Falha inesperada do lote: cada relatório dele vira um erro
+                outcomes = [
+                    (category, key, e)
+                    for _, members in futures[future]
+                    for category, key, _ in members
+                ]
+            
+            for category, key, outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    logger.error("Erro ao extrair %s: %s", key, outcome)
+                    results[category][key] = {"error": str(outcome)}
+                    results["summary"]["failed"] += 1
+                else:
+                    results[category][key] = outcome
+                    results["summary"]["successful"] += 1
+                    results["summary"]["total_rows"] += outcome["rows_count"]
+                
+                results["summary"]["total_reports"] += 1
     
-    logger.info("=" * 50)
-    logger.info("EXTRAÇÃO CONCLUÍDA")
-    logger.info(f"Relatórios: {results['summary']['successful']}/{results['summary']['total_reports']}")
-    logger.info(f"Total de linhas: {results['summary']['total_rows']}")
-    logger.info("=" * 50)
+    # Mantém a ordem de configuração dos relatórios na resposta
+    results["dimensions"] = {
+        key: results["dimensions"][key] for key in DIMENSION_REPORTS if key in results["dimensions"]
+    }
+    results["metrics"] = {
+        key: results["metrics"][key] for key in METRIC_REPORTS if key in results["metrics"]
+    }
+    
+    if logger.isEnabledFor(logging.INFO):
+        summary = results["summary"]
+        logger.info(_BANNER)
+        logger.info("EXTRAÇÃO CONCLUÍDA")
+        logger.info("Relatórios: %s/%s", summary["successful"], summary["total_reports"])
+        logger.info("Total de linhas: %s", summary["total_rows"])
+        logger.info(_BANNER)
     
     return results
 
 
-def list_available_reports() -> Dict[str, List[str]]:
+def _ndjson_line(obj: Dict[str, Any]) -> bytes:
+    """Serializa um objeto como uma linha NDJSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, default=str, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def stream_all_reports(
+    ga4_client,
+    property_id: str,
+    start_date: str = None,
+    end_date: str = None
+) -> Iterator[bytes]:
+    """
+    Versão em streaming de extract_all_reports, em NDJSON (um objeto por linha).
+    
+    Os relatórios são extraídos um a um, página a página, e cada linha é
+    emitida assim que lida: a memória usada não depende do total de linhas.
+    Sequência de objetos (campo "type"):
+    
+        header       - property_id e período
+        report_meta  - início de um relatório (chave, tabela, dimensões, métricas)
+        row          - uma linha do relatório ("data")
+        report_end   - fim do relatório, com rows_count
+        error        - falha no relatório; a extração segue para o próximo
+        summary      - totais, como em extract_all_reports
+    
+    Args:
+        ga4_client: Cliente do GA4
+        property_id: ID da propriedade
+        start_date: Data de início (opcional, usa D-1 se não fornecido)
+        end_date: Data de fim (opcional, usa D-1 se não fornecido)
+        
+    Returns:
+        Iterador de linhas NDJSON (bytes terminados em \\n)
+    """
+    if not start_date or not end_date:
+        start_date, end_date = get_date_range()
+    
+    summary = {"total_reports": 0, "successful": 0, "failed": 0, "total_rows": 0}
+    yield _ndjson_line({
+        "type": "header",
+        "property_id": property_id,
+        "period": {"start": start_date, "end": end_date}
+    })
+    
+    for category, reports in (("dimensions", DIMENSION_REPORTS), ("metrics", METRIC_REPORTS)):
+        for key, config in reports.items():
+            summary["total_reports"] += 1
+            yield _ndjson_line({
+                "type": "report_meta",
+                "category": category,
+                "report_key": key,
+                "report_name": config.name,
+                "table_name": config.table_name,
+                "dimensions": config.dimensions,
+                "metrics": config.metrics
+            })
+            
+            rows_count = 0
+            try:
+                for row in _iter_report(reports, ga4_client, property_id, key, start_date, end_date):
+                    yield _ndjson_line({"type": "row", "report_key": key, "data": row})
+                    rows_count += 1
+            except Exception as e:
+                logger.error("Erro ao extrair %s: %s", key, e)
+                summary["failed"] += 1
+                yield _ndjson_line({"type": "error", "report_key": key, "message": str(e)})
+                continue
+            
+            summary["successful"] += 1
+            summary["total_rows"] += rows_count
+            yield _ndjson_line({"type": "report_end", "report_key": key, "rows_count": rows_count})
+    
+    logger.info("Streaming concluído: %s/%s relatórios, %s linhas",
+                summary["successful"], summary["total_reports"], summary["total_rows"])
+    yield _ndjson_line({"type": "summary", **summary})
+
+
+@lru_cache(maxsize=1)
+def list_available_reports() -> Mapping[str, Any]:
     """
     Lista todos os relatórios disponíveis.
     
+    Os relatórios são estáticos: o resultado é montado uma única vez e
+    devolvido como mapeamento somente leitura (as estatísticas do cache
+    ficam em get_report_cache_stats).
+    
     Returns:
-        Dicionário com listas de relatórios de dimensão e métrica
+        Mapeamento com listas de relatórios de dimensão e métrica
     """
-    return {
-        "dimensions": list(DIMENSION_REPORTS.keys()),
-        "metrics": list(METRIC_REPORTS.keys()),
+    return MappingProxyType({
+        "dimensions": tuple(DIMENSION_REPORTS.keys()),
+        "metrics": tuple(METRIC_REPORTS.keys()),
         "dimension_details": {
             k: {"name": v.name, "table": v.table_name, "description": v.description}
             for k, v in DIMENSION_REPORTS.items()
@@ -434,5 +1462,23 @@ def list_available_reports() -> Dict[str, List[str]]:
         "metric_details": {
             k: {"name": v.name, "table": v.table_name, "description": v.description}
             for k, v in METRIC_REPORTS.items()
-        }
-    }
+        },
+    })
+
+
+# Relatórios de extract_all_reports (categoria, chave, config) e os requests
+# GA4 que os atendem, montados na importação
+_REPORT_TASKS = [
+    *(("dimensions", key, config) for key, config in DIMENSION_REPORTS.items()),
+    *(("metrics", key, config) for key, config in METRIC_REPORTS.items()),
+]
+_REPORT_UNITS = (
+    _merge_report_tasks(_REPORT_TASKS) if GA4_DEDUP_REQUESTS
+    else [(task[2], [task]) for task in _REPORT_TASKS]
+)
+
+# Parsers de linhas dos relatórios configurados (e dos requests combinados),
+# compilados na importação
+for _config in {task[2] for task in _REPORT_TASKS} | {config for config, _ in _REPORT_UNITS}:
+    _row_parser(_config.dimensions, _config.metrics)
+del _config
@@ -23,10 +23,44 @@ Para deploy no Cloud Run:
 
 import os
 import sys
+import gzip
+import json
 import logging
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Any, Optional
-from flask import Flask, request, jsonify
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from flask import Flask, Response, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+
+# Importados uma única vez na carga do módulo (auth primeiro). As bibliotecas
+# google pesadas continuam sendo carregadas no primeiro uso, pelo warm-up
+from auth import initialize_all_clients, test_authentication
+from ga4 import (
+    DIMENSION_REPORTS,
+    METRIC_REPORTS,
+    extract_all_reports,
+    extract_dimension_report,
+    extract_metric_report,
+    get_date_range,
+    get_report_cache_stats,
+    list_available_reports,
+    stream_all_reports,
+)
+from bigquery import (
+    WRITE_MODES,
+    load_all_reports_to_bigquery,
+    load_report_to_bigquery,
+    stream_report_to_bigquery,
+)
+
+try:
+    import orjson
+except ImportError:  # opcional: sem ele, usa o json da stdlib
+    orjson = None
 
 # Configurar logging
 logging.basicConfig(
@@ -39,6 +73,50 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 
 
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON do Flask (jsonify, request.get_json) via orjson, mais rápido que o json da stdlib.
+    
+    Diferenças em relação ao DefaultJSONProvider:
+    - datetime e date saem em ISO 8601 (ex.: "2024-01-31T12:00:00+00:00"),
+      serializados nativamente pelo orjson, e não no formato HTTP-date do
+      Flask ("Wed, 31 Jan 2024 12:00:00 GMT");
+    - caracteres não ASCII saem em UTF-8, sem escape \\uXXXX.
+    sort_keys e o modo debug (indentação) continuam respeitados. Chamadas
+    com argumentos do json da stdlib (indent, separators...) usam o provider
+    padrão, que os entende.
+    
+    Cada serviço é uma imagem Docker construída só com o próprio diretório,
+    por isso a classe é mantida em cópia no main.py de cada API.
+    """
+    
+    def _options(self) -> int:
+        return orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if self.sort_keys else 0)
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode("utf-8")
+    
+    def loads(self, s, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Bytes direto para a resposta, sem passar por str
+        obj = self._prepare_response_obj(args, kwargs)
+        options = self._options() | orjson.OPT_APPEND_NEWLINE
+        if self.compact is False or (self.compact is None and self._app.debug):
+            options |= orjson.OPT_INDENT_2
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=options), mimetype=self.mimetype
+        )
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+
 # =============================================================================
 # CONFIGURAÇÕES
 # =============================================================================
@@ -49,17 +127,144 @@ class Config:
     DATASET_ID = os.environ.get("BQ_DATASET_ID", "RAW")
     CREDENTIALS_PATH = os.environ.get("GOOGLE_APPLICATION_CREDENTIALS", None)
     USE_SECRET_MANAGER = os.environ.get("USE_SECRET_MANAGER", "true").lower() == "true"
+    MAX_BATCH_SIZE = int(os.environ.get("MAX_BATCH_SIZE", "50"))
+    # Propriedades processadas em paralelo em /report/batch (cada uma ainda
+    # extrai seus relatórios com GA4_MAX_WORKERS threads)
+    BATCH_MAX_WORKERS = max(int(os.environ.get("BATCH_MAX_WORKERS", "4")), 1)
+    # Novas tentativas por propriedade em /report/batch após erros transitórios,
+    # com backoff exponencial (BATCH_RETRY_BACKOFF, 2x, 4x... segundos)
+    BATCH_MAX_RETRIES = max(int(os.environ.get("BATCH_MAX_RETRIES", "3")), 0)
+    BATCH_RETRY_BACKOFF = float(os.environ.get("BATCH_RETRY_BACKOFF", "2"))
+    # Linhas por requisição de streaming no BigQuery (recomendado 500; máximo 10000)
+    STREAMING_BATCH_SIZE = min(int(os.environ.get("STREAMING_BATCH_SIZE", "500")), 10000)
+    # Inicializa os clientes GCP ao subir o processo (canal gRPC do GA4 pronto
+    # antes da primeira requisição)
+    WARM_UP_CLIENTS = os.environ.get("WARM_UP_CLIENTS", "true").lower() == "true"
+    # Respostas JSON a partir deste tamanho (bytes) vão com gzip, se o cliente aceitar
+    GZIP_MIN_SIZE = int(os.environ.get("GZIP_MIN_SIZE", "1024"))
+
+
+def warm_up_clients() -> None:
+    """
+    Inicializa os clientes GCP compartilhados do processo.
+    
+    initialize_all_clients guarda os clientes por projeto e credenciais; todas
+    as requisições (e os threads de extração) reutilizam o mesmo cliente GA4
+    e, com ele, o mesmo canal gRPC.
+    """
+    try:
+        initialize_all_clients(
+            project_id=Config.PROJECT_ID,
+            credentials_path=Config.CREDENTIALS_PATH,
+            use_secret_manager=Config.USE_SECRET_MANAGER
+        )
+    except Exception as e:
+        logger.warning(f"Não foi possível inicializar os clientes na subida: {e}")
+
+
+# Em segundo plano, para não atrasar a subida do servidor
+if Config.WARM_UP_CLIENTS:
+    threading.Thread(target=warm_up_clients, name="warm-up-clients", daemon=True).start()
+
+
+# =============================================================================
+# VALIDAÇÃO DAS REQUISIÇÕES
+# =============================================================================
+
+class RequestError(ValueError):
+    """Body inválido; vira uma resposta 400 com a mensagem e os campos extras."""
+    
+    def __init__(self, message: str, **details: Any):
+        super().__init__(message)
+        self.details = details
+
+
+@dataclass(frozen=True, slots=True)
+class ExtractRequest:
+    """Body de /extract, /extract/stream, /extract/<tipo>/<key> e das entradas de /report/batch."""
+    property_id: str
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    load_to_bigquery: bool = True
+    write_mode: str = "auto"
+    skip_loaded: bool = False
+    
+    @classmethod
+    def from_json(cls, data: Any) -> "ExtractRequest":
+        """
+        Valida o body (já decodificado) em uma única passada.
+        
+        Raises:
+            RequestError: Campo obrigatório ausente ou com tipo/valor inválido
+        """
+        if not isinstance(data, dict):
+            raise RequestError("O body deve ser um objeto JSON")
+        
+        property_id = data.get("property_id")
+        if not property_id:
+            raise RequestError("property_id é obrigatório")
+        if not isinstance(property_id, (str, int)) or isinstance(property_id, bool):
+            raise RequestError("property_id deve ser texto ou número")
+        
+        start_date = data.get("start_date")
+        end_date = data.get("end_date")
+        for name, value in (("start_date", start_date), ("end_date", end_date)):
+            if value is not None and not isinstance(value, str):
+                raise RequestError(f"{name} deve ser texto (YYYY-MM-DD)")
+        
+        load_to_bigquery = data.get("load_to_bigquery", True)
+        if not isinstance(load_to_bigquery, bool):
+            raise RequestError("load_to_bigquery deve ser true ou false")
+        
+        write_mode = data.get("write_mode", "auto")
+        if write_mode not in WRITE_MODES:
+            raise RequestError(f"write_mode inválido: {write_mode}", available=list(WRITE_MODES))
+        
+        skip_loaded = data.get("skip_loaded", False)
+        if not isinstance(skip_loaded, bool):
+            raise RequestError("skip_loaded deve ser true ou false")
+        
+        return cls(str(property_id), start_date, end_date, load_to_bigquery, write_mode, skip_loaded)
+
+
+def _error_response(error: RequestError):
+    """Resposta 400 para um RequestError."""
+    return jsonify({"status": "error", "message": str(error), **error.details}), 400
 
 
 # =============================================================================
 # FUNÇÕES PRINCIPAIS
 # =============================================================================
 
+def _is_transient_error(error: Exception) -> bool:
+    """
+    Indica se vale repetir a operação: timeouts, conexão, 429/5xx e UNAVAILABLE.
+    
+    Erros determinísticos (validação, permissão, datas inválidas) retornam
+    False e não são repetidos.
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    try:
+        from google.api_core import exceptions as api_exceptions
+    except ImportError:
+        return False
+    return isinstance(error, (
+        api_exceptions.TooManyRequests,       # 429 / RESOURCE_EXHAUSTED
+        api_exceptions.InternalServerError,   # 500 / INTERNAL
+        api_exceptions.BadGateway,            # 502
+        api_exceptions.ServiceUnavailable,    # 503 / UNAVAILABLE
+        api_exceptions.GatewayTimeout,        # 504 / DEADLINE_EXCEEDED
+    ))
+
+
 def run_extraction(
     property_id: str,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    load_to_bigquery: bool = True
+    load_to_bigquery: bool = True,
+    write_mode: str = "auto",
+    skip_loaded: bool = False
 ) -> Dict[str, Any]:
     """
     Executa a extração completa de dados do GA4.
@@ -74,15 +279,14 @@ def run_extraction(
         start_date: Data de início (YYYY-MM-DD)
         end_date: Data de fim (YYYY-MM-DD)
         load_to_bigquery: Se True, carrega os dados no BigQuery
+        write_mode: "auto", "load" (load job), "streaming" (insertAll) ou
+            "storage" (Storage Write API)
+        skip_loaded: Se True, não recarrega partições registradas no manifesto
+            de cargas (GA4_LOAD_MANIFEST) dentro do TTL
         
     Returns:
         Resultado da extração e carga
     """
-    # Importar módulos locais
-    from auth import initialize_all_clients
-    from ga4 import extract_all_reports, get_date_range
-    from bigquery import load_all_reports_to_bigquery
-    
     logger.info("=" * 60)
     logger.info("INICIANDO EXTRAÇÃO GA4")
     logger.info("=" * 60)
@@ -100,7 +304,8 @@ def run_extraction(
         return {
             "status": "error",
             "step": "authentication",
-            "message": str(e)
+            "message": str(e),
+            "retryable": _is_transient_error(e)
         }
     
     # 2. CALCULAR DATAS
@@ -110,20 +315,24 @@ def run_extraction(
     logger.info(f"Período: {start_date} a {end_date}")
     
     # 3. EXTRAÇÃO DO GA4
+    # Com load job, os relatórios vêm em colunas (pyarrow) e seguem em Parquet
+    # para o BigQuery, sem um dict por linha
     logger.info("Passo 2: Extraindo dados do GA4...")
     try:
         extraction_results = extract_all_reports(
             ga4_client=clients["ga4"],
             property_id=property_id,
             start_date=start_date,
-            end_date=end_date
+            end_date=end_date,
+            columnar=load_to_bigquery and write_mode == "load"
         )
     except Exception as e:
         logger.error(f"Falha na extração: {e}")
         return {
             "status": "error",
             "step": "extraction",
-            "message": str(e)
+            "message": str(e),
+            "retryable": _is_transient_error(e)
         }
     
     # 4. CARGA NO BIGQUERY
@@ -134,7 +343,10 @@ def run_extraction(
                 bq_client=clients["bigquery"],
                 project_id=Config.PROJECT_ID,
                 dataset_id=Config.DATASET_ID,
-                extraction_results=extraction_results
+                extraction_results=extraction_results,
+                write_mode=write_mode,
+                streaming_batch_size=Config.STREAMING_BATCH_SIZE,
+                skip_loaded=skip_loaded
             )
         except Exception as e:
             logger.error(f"Falha na carga: {e}")
@@ -142,6 +354,7 @@ def run_extraction(
                 "status": "error",
                 "step": "load",
                 "message": str(e),
+                "retryable": _is_transient_error(e),
                 "extraction": extraction_results["summary"]
             }
     else:
@@ -161,6 +374,172 @@ def run_extraction(
     }
 
 
+def _run_batch_entry(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extrai uma propriedade de /report/batch; erros viram o resultado da entrada.
+    
+    Falhas transitórias (ver _is_transient_error) são repetidas até
+    Config.BATCH_MAX_RETRIES vezes, com backoff exponencial a partir de
+    Config.BATCH_RETRY_BACKOFF segundos; as demais retornam na hora.
+    """
+    try:
+        req = ExtractRequest.from_json(data)
+    except RequestError as e:
+        return {
+            "property_id": data.get("property_id") if isinstance(data, dict) else None,
+            "status": "error",
+            "message": str(e)
+        }
+    property_id = req.property_id
+    
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            result = run_extraction(
+                property_id=property_id,
+                start_date=req.start_date,
+                end_date=req.end_date,
+                load_to_bigquery=req.load_to_bigquery,
+                write_mode=req.write_mode,
+                skip_loaded=req.skip_loaded
+            )
+        except Exception as e:
+            logger.error(f"Erro na extração de {property_id}: {e}")
+            result = {"status": "error", "message": str(e), "retryable": _is_transient_error(e)}
+        
+        if (
+            result.get("status") == "success"
+            or not result.get("retryable")
+            or attempts > Config.BATCH_MAX_RETRIES
+        ):
+            break
+        
+        delay = Config.BATCH_RETRY_BACKOFF * 2 ** (attempts - 1)
+        logger.warning(
+            "Falha em %s (tentativa %s/%s): nova tentativa em %.0fs",
+            property_id, attempts, Config.BATCH_MAX_RETRIES + 1, delay
+        )
+        time.sleep(delay)
+    
+    entry = {
+        "property_id": property_id,
+        "status": result.get("status"),
+        "summary": {
+            "extraction": result.get("extraction", {}),
+            "load": result.get("load", {}),
+            "total_rows_processed": result.get("load", {}).get("total_rows", 0)
+        }
+    }
+    if attempts > 1:
+        entry["attempts"] = attempts
+    if result.get("status") != "success":
+        entry["step"] = result.get("step")
+        entry["message"] = result.get("message")
+    return entry
+
+
+def _update_batch_summary(summary: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    """Soma uma entrada de /report/batch ao resumo consolidado."""
+    summary["total_properties"] += 1
+    summary["successful" if entry["status"] == "success" else "failed"] += 1
+    summary["total_rows_processed"] += entry.get("summary", {}).get("total_rows_processed", 0)
+
+
+def _batch_summary(results: Iterable[Dict[str, Any]] = ()) -> Dict[str, Any]:
+    """Resumo consolidado das entradas de /report/batch."""
+    summary = {"total_properties": 0, "successful": 0, "failed": 0, "total_rows_processed": 0}
+    for entry in results:
+        _update_batch_summary(summary, entry)
+    return summary
+
+
+def _batch_status(summary: Dict[str, Any]) -> str:
+    """success, partial ou error conforme as propriedades com sucesso."""
+    if summary["failed"] == 0:
+        return "success"
+    return "partial" if summary["successful"] else "error"
+
+
+def run_batch_reports(report_requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Executa a extração de várias propriedades GA4 em uma única chamada.
+    
+    As propriedades são independentes e limitadas por I/O (GA4 e BigQuery):
+    são processadas em paralelo (até Config.BATCH_MAX_WORKERS), reaproveitando
+    os clientes autenticados (cache de initialize_all_clients) entre elas.
+    Os resultados seguem a ordem de report_requests.
+    
+    Args:
+        report_requests: Lista de {"property_id", "start_date", "end_date",
+            "load_to_bigquery", "write_mode", "skip_loaded"}, com os mesmos
+            campos de /extract
+        
+    Returns:
+        Resultado por propriedade e resumo consolidado
+    """
+    max_workers = max(min(Config.BATCH_MAX_WORKERS, len(report_requests)), 1)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch") as executor:
+        results = list(executor.map(_run_batch_entry, report_requests))
+    
+    summary = _batch_summary(results)
+    
+    return {
+        "status": _batch_status(summary),
+        "results": results,
+        "summary": summary
+    }
+
+
+def iter_batch_reports(report_requests: List[Dict[str, Any]]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Como run_batch_reports, mas devolve cada propriedade assim que termina.
+    
+    Args:
+        report_requests: Mesmo formato de run_batch_reports
+        
+    Yields:
+        (índice em report_requests, resultado da propriedade), em ordem de conclusão
+    """
+    max_workers = max(min(Config.BATCH_MAX_WORKERS, len(report_requests)), 1)
+    executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="batch")
+    try:
+        futures = {
+            executor.submit(_run_batch_entry, req): index
+            for index, req in enumerate(report_requests)
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # Se o cliente desconectar, as propriedades ainda na fila não são iniciadas
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+# =============================================================================
+# COMPRESSÃO DAS RESPOSTAS
+# =============================================================================
+
+@app.after_request
+def compress_response(response):
+    """Comprime respostas JSON com gzip quando o cliente envia Accept-Encoding: gzip."""
+    if (
+        response.mimetype != "application/json"
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or "gzip" not in request.headers.get("Accept-Encoding", "").lower()
+    ):
+        return response
+
+    data = response.get_data()
+    if len(data) < Config.GZIP_MIN_SIZE:
+        return response
+
+    response.set_data(gzip.compress(data, compresslevel=6))
+    response.headers["Content-Encoding"] = "gzip"
+    response.vary.add("Accept-Encoding")
+    return response
+
+
 # =============================================================================
 # ENDPOINTS DA API
 # =============================================================================
@@ -183,8 +562,6 @@ def health_check():
 @app.route("/test-auth", methods=["GET"])
 def test_auth():
     """Testa a autenticação no GCP."""
-    from auth import test_authentication
-    
     success = test_authentication(Config.CREDENTIALS_PATH)
     
     return jsonify({
@@ -193,12 +570,25 @@ def test_auth():
     })
 
 
+@lru_cache(maxsize=1)
+def _reports_json() -> bytes:
+    """JSON da lista de relatórios (estática), serializado uma única vez."""
+    reports = dict(list_available_reports())
+    if orjson is not None:
+        return orjson.dumps(reports)
+    return json.dumps(reports, ensure_ascii=False).encode("utf-8")
+
+
 @app.route("/reports", methods=["GET"])
 def list_reports():
     """Lista todos os relatórios disponíveis."""
-    from ga4 import list_available_reports
-    
-    return jsonify(list_available_reports())
+    return Response(_reports_json(), mimetype="application/json")
+
+
+@app.route("/reports/cache", methods=["GET"])
+def report_cache_stats():
+    """Estatísticas do cache de relatórios do GA4."""
+    return jsonify(get_report_cache_stats())
 
 
 @app.route("/extract", methods=["POST"])
@@ -211,28 +601,24 @@ def extract():
             "property_id": "123456789",
             "start_date": "2024-01-01",  // opcional
             "end_date": "2024-01-01",    // opcional
-            "load_to_bigquery": true     // opcional, padrão true
+            "load_to_bigquery": true,    // opcional, padrão true
+            "write_mode": "auto",        // opcional: auto, load, streaming ou storage
+            "skip_loaded": false         // opcional: pula partições já carregadas
         }
     """
-    data = request.get_json() or {}
-    
-    property_id = data.get("property_id")
-    if not property_id:
-        return jsonify({
-            "status": "error",
-            "message": "property_id é obrigatório"
-        }), 400
-    
-    start_date = data.get("start_date")
-    end_date = data.get("end_date")
-    load_to_bigquery = data.get("load_to_bigquery", True)
+    try:
+        req = ExtractRequest.from_json(request.get_json() or {})
+    except RequestError as e:
+        return _error_response(e)
     
     try:
         result = run_extraction(
-            property_id=property_id,
-            start_date=start_date,
-            end_date=end_date,
-            load_to_bigquery=load_to_bigquery
+            property_id=req.property_id,
+            start_date=req.start_date,
+            end_date=req.end_date,
+            load_to_bigquery=req.load_to_bigquery,
+            write_mode=req.write_mode,
+            skip_loaded=req.skip_loaded
         )
         
         status_code = 200 if result.get("status") == "success" else 500
@@ -246,6 +632,172 @@ def extract():
         }), 500
 
 
+@app.route("/extract/stream", methods=["POST"])
+def extract_stream():
+    """
+    Extrai todos os relatórios e devolve as linhas em streaming (NDJSON),
+    sem carregar no BigQuery e sem montar a resposta inteira em memória.
+    
+    Request Body:
+        {
+            "property_id": "123456789",
+            "start_date": "2024-01-01",  // opcional
+            "end_date": "2024-01-01"     // opcional
+        }
+    
+    Cada linha da resposta é um objeto JSON com o campo "type"
+    (header, report_meta, row, report_end, error, summary).
+    """
+    try:
+        req = ExtractRequest.from_json(request.get_json() or {})
+    except RequestError as e:
+        return _error_response(e)
+    
+    # Autentica antes de iniciar o streaming: uma falha aqui ainda vira HTTP 500
+    try:
+        clients = initialize_all_clients(
+            project_id=Config.PROJECT_ID,
+            credentials_path=Config.CREDENTIALS_PATH,
+            use_secret_manager=Config.USE_SECRET_MANAGER
+        )
+    except Exception as e:
+        logger.error(f"Falha na autenticação: {e}")
+        return jsonify({"status": "error", "step": "authentication", "message": str(e)}), 500
+    
+    stream = stream_all_reports(
+        clients["ga4"], req.property_id, req.start_date, req.end_date
+    )
+    return Response(stream_with_context(stream), mimetype="application/x-ndjson")
+
+
+def _batch_requests_or_error(data: Any):
+    """
+    Valida o body de /report/batch.
+    
+    Apenas a estrutura é validada aqui; cada entrada é validada por
+    ExtractRequest.from_json e, se inválida, vira um erro só daquela entrada.
+    
+    Returns:
+        (report_requests, None) ou (None, resposta de erro 400)
+    """
+    if not isinstance(data, dict):
+        return None, (jsonify({
+            "status": "error",
+            "message": "O body deve ser um objeto JSON"
+        }), 400)
+    
+    report_requests = data.get("requests")
+    if not report_requests or not isinstance(report_requests, list):
+        return None, (jsonify({
+            "status": "error",
+            "message": "requests é obrigatório (lista de propriedades)"
+        }), 400)
+    
+    if len(report_requests) > Config.MAX_BATCH_SIZE:
+        return None, (jsonify({
+            "status": "error",
+            "message": f"Máximo de {Config.MAX_BATCH_SIZE} propriedades por requisição"
+        }), 400)
+    
+    return report_requests, None
+
+
+@app.route("/report/batch", methods=["POST"])
+def report_batch():
+    """
+    Extrai várias propriedades GA4 em uma única requisição.
+    
+    Request Body:
+        {
+            "requests": [
+                {
+                    "property_id": "123456789",
+                    "start_date": "2024-01-01",  // opcional
+                    "end_date": "2024-01-01",    // opcional
+                    "load_to_bigquery": true,    // opcional, padrão true
+                    "write_mode": "load"         // opcional: auto, load, streaming ou storage
+                },
+                ...
+            ]
+        }
+    
+    Falhas das propriedades vêm no body (status "partial" ou "error", com o
+    erro de cada entrada) e respondem 200; 5xx fica para falhas do próprio
+    servidor, para que o chamador não trate erros determinísticos como
+    indisponibilidade e reenvie o lote.
+    """
+    report_requests, error = _batch_requests_or_error(request.get_json() or {})
+    if error:
+        return error
+    
+    try:
+        return jsonify(run_batch_reports(report_requests))
+        
+    except Exception as e:
+        logger.error(f"Erro no batch: {e}")
+        return jsonify({
+            "status": "error",
+            "message": str(e)
+        }), 500
+
+
+def _ndjson(obj: Dict[str, Any]) -> bytes:
+    """Serializa um objeto como uma linha NDJSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, default=str, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+@app.route("/report/batch/stream", methods=["POST"])
+def report_batch_stream():
+    """
+    Como /report/batch, mas devolve cada propriedade em streaming (NDJSON)
+    assim que ela termina, sem esperar o lote inteiro.
+    
+    Request Body: igual a /report/batch.
+    
+    Cada linha é um objeto JSON com o campo "type": "result" (com "index",
+    a posição da propriedade em "requests") ou, ao final, "summary".
+    """
+    report_requests, error = _batch_requests_or_error(request.get_json() or {})
+    if error:
+        return error
+    
+    def stream():
+        # Só o resumo fica em memória; cada resultado sai assim que é gerado
+        summary = _batch_summary()
+        for index, entry in iter_batch_reports(report_requests):
+            _update_batch_summary(summary, entry)
+            yield _ndjson({"type": "result", "index": index, **entry})
+        
+        yield _ndjson({"type": "summary", "status": _batch_status(summary), **summary})
+    
+    return Response(stream_with_context(stream()), mimetype="application/x-ndjson")
+
+
+def _stream_single_report(
+    clients: Dict[str, Any],
+    req: ExtractRequest,
+    report_key: str,
+    start_date: str,
+    end_date: str
+) -> Dict[str, Any]:
+    """
+    Extrai um relatório e grava via Storage Write API enquanto pagina o GA4
+    (write_mode "storage"), sem montar a lista de linhas em memória.
+    """
+    load_result = stream_report_to_bigquery(
+        clients["bigquery"], clients["ga4"], Config.PROJECT_ID, Config.DATASET_ID,
+        req.property_id, report_key, start_date, end_date
+    )
+    return {
+        "status": "success",
+        "report": report_key,
+        "extraction": {"rows": load_result.get("rows_inserted", 0)},
+        "load": load_result
+    }
+
+
 @app.route("/extract/dimension/<report_key>", methods=["POST"])
 def extract_dimension(report_key: str):
     """
@@ -254,15 +806,11 @@ def extract_dimension(report_key: str):
     Args:
         report_key: Chave do relatório (USUARIO, GEOGRAFICA, etc.)
     """
-    from auth import initialize_all_clients
-    from ga4 import extract_dimension_report, get_date_range, DIMENSION_REPORTS
-    from bigquery import load_report_to_bigquery
-    
-    data = request.get_json() or {}
-    
-    property_id = data.get("property_id")
-    if not property_id:
-        return jsonify({"status": "error", "message": "property_id é obrigatório"}), 400
+    try:
+        req = ExtractRequest.from_json(request.get_json() or {})
+    except RequestError as e:
+        return _error_response(e)
+    property_id = req.property_id
     
     report_key = report_key.upper()
     if report_key not in DIMENSION_REPORTS:
@@ -272,8 +820,8 @@ def extract_dimension(report_key: str):
             "available": list(DIMENSION_REPORTS.keys())
         }), 404
     
-    start_date = data.get("start_date")
-    end_date = data.get("end_date")
+    start_date = req.start_date
+    end_date = req.end_date
     if not start_date or not end_date:
         start_date, end_date = get_date_range()
     
@@ -284,12 +832,18 @@ def extract_dimension(report_key: str):
             use_secret_manager=Config.USE_SECRET_MANAGER
         )
         
+        if req.write_mode == "storage":
+            return jsonify(_stream_single_report(clients, req, report_key, start_date, end_date))
+        
         report = extract_dimension_report(
             clients["ga4"], property_id, report_key, start_date, end_date
         )
         
         load_result = load_report_to_bigquery(
-            clients["bigquery"], Config.PROJECT_ID, Config.DATASET_ID, report
+            clients["bigquery"], Config.PROJECT_ID, Config.DATASET_ID, report,
+            skip_loaded=req.skip_loaded,
+            write_mode=req.write_mode,
+            streaming_batch_size=Config.STREAMING_BATCH_SIZE
         )
         
         return jsonify({
@@ -312,15 +866,11 @@ def extract_metric(report_key: str):
     Args:
         report_key: Chave do relatório (USUARIOS, SESSAO, etc.)
     """
-    from auth import initialize_all_clients
-    from ga4 import extract_metric_report, get_date_range, METRIC_REPORTS
-    from bigquery import load_report_to_bigquery
-    
-    data = request.get_json() or {}
-    
-    property_id = data.get("property_id")
-    if not property_id:
-        return jsonify({"status": "error", "message": "property_id é obrigatório"}), 400
+    try:
+        req = ExtractRequest.from_json(request.get_json() or {})
+    except RequestError as e:
+        return _error_response(e)
+    property_id = req.property_id
     
     report_key = report_key.upper()
     if report_key not in METRIC_REPORTS:
@@ -330,8 +880,8 @@ def extract_metric(report_key: str):
             "available": list(METRIC_REPORTS.keys())
         }), 404
     
-    start_date = data.get("start_date")
-    end_date = data.get("end_date")
+    start_date = req.start_date
+    end_date = req.end_date
     if not start_date or not end_date:
         start_date, end_date = get_date_range()
     
@@ -342,12 +892,18 @@ def extract_metric(report_key: str):
             use_secret_manager=Config.USE_SECRET_MANAGER
         )
         
+        if req.write_mode == "storage":
+            return jsonify(_stream_single_report(clients, req, report_key, start_date, end_date))
+        
         report = extract_metric_report(
             clients["ga4"], property_id, report_key, start_date, end_date
         )
         
         load_result = load_report_to_bigquery(
-            clients["bigquery"], Config.PROJECT_ID, Config.DATASET_ID, report
+            clients["bigquery"], Config.PROJECT_ID, Config.DATASET_ID, report,
+            skip_loaded=req.skip_loaded,
+            write_mode=req.write_mode,
+            streaming_batch_size=Config.STREAMING_BATCH_SIZE
         )
         
         return jsonify({
@@ -369,19 +925,25 @@ def extract_metric(report_key: str):
 def main():
     """Função principal para iniciar o servidor ou executar testes."""
     
+    # --replay: relatórios GA4 lidos apenas do cache em disco (GA4_CACHE_DIR),
+    # sem chamadas à API; relatório ausente do cache gera erro
+    if "--replay" in sys.argv:
+        sys.argv.remove("--replay")
+        os.environ["GA4_REPLAY"] = "1"
+        logger.info("Modo replay: relatórios GA4 apenas do cache em disco")
+    
     # Verificar argumentos de linha de comando
     if len(sys.argv) > 1:
         if sys.argv[1] == "--test":
             # Modo de teste
             logger.info("Executando teste de autenticação...")
-            from auth import test_authentication
             success = test_authentication(Config.CREDENTIALS_PATH)
             sys.exit(0 if success else 1)
         
         elif sys.argv[1] == "--extract":
             # Modo de extração via CLI
             if len(sys.argv) < 3:
-                print("Uso: python main.py --extract <property_id> [start_date] [end_date]")
+                print("Uso: python main.py [--replay] --extract <property_id> [start_date] [end_date]")
                 sys.exit(1)
             
             property_id = sys.argv[2]
@@ -102,6 +102,8 @@ class TableConfig:
     name: str
     description: str
     fields: List[Dict[str, str]]
+    # Linhas por requisição de streaming no BigQuery (insertAll)
+    insert_batch_size: int = 500
 
 
 class TablesConfig:
@@ -15,12 +15,22 @@ Para deploy no Cloud Run:
 """
 
 import os
+import json
 import logging
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
-from flask import Flask, request, jsonify
+from functools import lru_cache
+from typing import Dict, Any, Iterator, List, Optional
+from flask import Flask, Response, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from cachetools import TTLCache
 import pytz
 
+try:
+    import orjson
+except ImportError:  # opcional: sem ele, o Flask usa o json da stdlib
+    orjson = None
+
 from config import (
     gcp_config,
     twitter_accounts_config,
@@ -30,8 +40,8 @@ from config import (
     TwitterAccount
 )
 from src.twitter_client import TwitterClient, TwitterDataExtractor
-from src.bigquery_writer import BigQueryWriter
-from src.secret_manager import SecretManagerClient
+from src.bigquery_writer import BigQueryWriter, STREAMING_BATCH_SIZE
+from src.secret_manager import get_secret_manager_client
 
 # Configurar logging
 logging.basicConfig(
@@ -44,10 +54,99 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 
 
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON do Flask (jsonify, request.get_json) via orjson, mais rápido que o json da stdlib.
+    
+    Diferenças em relação ao DefaultJSONProvider:
+    - datetime e date saem em ISO 8601 (ex.: "2024-01-31T12:00:00+00:00"),
+      serializados nativamente pelo orjson, e não no formato HTTP-date do
+      Flask ("Wed, 31 Jan 2024 12:00:00 GMT");
+    - caracteres não ASCII saem em UTF-8, sem escape \\uXXXX.
+    sort_keys e o modo debug (indentação) continuam respeitados. Chamadas
+    com argumentos do json da stdlib (indent, separators...) usam o provider
+    padrão, que os entende.
+    
+    Cada serviço é uma imagem Docker construída só com o próprio diretório,
+    por isso a classe é mantida em cópia no main.py de cada API.
+    """
+    
+    def _options(self) -> int:
+        return orjson.OPT_NON_STR_KEYS | (orjson.OPT_SORT_KEYS if self.sort_keys else 0)
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode("utf-8")
+    
+    def loads(self, s, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        # Bytes direto para a resposta, sem passar por str
+        obj = self._prepare_response_obj(args, kwargs)
+        options = self._options() | orjson.OPT_APPEND_NEWLINE
+        if self.compact is False or (self.compact is None and self._app.debug):
+            options |= orjson.OPT_INDENT_2
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=options), mimetype=self.mimetype
+        )
+
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# BigQueryWriter compartilhado entre requisições e contas (um único cliente/conexão)
+_BIGQUERY_WRITER: Optional[BigQueryWriter] = None
+_BIGQUERY_WRITER_LOCK = threading.Lock()
+_TABLES_READY = False
+
+# Resultado de process_account por (conta, período): retries e refreshes de
+# dashboard dentro do TTL não reexecutam a extração (ignorado com refresh=true)
+RESULT_CACHE_TTL = int(os.environ.get("RESULT_CACHE_TTL", "300"))
+_RESULT_CACHE: TTLCache = TTLCache(maxsize=256, ttl=RESULT_CACHE_TTL)
+_RESULT_CACHE_LOCK = threading.Lock()
+
+
 # =============================================================================
 # FUNÇÕES AUXILIARES
 # =============================================================================
 
+def _json_response(body: bytes) -> Response:
+    """Resposta JSON a partir de um corpo já serializado."""
+    return Response(body, mimetype="application/json")
+
+
+def _request_dates(data: Dict[str, Any]) -> tuple:
+    """
+    Lê start_date/end_date (YYYY-MM-DD) do body.
+    
+    Returns:
+        Tupla (start_date, end_date), ou (None, None) se não fornecidas
+    """
+    if not (data.get("start_date") and data.get("end_date")):
+        return None, None
+    
+    tz = pytz.timezone(date_config.TIMEZONE)
+    start_date = datetime.strptime(data["start_date"], "%Y-%m-%d").replace(tzinfo=tz)
+    end_date = datetime.strptime(data["end_date"], "%Y-%m-%d").replace(tzinfo=tz)
+    return start_date, end_date
+
+
+def _ndjson(obj: Dict[str, Any]) -> bytes:
+    """Serializa um objeto como uma linha NDJSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_APPEND_NEWLINE)
+    return json.dumps(obj, default=str, ensure_ascii=False).encode("utf-8") + b"\n"
+
+
+def _wants_refresh(data: Dict[str, Any]) -> bool:
+    """Indica se a requisição pediu para ignorar o cache (?refresh=true ou "refresh": true)."""
+    if request.args.get("refresh", "").lower() in ("1", "true"):
+        return True
+    return data.get("refresh") is True
+
 def get_date_range(days_start: int = None, days_end: int = None) -> tuple:
     """
     Calcula o range de datas para extração.
@@ -89,7 +188,7 @@ def get_bearer_token(account: TwitterAccount = None) -> str:
     
     # Tenta obter do Secret Manager
     try:
-        secret_client = SecretManagerClient(gcp_config.PROJECT_ID)
+        secret_client = get_secret_manager_client(gcp_config.PROJECT_ID)
         return secret_client.get_secret(gcp_config.SECRET_ID_TWITTER)
     except Exception as e:
         logger.warning(f"Não foi possível obter token do Secret Manager: {e}")
@@ -108,14 +207,25 @@ def get_bearer_token(account: TwitterAccount = None) -> str:
 
 def get_bigquery_writer() -> BigQueryWriter:
     """
-    Obtém uma instância do BigQueryWriter com credenciais.
+    Obtém a instância compartilhada do BigQueryWriter (criada na primeira chamada).
     
     Returns:
         Instância do BigQueryWriter
     """
+    global _BIGQUERY_WRITER
+    
+    if _BIGQUERY_WRITER is None:
+        with _BIGQUERY_WRITER_LOCK:
+            if _BIGQUERY_WRITER is None:
+                _BIGQUERY_WRITER = _create_bigquery_writer()
+    return _BIGQUERY_WRITER
+
+
+def _create_bigquery_writer() -> BigQueryWriter:
+    """Cria um BigQueryWriter com as credenciais do Secret Manager ou do ambiente."""
     try:
         # Tenta obter credenciais do Secret Manager
-        secret_client = SecretManagerClient(gcp_config.PROJECT_ID)
+        secret_client = get_secret_manager_client(gcp_config.PROJECT_ID)
         credentials = secret_client.get_credentials_from_secret(gcp_config.SECRET_ID_BQ)
         return BigQueryWriter(
             project_id=gcp_config.PROJECT_ID,
@@ -134,12 +244,20 @@ def ensure_tables_exist(writer: BigQueryWriter) -> Dict[str, bool]:
     """
     Garante que todas as tabelas existem no BigQuery.
     
+    A verificação é feita uma única vez por processo; depois que todas as
+    tabelas existem, as chamadas seguintes não consultam o BigQuery.
+    
     Args:
         writer: Instância do BigQueryWriter
         
     Returns:
         Dicionário com status de cada tabela
     """
+    global _TABLES_READY
+    
+    if _TABLES_READY:
+        return {table_config.name: True for table_config in tables_config.get_all_tables()}
+    
     results = {}
     
     for table_config in tables_config.get_all_tables():
@@ -150,9 +268,28 @@ def ensure_tables_exist(writer: BigQueryWriter) -> Dict[str, bool]:
         )
         results[table_config.name] = success
     
+    _TABLES_READY = all(results.values())
     return results
 
 
+def create_extractor(bearer_token: str) -> TwitterDataExtractor:
+    """
+    Cria um extrator com um TwitterClient (sessão HTTP própria) para o token.
+    
+    Args:
+        bearer_token: Token de autenticação
+        
+    Returns:
+        Instância do TwitterDataExtractor
+    """
+    client = TwitterClient(
+        bearer_token=bearer_token,
+        request_delay=twitter_api_config.REQUEST_DELAY,
+        request_timeout=twitter_api_config.REQUEST_TIMEOUT
+    )
+    return TwitterDataExtractor(client, date_config.TIMEZONE)
+
+
 # =============================================================================
 # FUNÇÕES DE EXTRAÇÃO
 # =============================================================================
@@ -160,7 +297,8 @@ def ensure_tables_exist(writer: BigQueryWriter) -> Dict[str, bool]:
 def extract_and_load_profile(
     account: TwitterAccount,
     writer: BigQueryWriter,
-    bearer_token: str
+    bearer_token: str,
+    extractor: Optional[TwitterDataExtractor] = None
 ) -> Dict[str, Any]:
     """
     Extrai e carrega dados do perfil de uma conta.
@@ -169,16 +307,13 @@ def extract_and_load_profile(
         account: Conta do Twitter
         writer: Instância do BigQueryWriter
         bearer_token: Token de autenticação
+        extractor: Extrator reaproveitado (opcional; criado se ausente)
         
     Returns:
         Resultado da operação
     """
-    client = TwitterClient(
-        bearer_token=bearer_token,
-        request_delay=twitter_api_config.REQUEST_DELAY,
-        request_timeout=twitter_api_config.REQUEST_TIMEOUT
-    )
-    extractor = TwitterDataExtractor(client, date_config.TIMEZONE)
+    if extractor is None:
+        extractor = create_extractor(bearer_token)
     
     # Extrair dados do perfil
     profile_data = extractor.extract_profile_data(
@@ -193,7 +328,8 @@ def extract_and_load_profile(
     # Carregar no BigQuery
     result = writer.insert_rows(
         table_name=tables_config.PERFIL.name,
-        rows=[profile_data]
+        rows=[profile_data],
+        batch_size=getattr(tables_config.PERFIL, "insert_batch_size", STREAMING_BATCH_SIZE)
     )
     
     return {
@@ -208,7 +344,8 @@ def extract_and_load_posts(
     writer: BigQueryWriter,
     bearer_token: str,
     start_date: datetime,
-    end_date: datetime
+    end_date: datetime,
+    extractor: Optional[TwitterDataExtractor] = None
 ) -> Dict[str, Any]:
     """
     Extrai e carrega dados dos posts de uma conta.
@@ -219,16 +356,13 @@ def extract_and_load_posts(
         bearer_token: Token de autenticação
         start_date: Data de início
         end_date: Data de fim
+        extractor: Extrator reaproveitado (opcional; criado se ausente)
         
     Returns:
         Resultado da operação
     """
-    client = TwitterClient(
-        bearer_token=bearer_token,
-        request_delay=twitter_api_config.REQUEST_DELAY,
-        request_timeout=twitter_api_config.REQUEST_TIMEOUT
-    )
-    extractor = TwitterDataExtractor(client, date_config.TIMEZONE)
+    if extractor is None:
+        extractor = create_extractor(bearer_token)
     
     # Extrair dados dos posts
     posts_data = extractor.extract_posts_data(
@@ -245,7 +379,8 @@ def extract_and_load_posts(
     # Carregar no BigQuery
     result = writer.insert_rows(
         table_name=tables_config.POSTS.name,
-        rows=posts_data
+        rows=posts_data,
+        batch_size=getattr(tables_config.POSTS, "insert_batch_size", STREAMING_BATCH_SIZE)
     )
     
     return {
@@ -260,7 +395,8 @@ def extract_and_load_additional_metrics(
     writer: BigQueryWriter,
     bearer_token: str,
     start_date: datetime,
-    end_date: datetime
+    end_date: datetime,
+    extractor: Optional[TwitterDataExtractor] = None
 ) -> Dict[str, Any]:
     """
     Extrai e carrega métricas adicionais dos posts de uma conta.
@@ -271,16 +407,13 @@ def extract_and_load_additional_metrics(
         bearer_token: Token de autenticação
         start_date: Data de início
         end_date: Data de fim
+        extractor: Extrator reaproveitado (opcional; criado se ausente)
         
     Returns:
         Resultado da operação
     """
-    client = TwitterClient(
-        bearer_token=bearer_token,
-        request_delay=twitter_api_config.REQUEST_DELAY,
-        request_timeout=twitter_api_config.REQUEST_TIMEOUT
-    )
-    extractor = TwitterDataExtractor(client, date_config.TIMEZONE)
+    if extractor is None:
+        extractor = create_extractor(bearer_token)
     
     # Extrair métricas adicionais
     metrics_data = extractor.extract_additional_metrics(
@@ -297,7 +430,8 @@ def extract_and_load_additional_metrics(
     # Carregar no BigQuery
     result = writer.insert_rows(
         table_name=tables_config.METRICAS_ADICIONAIS.name,
-        rows=metrics_data
+        rows=metrics_data,
+        batch_size=getattr(tables_config.METRICAS_ADICIONAIS, "insert_batch_size", STREAMING_BATCH_SIZE)
     )
     
     return {
@@ -310,15 +444,23 @@ def extract_and_load_additional_metrics(
 def process_account(
     account: TwitterAccount,
     start_date: datetime = None,
-    end_date: datetime = None
+    end_date: datetime = None,
+    writer: Optional[BigQueryWriter] = None,
+    refresh: bool = False
 ) -> Dict[str, Any]:
     """
     Processa todos os relatórios para uma conta.
     
+    Execuções sem falhas ficam em cache por RESULT_CACHE_TTL segundos para
+    a mesma conta e período; chamadas repetidas devolvem o resultado
+    anterior (com "cached": true) sem extrair nem gravar novamente.
+    
     Args:
         account: Conta do Twitter
         start_date: Data de início (opcional)
         end_date: Data de fim (opcional)
+        writer: BigQueryWriter reaproveitado (opcional; usa o compartilhado)
+        refresh: Se True, ignora o cache e reexecuta a extração
         
     Returns:
         Resultado da operação
@@ -327,13 +469,30 @@ def process_account(
     if start_date is None or end_date is None:
         start_date, end_date = get_date_range()
     
+    cache_key = (
+        account.username,
+        account.user_id,
+        start_date.strftime("%Y-%m-%d"),
+        end_date.strftime("%Y-%m-%d")
+    )
+    if not refresh:
+        with _RESULT_CACHE_LOCK:
+            cached = _RESULT_CACHE.get(cache_key)
+        if cached is not None:
+            logger.info(f"Resultado em cache para @{account.username} ({cache_key[2]} a {cache_key[3]})")
+            return {**cached, "cached": True}
+    
     # Obter token e writer
     bearer_token = get_bearer_token(account)
-    writer = get_bigquery_writer()
+    if writer is None:
+        writer = get_bigquery_writer()
     
     # Garantir que as tabelas existem
     ensure_tables_exist(writer)
     
+    # Um único cliente (sessão HTTP) para os três relatórios da conta
+    extractor = create_extractor(bearer_token)
+    
     results = {
         "account": account.username,
         "account_name": account.name,
@@ -347,7 +506,7 @@ def process_account(
     # Extrair e carregar perfil
     try:
         results["reports"]["profile"] = extract_and_load_profile(
-            account, writer, bearer_token
+            account, writer, bearer_token, extractor
         )
     except Exception as e:
         logger.error(f"Erro ao processar perfil de @{account.username}: {e}")
@@ -356,7 +515,7 @@ def process_account(
     # Extrair e carregar posts
     try:
         results["reports"]["posts"] = extract_and_load_posts(
-            account, writer, bearer_token, start_date, end_date
+            account, writer, bearer_token, start_date, end_date, extractor
         )
     except Exception as e:
         logger.error(f"Erro ao processar posts de @{account.username}: {e}")
@@ -365,7 +524,7 @@ def process_account(
     # Extrair e carregar métricas adicionais
     try:
         results["reports"]["additional_metrics"] = extract_and_load_additional_metrics(
-            account, writer, bearer_token, start_date, end_date
+            account, writer, bearer_token, start_date, end_date, extractor
         )
     except Exception as e:
         logger.error(f"Erro ao processar métricas adicionais de @{account.username}: {e}")
@@ -392,9 +551,78 @@ def process_account(
         "total_rows_inserted": total_rows
     }
     
+    if failed == 0:
+        with _RESULT_CACHE_LOCK:
+            _RESULT_CACHE[cache_key] = results
+    
     return results
 
 
+def _batch_accounts(data: Dict[str, Any]) -> List[TwitterAccount]:
+    """Contas do body de /report/batch ("accounts") ou, se ausente, as configuradas."""
+    accounts_data = data.get("accounts")
+    
+    if not accounts_data:
+        return twitter_accounts_config.ACCOUNTS
+    
+    return [
+        TwitterAccount(
+            username=acc.get("username"),
+            user_id=acc.get("user_id"),
+            name=acc.get("name", acc.get("username"))
+        )
+        for acc in accounts_data
+    ]
+
+
+def iter_batch_accounts(
+    accounts: List[TwitterAccount],
+    start_date: datetime = None,
+    end_date: datetime = None,
+    refresh: bool = False
+) -> Iterator[Dict[str, Any]]:
+    """
+    Processa as contas em sequência, devolvendo cada resultado ao terminar.
+    
+    Todas as contas reaproveitam o mesmo writer (cliente BigQuery); erros de
+    uma conta viram o seu resultado.
+    
+    Yields:
+        Resultado de process_account (ou o erro) de cada conta
+    """
+    writer = get_bigquery_writer()
+    for account in accounts:
+        try:
+            yield process_account(account, start_date, end_date, writer, refresh)
+        except Exception as e:
+            logger.error(f"Erro ao processar conta @{account.username}: {e}")
+            yield {
+                "account": account.username,
+                "status": "error",
+                "message": str(e)
+            }
+
+
+def _new_batch_summary() -> Dict[str, int]:
+    """Resumo vazio de /report/batch."""
+    return {
+        "total_accounts": 0,
+        "successful_accounts": 0,
+        "failed_accounts": 0,
+        "total_rows_inserted": 0
+    }
+
+
+def _update_batch_summary(summary: Dict[str, int], result: Dict[str, Any]) -> None:
+    """Soma o resultado de uma conta ao resumo de /report/batch."""
+    summary["total_accounts"] += 1
+    if result.get("summary", {}).get("failed", 1) == 0:
+        summary["successful_accounts"] += 1
+    else:
+        summary["failed_accounts"] += 1
+    summary["total_rows_inserted"] += result.get("summary", {}).get("total_rows_inserted", 0)
+
+
 # =============================================================================
 # ENDPOINTS DA API
 # =============================================================================
@@ -410,10 +638,10 @@ def health_check():
     })
 
 
-@app.route("/config", methods=["GET"])
-def get_config():
-    """Retorna a configuração atual da API."""
-    return jsonify({
+@lru_cache(maxsize=1)
+def _config_json() -> bytes:
+    """Configuração da API serializada uma única vez (a configuração é estática)."""
+    return json.dumps({
         "project_id": gcp_config.PROJECT_ID,
         "dataset_id": gcp_config.DATASET_ID,
         "date_range": {
@@ -423,12 +651,18 @@ def get_config():
         },
         "accounts_count": len(twitter_accounts_config.ACCOUNTS),
         "tables": [t.name for t in tables_config.get_all_tables()]
-    })
+    }).encode("utf-8")
 
 
-@app.route("/tables", methods=["GET"])
-def list_tables():
-    """Lista todas as tabelas configuradas."""
+@app.route("/config", methods=["GET"])
+def get_config():
+    """Retorna a configuração atual da API."""
+    return _json_response(_config_json())
+
+
+@lru_cache(maxsize=1)
+def _tables_json() -> bytes:
+    """Lista de tabelas serializada uma única vez."""
     tables = []
     for table in tables_config.get_all_tables():
         tables.append({
@@ -436,12 +670,18 @@ def list_tables():
             "description": table.description,
             "fields_count": len(table.fields)
         })
-    return jsonify({"tables": tables})
+    return json.dumps({"tables": tables}).encode("utf-8")
 
 
-@app.route("/accounts", methods=["GET"])
-def list_accounts():
-    """Lista todas as contas configuradas."""
+@app.route("/tables", methods=["GET"])
+def list_tables():
+    """Lista todas as tabelas configuradas."""
+    return _json_response(_tables_json())
+
+
+@lru_cache(maxsize=1)
+def _accounts_json() -> bytes:
+    """Lista de contas serializada uma única vez."""
     accounts = []
     for account in twitter_accounts_config.ACCOUNTS:
         accounts.append({
@@ -449,7 +689,13 @@ def list_accounts():
             "user_id": account.user_id,
             "name": account.name
         })
-    return jsonify({"accounts": accounts})
+    return json.dumps({"accounts": accounts}).encode("utf-8")
+
+
+@app.route("/accounts", methods=["GET"])
+def list_accounts():
+    """Lista todas as contas configuradas."""
+    return _json_response(_accounts_json())
 
 
 @app.route("/report/all", methods=["POST"])
@@ -498,17 +744,11 @@ def run_all_reports():
             }), 404
     
     # Processar datas
-    start_date = None
-    end_date = None
-    
-    if data.get("start_date") and data.get("end_date"):
-        tz = pytz.timezone(date_config.TIMEZONE)
-        start_date = datetime.strptime(data["start_date"], "%Y-%m-%d").replace(tzinfo=tz)
-        end_date = datetime.strptime(data["end_date"], "%Y-%m-%d").replace(tzinfo=tz)
+    start_date, end_date = _request_dates(data)
     
     # Executar
     try:
-        result = process_account(account, start_date, end_date)
+        result = process_account(account, start_date, end_date, refresh=_wants_refresh(data))
         return jsonify({"status": "success", **result})
     except Exception as e:
         logger.error(f"Erro ao processar conta @{account.username}: {e}")
@@ -538,67 +778,62 @@ def run_batch_reports():
     """
     data = request.get_json() or {}
     
-    # Obter lista de contas
-    accounts_data = data.get("accounts")
-    
-    if accounts_data:
-        accounts = [
-            TwitterAccount(
-                username=acc.get("username"),
-                user_id=acc.get("user_id"),
-                name=acc.get("name", acc.get("username"))
-            )
-            for acc in accounts_data
-        ]
-    else:
-        accounts = twitter_accounts_config.ACCOUNTS
-    
+    accounts = _batch_accounts(data)
     if not accounts:
         return jsonify({
             "status": "error",
             "message": "Nenhuma conta configurada ou fornecida"
         }), 400
     
-    # Processar datas
-    start_date = None
-    end_date = None
-    
-    if data.get("start_date") and data.get("end_date"):
-        tz = pytz.timezone(date_config.TIMEZONE)
-        start_date = datetime.strptime(data["start_date"], "%Y-%m-%d").replace(tzinfo=tz)
-        end_date = datetime.strptime(data["end_date"], "%Y-%m-%d").replace(tzinfo=tz)
+    start_date, end_date = _request_dates(data)
     
-    # Executar para cada conta
     results = []
-    for account in accounts:
-        try:
-            result = process_account(account, start_date, end_date)
-            results.append(result)
-        except Exception as e:
-            logger.error(f"Erro ao processar conta @{account.username}: {e}")
-            results.append({
-                "account": account.username,
-                "status": "error",
-                "message": str(e)
-            })
-    
-    # Calcular resumo geral
-    total_accounts = len(results)
-    successful_accounts = sum(1 for r in results if r.get("summary", {}).get("failed", 1) == 0)
-    total_rows = sum(r.get("summary", {}).get("total_rows_inserted", 0) for r in results)
+    summary = _new_batch_summary()
+    for result in iter_batch_accounts(accounts, start_date, end_date, _wants_refresh(data)):
+        _update_batch_summary(summary, result)
+        results.append(result)
     
     return jsonify({
         "status": "success",
-        "summary": {
-            "total_accounts": total_accounts,
-            "successful_accounts": successful_accounts,
-            "failed_accounts": total_accounts - successful_accounts,
-            "total_rows_inserted": total_rows
-        },
+        "summary": summary,
         "results": results
     })
 
 
+@app.route("/report/batch/stream", methods=["POST"])
+def run_batch_reports_stream():
+    """
+    Como /report/batch, mas devolve o resultado de cada conta em streaming
+    (NDJSON) assim que ela termina, sem acumular a resposta em memória.
+    
+    Request Body: igual a /report/batch.
+    
+    Cada linha é um objeto JSON com o campo "type": "result" (uma conta) ou,
+    ao final, "summary".
+    """
+    data = request.get_json() or {}
+    
+    accounts = _batch_accounts(data)
+    if not accounts:
+        return jsonify({
+            "status": "error",
+            "message": "Nenhuma conta configurada ou fornecida"
+        }), 400
+    
+    start_date, end_date = _request_dates(data)
+    refresh = _wants_refresh(data)
+    
+    def stream():
+        summary = _new_batch_summary()
+        for result in iter_batch_accounts(accounts, start_date, end_date, refresh):
+            _update_batch_summary(summary, result)
+            yield _ndjson({"type": "result", **result})
+        
+        yield _ndjson({"type": "summary", **summary})
+    
+    return Response(stream_with_context(stream()), mimetype="application/x-ndjson")
+
+
 @app.route("/report/profile/<username>", methods=["POST"])
 def run_profile_report(username: str):
     """
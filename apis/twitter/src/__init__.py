@@ -7,13 +7,21 @@ do Twitter e carregamento no BigQuery.
 
 from .twitter_client import TwitterClient, TwitterDataExtractor
 from .bigquery_writer import BigQueryWriter
-from .secret_manager import SecretManagerClient, get_secret_from_file, get_credentials_from_file
+from .secret_manager import (
+    SecretManagerClient,
+    get_secret_manager_client,
+    clear_secret_cache,
+    get_secret_from_file,
+    get_credentials_from_file,
+)
 
 __all__ = [
     "TwitterClient",
     "TwitterDataExtractor",
     "BigQueryWriter",
     "SecretManagerClient",
+    "get_secret_manager_client",
+    "clear_secret_cache",
     "get_secret_from_file",
     "get_credentials_from_file",
 ]
@@ -8,7 +8,10 @@ Autor: Manus AI
 Data: Janeiro de 2026
 """
 
+import io
+import json
 import logging
+import random
 from typing import Dict, List, Any, Optional
 from google.cloud import bigquery
 from google.oauth2 import service_account
@@ -17,6 +20,26 @@ from google.oauth2 import service_account
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Linhas por requisição de streaming (insertAll); o BigQuery recomenda ~500
+STREAMING_BATCH_SIZE = 500
+
+# Acima destes limites a carga usa load job (NDJSON), sem custo de streaming
+LOAD_JOB_MIN_ROWS = 50000
+LOAD_JOB_MIN_BYTES = 10 * 1024 * 1024
+
+# Linhas serializadas para estimar o tamanho em JSON do lote (amostra aleatória)
+SIZE_SAMPLE_ROWS = 100
+
+
+def _estimate_json_size(rows: List[Dict[str, Any]]) -> int:
+    """
+    Estima o tamanho em JSON das linhas serializando só uma amostra aleatória
+    de até SIZE_SAMPLE_ROWS linhas, escalada para o total.
+    """
+    sample = random.sample(rows, min(SIZE_SAMPLE_ROWS, len(rows)))
+    sample_bytes = sum(len(json.dumps(row, default=str)) for row in sample)
+    return sample_bytes * len(rows) // len(sample)
+
 
 class BigQueryWriter:
     """Classe para escrita de dados no BigQuery."""
@@ -153,14 +176,21 @@ class BigQueryWriter:
     def insert_rows(
         self,
         table_name: str,
-        rows: List[Dict[str, Any]]
+        rows: List[Dict[str, Any]],
+        batch_size: int = STREAMING_BATCH_SIZE
     ) -> Dict[str, Any]:
         """
         Insere linhas em uma tabela.
         
+        As linhas são enviadas em lotes de `batch_size` por requisição de
+        streaming. Volumes grandes (mais de LOAD_JOB_MIN_ROWS linhas ou
+        LOAD_JOB_MIN_BYTES de JSON, estimados por amostragem) são gravados
+        por load job em NDJSON.
+        
         Args:
             table_name: Nome da tabela
             rows: Lista de dicionários com os dados
+            batch_size: Linhas por requisição de streaming
             
         Returns:
             Resultado da inserção
@@ -172,23 +202,10 @@ class BigQueryWriter:
         table_ref = self._get_table_ref(table_name)
         
         try:
-            errors = self.client.insert_rows_json(table_ref, rows)
+            if len(rows) <= LOAD_JOB_MIN_ROWS and _estimate_json_size(rows) < LOAD_JOB_MIN_BYTES:
+                return self._insert_rows_streaming(table_name, table_ref, rows, batch_size)
             
-            if errors:
-                logger.error(f"Erros ao inserir dados em {table_name}: {errors}")
-                return {
-                    "status": "error",
-                    "message": f"Erros na inserção: {errors}",
-                    "rows_inserted": 0,
-                    "errors": errors
-                }
-            
-            logger.info(f"Inseridas {len(rows)} linhas em {table_name}")
-            return {
-                "status": "success",
-                "message": f"Inseridas {len(rows)} linhas",
-                "rows_inserted": len(rows)
-            }
+            return self._insert_rows_load_job(table_name, table_ref, rows)
         except Exception as e:
             logger.error(f"Erro ao inserir dados em {table_name}: {e}")
             return {
@@ -197,6 +214,63 @@ class BigQueryWriter:
                 "rows_inserted": 0
             }
     
+    def _insert_rows_streaming(
+        self,
+        table_name: str,
+        table_ref: str,
+        rows: List[Dict[str, Any]],
+        batch_size: int
+    ) -> Dict[str, Any]:
+        """Insere as linhas via insertAll, em lotes de `batch_size`."""
+        batch_size = max(1, batch_size)
+        rows_inserted = 0
+        
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            errors = self.client.insert_rows_json(table_ref, batch)
+            
+            if errors:
+                logger.error(f"Erros ao inserir dados em {table_name}: {errors}")
+                return {
+                    "status": "error",
+                    "message": f"Erros na inserção: {errors}",
+                    "rows_inserted": rows_inserted,
+                    "errors": errors
+                }
+            rows_inserted += len(batch)
+        
+        logger.info(f"Inseridas {rows_inserted} linhas em {table_name}")
+        return {
+            "status": "success",
+            "message": f"Inseridas {rows_inserted} linhas",
+            "rows_inserted": rows_inserted
+        }
+    
+    def _insert_rows_load_job(
+        self,
+        table_name: str,
+        table_ref: str,
+        rows: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Grava as linhas com um load job a partir de um buffer NDJSON em memória."""
+        lines = [json.dumps(row, default=str) for row in rows]
+        
+        buffer = io.BytesIO("\n".join(lines).encode("utf-8"))
+        job_config = bigquery.LoadJobConfig(
+            source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
+            write_disposition=bigquery.WriteDisposition.WRITE_APPEND
+        )
+        
+        job = self.client.load_table_from_file(buffer, table_ref, job_config=job_config)
+        job.result()  # Aguardar conclusão
+        
+        logger.info(f"Carregadas {len(rows)} linhas em {table_name} via load job")
+        return {
+            "status": "success",
+            "message": f"Carregadas {len(rows)} linhas via load job",
+            "rows_inserted": len(rows)
+        }
+    
     def load_dataframe(
         self,
         table_name: str,
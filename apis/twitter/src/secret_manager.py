@@ -10,7 +10,9 @@ Data: Janeiro de 2026
 
 import json
 import logging
-from typing import Dict, Any, Optional
+from threading import Lock
+from typing import Dict, Any, Optional, Tuple
+from cachetools import TTLCache
 from google.cloud import secretmanager
 from google.oauth2 import service_account
 
@@ -18,6 +20,19 @@ from google.oauth2 import service_account
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Secrets e credenciais ficam em cache por (projeto, secret, versão): evita uma
+# chamada ao Secret Manager (e o parse da chave privada) a cada requisição.
+# 55 minutos, abaixo da validade de 1 hora dos tokens OAuth.
+SECRET_CACHE_TTL = 3300
+
+_SECRET_CACHE: TTLCache = TTLCache(maxsize=64, ttl=SECRET_CACHE_TTL)
+_CREDENTIALS_CACHE: TTLCache = TTLCache(maxsize=16, ttl=SECRET_CACHE_TTL)
+_CACHE_LOCK = Lock()
+
+# Clientes compartilhados por projeto (um canal gRPC por processo)
+_SHARED_CLIENTS: Dict[str, "SecretManagerClient"] = {}
+_SHARED_CLIENTS_LOCK = Lock()
+
 
 class SecretManagerClient:
     """Cliente para acesso ao Secret Manager do GCP."""
@@ -59,17 +74,29 @@ class SecretManagerClient:
             
         Returns:
             Valor do secret como string
+            
+        Note:
+            O valor fica em cache por SECRET_CACHE_TTL segundos.
         """
+        cache_key = self._cache_key(secret_id, version)
+        with _CACHE_LOCK:
+            secret_value = _SECRET_CACHE.get(cache_key)
+        if secret_value is not None:
+            return secret_value
+        
         name = f"projects/{self.project_id}/secrets/{secret_id}/versions/{version}"
         
         try:
             response = self.client.access_secret_version(name=name)
             secret_value = response.payload.data.decode("UTF-8")
             logger.info(f"Secret recuperado: {secret_id}")
-            return secret_value
         except Exception as e:
             logger.error(f"Erro ao recuperar secret {secret_id}: {e}")
             raise
+        
+        with _CACHE_LOCK:
+            _SECRET_CACHE[cache_key] = secret_value
+        return secret_value
     
     def get_secret_json(
         self,
@@ -103,13 +130,55 @@ class SecretManagerClient:
             
         Returns:
             Objeto de credenciais da conta de serviço
+            
+        Note:
+            O objeto fica em cache por SECRET_CACHE_TTL segundos.
         """
+        cache_key = self._cache_key(secret_id, version)
+        with _CACHE_LOCK:
+            credentials = _CREDENTIALS_CACHE.get(cache_key)
+        if credentials is not None:
+            return credentials
+        
         credentials_dict = self.get_secret_json(secret_id, version)
         credentials = service_account.Credentials.from_service_account_info(
             credentials_dict
         )
         logger.info(f"Credenciais carregadas do secret: {secret_id}")
+        
+        with _CACHE_LOCK:
+            _CREDENTIALS_CACHE[cache_key] = credentials
         return credentials
+    
+    def _cache_key(self, secret_id: str, version: str) -> Tuple[str, str, str]:
+        """Chave de cache de um secret (as credenciais do cliente não entram na chave)."""
+        return (self.project_id, secret_id, version)
+
+
+def get_secret_manager_client(project_id: str) -> SecretManagerClient:
+    """
+    Retorna o SecretManagerClient compartilhado do projeto (com as
+    credenciais padrão do ambiente), criado no primeiro uso.
+    
+    Args:
+        project_id: ID do projeto no GCP
+        
+    Returns:
+        Cliente do Secret Manager
+    """
+    with _SHARED_CLIENTS_LOCK:
+        client = _SHARED_CLIENTS.get(project_id)
+        if client is None:
+            client = SecretManagerClient(project_id)
+            _SHARED_CLIENTS[project_id] = client
+        return client
+
+
+def clear_secret_cache() -> None:
+    """Descarta os secrets e credenciais em cache (ex.: após rotacionar um secret)."""
+    with _CACHE_LOCK:
+        _SECRET_CACHE.clear()
+        _CREDENTIALS_CACHE.clear()
 
 
 def get_secret_from_file(file_path: str) -> Dict[str, Any]:
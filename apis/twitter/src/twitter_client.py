@@ -48,6 +48,9 @@ class TwitterClient:
             "Authorization": f"Bearer {bearer_token}",
             "Content-Type": "application/json"
         }
+        # Sessão reaproveita a conexão TLS entre as requisições (keep-alive)
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
     
     def _make_request(
         self,
@@ -70,9 +73,8 @@ class TwitterClient:
         url = f"{self.base_url}/{endpoint}"
         
         try:
-            response = requests.get(
+            response = self.session.get(
                 url,
-                headers=self.headers,
                 params=params,
                 timeout=self.request_timeout
             )